@@ -0,0 +1,110 @@
+"""Time `generator match` on a synthetic access log.
+
+The log holds combined-log-format lines for random operations of the spec,
+with the path parameters filled in, plus some requests no operation serves.
+Every line must be tagged with the operationId it was generated from, and the
+parallel run must write the same output as the serial one:
+
+    PYTHONPATH=src python -m benchmarks.access_log --lines 1000000 --jobs 1 4
+"""
+
+import argparse
+import filecmp
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kandji_openapi.access_log import UNMATCHED, tag_file
+from kandji_openapi.interning import HTTP_METHODS
+from kandji_openapi.routes import PARAMETER, RouteTrie
+
+UNKNOWN = ("/favicon.ico", "/api/v2/unknown", "/api/v1/devices/1/2/3/4")
+
+
+def write_log(spec: dict, path: Path, lines: int, seed: int) -> list[bytes]:
+    """Write a log of `lines` requests, returning the expected tag of each"""
+    operations = [
+        (method.upper(), template, operation.get("operationId", template))
+        for template, path_item in spec["paths"].items()
+        for method in HTTP_METHODS
+        if (operation := path_item.get(method))
+    ]
+    rng = random.Random(seed)
+    expected = []
+    with open(path, "w", encoding="utf-8") as f:
+        for index in range(lines):
+            if rng.random() < 0.05:
+                method, target, tag = "GET", rng.choice(UNKNOWN), UNMATCHED.decode()
+            else:
+                method, template, tag = rng.choice(operations)
+                target = PARAMETER.sub(lambda _: f"{rng.randrange(10**6):x}", template)
+                if rng.random() < 0.3:
+                    target += f"?limit={rng.randrange(300)}"
+            f.write(
+                f"10.0.{index % 256}.{index % 199} - - [17/Oct/2026:10:00:00 +0000] "
+                f'"{method} {target} HTTP/1.1" 200 {rng.randrange(10**5)} "-" '
+                f'"python-requests/2.32"\n'
+            )
+            expected.append(tag.encode())
+    return expected
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark generator match")
+    arg_parser.add_argument("--spec", default="openapi.json")
+    arg_parser.add_argument("--lines", type=int, default=200_000)
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2])
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    with open(args.spec, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    start = time.perf_counter()
+    trie = RouteTrie.from_spec(spec)
+    print(
+        f"trie of {trie.routes} routes built in "
+        f"{(time.perf_counter() - start) * 1000:.1f} ms, "
+        f"{len(trie.conflicts)} conflicts"
+    )
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "access.log"
+        expected = write_log(spec, log, args.lines, args.seed)
+        size = log.stat().st_size
+        print(f"log of {args.lines:,} lines, {size / 1024 / 1024:.1f} MB")
+
+        outputs = []
+        for jobs in args.jobs:
+            output = Path(tmp) / f"tagged-{jobs}.log"
+            start = time.perf_counter()
+            with open(output, "wb") as f:
+                # The requested worker count is used even for small logs
+                tag_file(trie, log, f, jobs=jobs, parallel_min_bytes=0)
+            elapsed = time.perf_counter() - start
+            print(
+                f"jobs {jobs:<3}{elapsed:8.2f}s  {args.lines / elapsed:>12,.0f} lines/s"
+            )
+            outputs.append(output)
+
+        with open(outputs[0], "rb") as f:
+            tags = [re.split(rb"\t", line, maxsplit=1)[0] for line in f]
+        wrong = sum(1 for tag, want in zip(tags, expected) if tag != want)
+        if wrong or len(tags) != len(expected):
+            failures.append(f"{wrong} of {len(expected)} lines tagged wrongly")
+        for output in outputs[1:]:
+            if not filecmp.cmp(outputs[0], output, shallow=False):
+                failures.append(f"{output.name} differs from the serial output")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Time writing the spec with its minified and compressed variants.
+
+Compares three ways of producing the same files:
+
+    plain       the pretty JSON only, for reference
+    one pass    `OpenAPIGenerator.to_json` with minify and compressions on
+    afterwards  the pretty JSON, then re-reading it to minify and compress
+
+and checks that both produce the same documents (compressed files may
+differ in their framing, so they are compared decompressed):
+
+    PYTHONPATH=src python -m benchmarks.artifacts --scale 20 --compress gz zst
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import SyntheticOptions, generate_collection
+from kandji_openapi.artifacts import (
+    GZIP_LEVEL,
+    ZSTD_LEVEL,
+    check_compressions,
+    compressed_path,
+    minified_path,
+    variant_paths,
+)
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+
+
+def decompress(path: Path) -> bytes:
+    data = path.read_bytes()
+    if path.suffix == ".gz":
+        return gzip.decompress(data)
+    if path.suffix == ".zst":
+        import zstandard  # pyright: ignore[reportMissingImports]
+
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def compress(path: Path, compression: str) -> None:
+    data = path.read_bytes()
+    if compression == "gz":
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    else:
+        import zstandard  # pyright: ignore[reportMissingImports]
+
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        with open(compressed_path(path, compression), "wb") as f:
+            with compressor.stream_writer(f, closefd=False) as writer:
+                writer.write(data)
+        return
+    compressed_path(path, compression).write_bytes(compressed)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark release artifacts")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument(
+        "--scale", type=float, help="Use a synthetic collection of this scale"
+    )
+    arg_parser.add_argument(
+        "--compress", choices=("gz", "zst"), nargs="+", default=["gz"]
+    )
+    args = arg_parser.parse_args()
+    check_compressions(args.compress)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collection_path = args.collection
+        if args.scale:
+            collection_path = str(Path(tmp) / "collection.json")
+            with open(collection_path, "w", encoding="utf-8") as f:
+                json.dump(generate_collection(SyntheticOptions(scale=args.scale)), f)
+        collection = PostmanParser.from_file(collection_path).parse()
+
+        timings = {}
+        plain = Path(tmp) / "plain" / "openapi.json"
+        one_pass = Path(tmp) / "one_pass" / "openapi.json"
+        afterwards = Path(tmp) / "afterwards" / "openapi.json"
+        for path in (plain, one_pass, afterwards):
+            path.parent.mkdir()
+
+        # Converted up front, only the writes are timed
+        generator = OpenAPIGenerator(collection, fast_build=True)
+        variants = OpenAPIGenerator(
+            collection, fast_build=True, minify=True, compressions=args.compress
+        )
+
+        start = time.perf_counter()
+        generator.to_json(plain)
+        timings["plain"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        variants.to_json(one_pass)
+        timings["one pass"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        generator.to_json(afterwards)
+        with open(afterwards, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        with open(minified_path(afterwards), "w", encoding="utf-8") as f:
+            json.dump(document, f, sort_keys=True, separators=(",", ":"))
+        for compression in args.compress:
+            compress(afterwards, compression)
+            compress(minified_path(afterwards), compression)
+        timings["afterwards"] = time.perf_counter() - start
+
+        for name, seconds in timings.items():
+            print(f"{name:<12}{seconds:8.2f}s")
+        failures = []
+        for path in [one_pass, *variant_paths(one_pass, args.compress, True)]:
+            size = path.stat().st_size
+            print(f"  {path.name:<24}{size:>14,} bytes")
+            if decompress(path) != decompress(afterwards.parent / path.name):
+                failures.append(f"{path.name} differs")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Compare converting many collections one process each with `generator batch`.
+
+`--versions` copies of the collection are written, each with a few requests
+changed like consecutive releases of the same collection. They are converted
+once by a fresh `generator` process per collection and once by a single
+`generator batch` run, which must write the same documents.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.batch --versions 8 --jobs 1 2
+"""
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+
+def requests(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    found = []
+    for item in items:
+        if "request" in item:
+            found.append(item)
+        found.extend(requests(item.get("item", [])))
+    return found
+
+
+def write_versions(path: str, versions: int, changed: int, directory: Path) -> None:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    for version in range(versions):
+        collection = copy.deepcopy(data)
+        items = requests(collection.get("item", []))
+        for item in items[version * changed : (version + 1) * changed]:
+            item["name"] = f"{item.get('name', '')} v{version + 1}"
+        target = directory / f"collection-{version + 1:03d}.json"
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(collection, f)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark generator batch")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument("--versions", type=int, default=8)
+    arg_parser.add_argument("--changed", type=int, default=3)
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2])
+    args = arg_parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, ["src", env.get("PYTHONPATH")]))
+    generator = [sys.executable, "-m", "kandji_openapi.main", "--format", "json"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collections = Path(tmp) / "collections"
+        collections.mkdir()
+        write_versions(args.collection, args.versions, args.changed, collections)
+        paths = sorted(collections.glob("*.json"))
+
+        timings = {}
+        separate = Path(tmp) / "separate"
+        start = time.perf_counter()
+        for path in paths:
+            output = separate / path.stem / "openapi.json"
+            output.parent.mkdir(parents=True)
+            subprocess.run(
+                generator + ["--collection", str(path), "--output-json", str(output)],
+                env=env,
+                check=True,
+                capture_output=True,
+            )
+        timings["separate"] = time.perf_counter() - start
+
+        failures = []
+        for jobs in args.jobs:
+            output_dir = Path(tmp) / f"batch-{jobs}"
+            start = time.perf_counter()
+            subprocess.run(
+                generator
+                + ["batch", str(collections / "*.json")]
+                + ["--output-dir", str(output_dir), "--jobs", str(jobs)],
+                env=env,
+                check=True,
+                capture_output=True,
+            )
+            timings[f"batch, {jobs} job(s)"] = time.perf_counter() - start
+            for path in paths:
+                expected = (separate / path.stem / "openapi.json").read_bytes()
+                written = output_dir / path.stem / "openapi.json"
+                if not written.exists() or written.read_bytes() != expected:
+                    failures.append(f"{jobs} job(s): {path.stem} differs")
+
+    print(f"{len(paths)} collections")
+    for name, seconds in timings.items():
+        print(f"{name:<18}{seconds:8.2f}s")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
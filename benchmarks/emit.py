@@ -0,0 +1,75 @@
+"""Compare per-format re-serialization against the shared spec tree.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.emit --collection kandji_postman_collection.json
+"""
+
+import argparse
+import copy
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from openapi_pydantic import OpenAPI
+
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Return the fastest wall time of `repeat` calls to `func`"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def per_format_tree(spec: OpenAPI) -> dict[str, Any]:
+    """The serialization every writer used to repeat on its own"""
+    return json.loads(spec.model_dump_json(by_alias=True, exclude_none=True))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark spec emission")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    collection = PostmanParser.from_file(args.collection).parse()
+    generator = OpenAPIGenerator(collection)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "openapi.json"
+        yaml_path = Path(tmp) / "openapi.yaml"
+
+        tree = best_of(args.repeat, lambda: per_format_tree(generator.openapi_spec))
+        _ = generator.spec_data
+        json_write = best_of(args.repeat, lambda: generator.to_json(json_path))
+        yaml_write = best_of(args.repeat, lambda: generator.to_yaml(yaml_path))
+
+        def write_all(parallel: bool) -> None:
+            # Reuse the converted spec but drop the cached tree
+            fresh = copy.copy(generator)
+            fresh.__dict__.pop("spec_data", None)
+            fresh.write(json_path, yaml_path, parallel=parallel)
+
+        serial = best_of(args.repeat, lambda: write_all(False))
+        parallel = best_of(args.repeat, lambda: write_all(True))
+
+    print(f"{'stage':<34}{'seconds':>10}")
+    print(f"{'spec tree (built once)':<34}{tree:>10.3f}")
+    for name, write in (("json", json_write), ("yaml", yaml_write)):
+        print(f"{name + ' before (tree + write)':<34}{tree + write:>10.3f}")
+        print(f"{name + ' after (shared tree)':<34}{write:>10.3f}")
+        print(f"{name + ' saved':<34}{tree:>10.3f}")
+    print(f"{'write(json, yaml)':<34}{serial:>10.3f}")
+    print(f"{'write(json, yaml, parallel=True)':<34}{parallel:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Report spec size before and after capping or externalizing the examples.
+
+Every shrunk spec must still validate as an OpenAPI document, and the bytes
+saved per operation must add up to the difference of the compact JSON.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.examples
+"""
+
+import argparse
+import copy
+import sys
+import time
+from pathlib import Path
+
+from kandji_openapi.examples import ExampleLimits, iter_examples
+from kandji_openapi.interning import canonical
+from kandji_openapi.models.construction import validate_document
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+from benchmarks.interning import sizes
+
+LIMITS = {
+    "items 3": ExampleLimits(max_items=3),
+    "items 1": ExampleLimits(max_items=1),
+    "depth 4": ExampleLimits(max_depth=4),
+    "items 3 depth 4": ExampleLimits(max_items=3, max_depth=4),
+    "external 4 KB": ExampleLimits(directory=Path("examples"), prefix="examples/"),
+    "external 1 KB": ExampleLimits(
+        directory=Path("examples"), min_bytes=1024, prefix="examples/"
+    ),
+}
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark example limits")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    args = arg_parser.parse_args()
+
+    collection = PostmanParser.from_file(args.collection).parse()
+    original = OpenAPIGenerator(collection).spec_data
+    examples = sum(1 for _ in iter_examples(original))
+    compact_before = len(canonical(original).encode())
+    json_before, yaml_before = sizes(original)
+    print(f"{examples} examples")
+    print(
+        f"{'limits':<18}{'ops':>5}{'files':>7}{'seconds':>9}"
+        f"{'json bytes':>12}{'yaml bytes':>12}"
+    )
+    print(f"{'none':<18}{'':>5}{'':>7}{'':>9}{json_before:>12,}{yaml_before:>12,}")
+
+    failures = []
+    for name, limits in LIMITS.items():
+        spec = copy.deepcopy(original)
+        start = time.perf_counter()
+        files, saved = limits.apply(spec)
+        elapsed = time.perf_counter() - start
+        json_size, yaml_size = sizes(spec)
+        print(
+            f"{name:<18}{len(saved):>5}{len(files):>7}{elapsed:>9.3f}"
+            f"{json_size:>12,}{yaml_size:>12,}"
+        )
+
+        try:
+            validate_document(spec)
+        except ValueError as e:
+            failures.append(f"{name}: invalid spec: {e}")
+        if compact_before - len(canonical(spec).encode()) != saved.total():
+            failures.append(f"{name}: savings do not add up")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Time `generator fetch` against a local stand-in for the collection server.
+
+The stand-in serves a collection with an ETag and Last-Modified, honours
+If-None-Match / If-Modified-Since with 304 and gzip-compresses the body when
+asked to. The benchmark times a full download and a conditional one, and
+checks the written file is the canonical form of the served collection:
+
+    PYTHONPATH=src python -m benchmarks.fetch
+    PYTHONPATH=src python -m benchmarks.fetch --scale 10
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, cast
+
+from benchmarks.synthetic import SyntheticOptions, generate_collection
+from kandji_openapi.fetch import fetch_collection
+
+
+class CollectionServer(ThreadingHTTPServer):
+    """HTTP server on a free local port serving one collection at any path"""
+
+    def __init__(self, body: bytes) -> None:
+        super().__init__(("127.0.0.1", 0), CollectionHandler)
+        self.body = body
+        self.gzipped = gzip.compress(body)
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        self.last_modified = formatdate(usegmt=True)
+        self.requests: list[int] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/collection.json"
+
+
+class CollectionHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        server = cast(CollectionServer, self.server)
+        if (
+            self.headers.get("If-None-Match") == server.etag
+            or self.headers.get("If-Modified-Since") == server.last_modified
+        ):
+            self.send_response(304)
+            self.end_headers()
+            server.requests.append(304)
+            return
+
+        body = server.body
+        compress = "gzip" in self.headers.get("Accept-Encoding", "")
+        if compress:
+            body = server.gzipped
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        self.send_header("Last-Modified", server.last_modified)
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+        server.requests.append(200)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def timed_fetch(url: str, output: Path) -> tuple[float, Optional[int]]:
+    start = time.perf_counter()
+    received = fetch_collection(url, output)
+    return time.perf_counter() - start, received
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark collection fetch")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument(
+        "--scale", type=float, help="Serve a synthetic collection of this scale"
+    )
+    args = arg_parser.parse_args()
+
+    if args.scale:
+        data = generate_collection(SyntheticOptions(scale=args.scale))
+    else:
+        with open(args.collection, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    # Served compact and unsorted, like the real endpoint
+    body = json.dumps(data, separators=(",", ":")).encode()
+
+    server = CollectionServer(body)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "collection.json"
+            full, received = timed_fetch(server.url, output)
+            conditional, not_modified = timed_fetch(server.url, output)
+            written = output.read_text()
+    finally:
+        server.shutdown()
+
+    print(f"body {len(body):,} bytes, {received or 0:,} bytes over the wire (gzip)")
+    print(f"full download  {full:8.3f}s")
+    print(f"conditional    {conditional:8.3f}s  (status {server.requests[-1]})")
+
+    failures = []
+    if written != json.dumps(data, sort_keys=True, indent=2):
+        failures.append("written collection is not in canonical form")
+    if not_modified is not None or server.requests != [200, 304]:
+        failures.append(f"expected a 200 then a 304, got {server.requests}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure the CLI's start-up imports with `python -X importtime`.
+
+Each scenario runs the generator in a fresh interpreter and reports the
+total import time, the number of modules imported and whether the pydantic
+and ruamel.yaml stacks were loaded, followed by the slowest imports:
+
+    help        generator --help
+    json        a JSON-only conversion (--format json)
+    both        a JSON and YAML conversion
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.importtime
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCENARIOS = {
+    "help": ["--help"],
+    "json": ["--format", "json"],
+    "both": ["--format", "both"],
+}
+STACKS = ("pydantic", "openapi_pydantic", "ruamel")
+
+
+def import_times(arguments: list[str]) -> dict[str, tuple[int, int, int]]:
+    """(self µs, cumulative µs, nesting depth) of every module imported by a run"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, ["src", env.get("PYTHONPATH", "")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "kandji_openapi.main", *arguments],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, module = line.removeprefix("import time:").split("|")
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        times[module.strip()] = (int(own), int(cumulative), depth)
+    return times
+
+
+def total_import_time(times: dict[str, tuple[int, int, int]]) -> int:
+    """Microseconds spent importing, the sum over the outermost imports"""
+    return sum(cumulative for _, cumulative, depth in times.values() if depth == 0)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark start-up imports")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--top", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = [
+            "--collection",
+            args.collection,
+            "--output-json",
+            str(Path(tmp) / "openapi.json"),
+            "--output-yaml",
+            str(Path(tmp) / "openapi.yaml"),
+        ]
+
+        print(f"{'scenario':<10}{'import ms':>11}{'modules':>9}  loaded stacks")
+        slowest = {}
+        for name, arguments in SCENARIOS.items():
+            runs = [import_times(arguments + outputs) for _ in range(args.repeat)]
+            best = min(runs, key=total_import_time)
+            total = total_import_time(best)
+            loaded = ", ".join(stack for stack in STACKS if stack in best) or "-"
+            print(f"{name:<10}{total / 1000:>11.1f}{len(best):>9}  {loaded}")
+            slowest[name] = sorted(best.items(), key=lambda item: -item[1][0])
+
+    for name, modules in slowest.items():
+        print(f"\nSlowest imports ({name}), self ms:")
+        for module, (own, _, _) in modules[: args.top]:
+            print(f"  {own / 1000:>7.1f}  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Report spec size before and after the component interning passes.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.interning
+"""
+
+import argparse
+import copy
+import io
+import json
+import time
+from typing import Any, Callable
+
+from kandji_openapi import interning, yaml_emitter
+from kandji_openapi.models import components
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+
+PASSES: dict[str, Callable[[dict[str, Any]], int]] = {
+    "schemas": interning.intern_schemas,
+    "parameters": interning.intern_parameters,
+    "headers": interning.intern_headers,
+    "requestBodies": interning.intern_request_bodies,
+}
+
+
+def sizes(spec: dict[str, Any]) -> tuple[int, int]:
+    """Bytes of the JSON and YAML documents written for `spec`"""
+    json_size = len(json.dumps(spec, sort_keys=True, indent=2).encode())
+    stream = io.StringIO()
+    yaml_emitter.dump(spec, stream)
+    return json_size, len(stream.getvalue().encode())
+
+
+def uses(spec: dict[str, Any]) -> dict[str, int]:
+    """Parameters and response headers of every operation"""
+    counts = {"parameter": 0, "header": 0}
+    for operation in interning.iter_operations(spec):
+        counts["parameter"] += len(operation.get("parameters", []))
+        for response in operation.get("responses", {}).values():
+            counts["header"] += len(response.get("headers", {}))
+    return counts
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark component interning")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    args = arg_parser.parse_args()
+
+    collection = PostmanParser.from_file(args.collection).parse()
+    # An outer block keeps the table of shared components around to count it
+    with components.sharing_components():
+        original = OpenAPIGenerator(collection).spec_data
+        built = [key[1] for key in components._shared or {}]
+
+    for kind, used in uses(original).items():
+        print(
+            f"shared_{kind}: {used} uses, {built.count(kind)} pydantic objects built, "
+            f"{used - built.count(kind)} reused"
+        )
+    json_before, yaml_before = sizes(original)
+
+    print(
+        f"{'pass':<12}{'shared':>8}{'seconds':>10}{'json bytes':>14}{'yaml bytes':>14}"
+    )
+    print(f"{'none':<12}{'':>8}{'':>10}{json_before:>14,}{yaml_before:>14,}")
+
+    combined = copy.deepcopy(original)
+    for name, intern in PASSES.items():
+        spec = copy.deepcopy(original)
+        start = time.perf_counter()
+        shared = intern(spec)
+        elapsed = time.perf_counter() - start
+        json_size, yaml_size = sizes(spec)
+        print(f"{name:<12}{shared:>8}{elapsed:>10.3f}{json_size:>14,}{yaml_size:>14,}")
+        intern(combined)
+
+    if len(PASSES) > 1:
+        json_size, yaml_size = sizes(combined)
+        print(f"{'all':<12}{'':>8}{'':>10}{json_size:>14,}{yaml_size:>14,}")
+
+    json_after, yaml_after = sizes(combined)
+    print(
+        f"JSON {json_before:,} -> {json_after:,} bytes "
+        f"({(json_before - json_after) / json_before:.1%} smaller), "
+        f"YAML {yaml_before:,} -> {yaml_after:,} bytes "
+        f"({(yaml_before - yaml_after) / yaml_before:.1%} smaller)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Measure PostmanCollection.to_openapi speedup with a process pool.
+
+`--copies` repeats the collection's top-level folders to emulate the larger
+merged collections. Every worker count must produce the same document as the
+serial path.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.jobs --copies 8
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+
+from kandji_openapi.parser import PostmanParser
+
+
+def load_collection(path: str, copies: int) -> PostmanParser:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    folders = data.get("item", [])
+    data["item"] = []
+    for index in range(copies):
+        for folder in copy.deepcopy(folders):
+            if index:
+                folder["name"] = f"{folder.get('name', '')} {index + 1}"
+            data["item"].append(folder)
+    return PostmanParser(data)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark --jobs")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument("--copies", type=int, default=1)
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    collection = load_collection(args.collection, args.copies).parse()
+    print(f"{len(collection.items)} top-level items")
+
+    expected = None
+    serial = None
+    failures = []
+    for jobs in args.jobs:
+        timings = []
+        output = ""
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            spec = collection.to_openapi(jobs=jobs)
+            timings.append(time.perf_counter() - start)
+            output = spec.model_dump_json(by_alias=True, exclude_none=True)
+
+        if expected is None:
+            expected = output
+        ok = output == expected
+        if not ok:
+            failures.append(jobs)
+
+        best = min(timings)
+        serial = serial or best
+        print(
+            f"jobs={jobs:<3} {best:8.3f}s  speedup {serial / best:5.2f}x  "
+            f"{'ok' if ok else 'MISMATCH'}"
+        )
+
+    if failures:
+        print(f"Output differs from jobs={args.jobs[0]} for jobs={failures}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
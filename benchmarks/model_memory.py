@@ -0,0 +1,141 @@
+"""Report the memory of parsing a collection into the Postman models.
+
+The collection is parsed and converted in a fresh interpreter, which reports
+
+    loaded      RSS after `json.load` of the collection
+    parse peak  peak RSS while building the models
+    peak        peak RSS after converting and streaming the JSON spec
+
+A second interpreter parses with tracemalloc, which reports the bytes
+allocated at the peak of `parse()` and the bytes the models keep once the
+parser is gone.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.model_memory --scale 100
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic import SyntheticOptions, generate_collection
+
+
+def peak_rss_mb() -> float:
+    # Linux reports kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm", "r", encoding="utf-8") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def child(collection_path: str, output: str, fast_build: bool) -> None:
+    """Parse and convert in this process, printing the measurements as JSON"""
+    from kandji_openapi.openapi_generator import OpenAPIGenerator
+    from kandji_openapi.parser import PostmanParser
+
+    start = time.perf_counter()
+    parser = PostmanParser.from_file(collection_path)
+    loaded = rss_mb()
+    collection = parser.parse()
+    parse_peak = peak_rss_mb()
+    parsed = time.perf_counter() - start
+    del parser
+
+    OpenAPIGenerator(collection, fast_build=fast_build).to_json(Path(output))
+    measured = {
+        "loaded": loaded,
+        "parse_peak": parse_peak,
+        "peak": peak_rss_mb(),
+        "parse_s": parsed,
+    }
+    print(json.dumps(measured))
+
+
+def traced_child(collection_path: str) -> None:
+    """Parse under tracemalloc, printing the measurements as JSON"""
+    from kandji_openapi.parser import PostmanParser
+
+    tracemalloc.start()
+    parser = PostmanParser.from_file(collection_path)
+    collection = parser.parse()
+    parse_peak = tracemalloc.get_traced_memory()[1] / 2**20
+    del parser
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    print(json.dumps({"traced_peak": parse_peak, "models": retained}))
+    del collection
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark model memory")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument(
+        "--scale", type=float, help="Use a synthetic collection of this scale"
+    )
+    arg_parser.add_argument("--fast-build", action="store_true")
+    arg_parser.add_argument(
+        "--child", choices=("rss", "traced"), help=argparse.SUPPRESS
+    )
+    arg_parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child == "rss":
+        child(args.collection, args.output, args.fast_build)
+        return
+    if args.child == "traced":
+        traced_child(args.collection)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collection_path = args.collection
+        if args.scale:
+            collection_path = str(Path(tmp) / "collection.json")
+            with open(collection_path, "w", encoding="utf-8") as f:
+                json.dump(generate_collection(SyntheticOptions(scale=args.scale)), f)
+        size = Path(collection_path).stat().st_size
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, ["src", ".", env.get("PYTHONPATH", "")])
+        )
+        command = [sys.executable, "-m", "benchmarks.model_memory"]
+        command += ["--collection", collection_path]
+        measured = {}
+        for extra in (
+            ["--child", "rss", "--output", str(Path(tmp) / "openapi.json")],
+            ["--child", "traced"],
+        ):
+            if args.fast_build:
+                extra.append("--fast-build")
+            result = subprocess.run(
+                command + extra, env=env, capture_output=True, text=True, check=True
+            )
+            measured.update(json.loads(result.stdout))
+
+    print(f"collection {size / 2**20:.1f} MB, parsed in {measured['parse_s']:.2f}s")
+    for name, key in (
+        ("loaded", "loaded"),
+        ("parse peak", "parse_peak"),
+        ("peak", "peak"),
+        ("traced parse peak", "traced_peak"),
+        ("traced models", "models"),
+    ):
+        print(f"{name:<18}{measured[key]:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Time the per-tag shard output and check it against the monolithic spec.
+
+The shards are written serially and in parallel, then read back: merging
+their paths (with the component references made local again) must give the
+paths of the monolithic document, the shared components file must hold its
+components, and every shard must be a valid OpenAPI document.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.shards --intern
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from kandji_openapi.models.construction import validate_document
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+from kandji_openapi.sharding import COMPONENTS_NAME
+
+
+def localize(value: Any, components_file: str) -> Any:
+    """Copy of `value` with the references to the components file made local"""
+    if isinstance(value, dict):
+        ref = value.get("$ref")
+        if isinstance(ref, str) and ref.startswith(components_file + "#"):
+            return {**value, "$ref": ref.removeprefix(components_file)}
+        return {key: localize(item, components_file) for key, item in value.items()}
+    if isinstance(value, list):
+        return [localize(item, components_file) for item in value]
+    return value
+
+
+def check(spec: dict[str, Any], directory: Path) -> list[str]:
+    """Differences between the shards in `directory` and the monolithic spec"""
+    components_file = f"{COMPONENTS_NAME}.json"
+    with open(directory / components_file, "r", encoding="utf-8") as f:
+        components = json.load(f)
+
+    failures = []
+    if components["components"] != spec.get("components", {}):
+        failures.append("shared components differ from the spec's components")
+
+    paths: dict[str, dict[str, Any]] = {}
+    for path in sorted(directory.glob("*.json")):
+        if path.name == components_file:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            shard = json.load(f)
+        try:
+            validate_document(shard)
+        except ValueError as e:
+            failures.append(f"{path.name} is not a valid document: {e}")
+        for name, path_item in localize(shard["paths"], components_file).items():
+            paths.setdefault(name, {}).update(path_item)
+
+    if json.dumps(paths, sort_keys=True) != json.dumps(spec["paths"], sort_keys=True):
+        failures.append("merged shard paths differ from the spec's paths")
+    return failures
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark sharded output")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument(
+        "--intern", action="store_true", help="Intern schemas and components first"
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    collection = PostmanParser.from_file(args.collection).parse()
+    generator = OpenAPIGenerator(
+        collection,
+        yaml_engine="fast",
+        intern_schemas=args.intern,
+        intern_components=args.intern,
+    )
+    spec = generator.spec_data
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        generator.to_json(Path(tmp) / "openapi.json")
+        monolithic = time.perf_counter() - start
+        print(f"{'monolithic':<12}{monolithic:>9.3f}s")
+
+        for parallel in (False, True):
+            directory = Path(tmp) / ("parallel" if parallel else "serial")
+            timings = []
+            written: list[Path] = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                written = generator.write_shards(directory, parallel=parallel)
+                timings.append(time.perf_counter() - start)
+            label = "parallel" if parallel else "serial"
+            print(f"{label:<12}{min(timings):>9.3f}s  {len(written)} files")
+            failures.extend(check(spec, directory))
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Time `generator diff` and check it ignores moving structures into components.
+
+The spec is generated plainly and with every combination of the interning
+options. Each pair must diff as "none" both ways, since no operation
+changed, while removing an operation must still diff as "breaking".
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.spec_diff
+"""
+
+import argparse
+import copy
+import sys
+import time
+
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+from kandji_openapi.spec_diff import diff_specs
+
+# intern_components, intern_schemas
+VARIANTS = {
+    "components": (True, False),
+    "schemas": (False, True),
+    "both": (True, True),
+}
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark generator diff")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    args = arg_parser.parse_args()
+
+    collection = PostmanParser.from_file(args.collection).parse()
+    plain = OpenAPIGenerator(collection).spec_data
+
+    failures = []
+    print(f"{'interned':<12}{'seconds':>9}{'added':>7}  level")
+    for name, (components, schemas) in VARIANTS.items():
+        interned = OpenAPIGenerator(
+            collection, intern_components=components, intern_schemas=schemas
+        ).spec_data
+        start = time.perf_counter()
+        diff = diff_specs(plain, interned)
+        elapsed = time.perf_counter() - start
+        added = len(diff.components["added"])
+        print(f"{name:<12}{elapsed:>9.3f}{added:>7}  {diff.level}")
+        if diff.level != "none":
+            failures.append(f"{name}: plain to interned is {diff.level}")
+        if (level := diff_specs(interned, plain).level) != "none":
+            failures.append(f"{name}: interned to plain is {level}")
+
+        removed = copy.deepcopy(interned)
+        path = next(iter(removed["paths"]))
+        del removed["paths"][path]
+        if (level := diff_specs(plain, removed).level) != "breaking":
+            failures.append(f"{name}: removing {path} is {level}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
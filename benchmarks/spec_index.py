@@ -0,0 +1,69 @@
+"""Time operation lookups through the sidecar index against loading the spec.
+
+Writes the spec and its index, then looks every operation up by operationId
+both ways and checks the index returns the same operation:
+
+    PYTHONPATH=src python -m benchmarks.spec_index
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+from kandji_openapi.spec_index import SpecIndex
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark the spec index")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    args = arg_parser.parse_args()
+
+    collection = PostmanParser.from_file(args.collection).parse()
+    generator = OpenAPIGenerator(collection)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spec_path = Path(tmp) / "openapi.json"
+        index_path = Path(tmp) / "openapi.index.json"
+        generator.to_json(spec_path)
+        generator.write_index(index_path)
+        print(
+            f"spec {spec_path.stat().st_size:,} bytes, "
+            f"index {index_path.stat().st_size:,} bytes"
+        )
+
+        operation_ids = list(SpecIndex.load(index_path).operation_ids)
+        failures = []
+
+        start = time.perf_counter()
+        expected = {}
+        for operation_id in operation_ids:
+            with open(spec_path, "r", encoding="utf-8") as f:
+                spec = json.load(f)
+            for path_item in spec["paths"].values():
+                for operation in path_item.values():
+                    if operation.get("operationId") == operation_id:
+                        expected[operation_id] = operation
+        full = (time.perf_counter() - start) / len(operation_ids)
+
+        start = time.perf_counter()
+        for operation_id in operation_ids:
+            found = SpecIndex.load(index_path).operation_by_id(operation_id)
+            if found != expected[operation_id]:
+                failures.append(f"{operation_id} differs from the spec")
+        indexed = (time.perf_counter() - start) / len(operation_ids)
+
+    print(f"full load  {full * 1000:8.2f} ms per lookup")
+    print(f"index      {indexed * 1000:8.2f} ms per lookup ({full / indexed:.0f}x)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
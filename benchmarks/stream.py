@@ -0,0 +1,115 @@
+"""Compare peak RSS of writing the JSON spec from the whole tree and streamed.
+
+Each mode converts the collection in a fresh interpreter and writes only the
+JSON document:
+
+    tree      builds `OpenAPIGenerator.spec_data` and dumps it (the path taken
+              when YAML is written too or components are interned)
+    stream    writes the document one path at a time
+
+The report shows the peak RSS after the conversion, the peak after writing and
+the write time, and checks both documents are identical:
+
+    PYTHONPATH=src python -m benchmarks.stream --scale 100
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import SyntheticOptions, generate_collection
+
+MODES = ("tree", "stream")
+
+
+def peak_rss_mb() -> float:
+    # Linux reports kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(mode: str, collection_path: str, output: str, fast_build: bool) -> None:
+    """Convert and write in this process, printing the measurements as JSON"""
+    from kandji_openapi.openapi_generator import OpenAPIGenerator
+    from kandji_openapi.parser import PostmanParser
+
+    collection = PostmanParser.from_file(collection_path).parse()
+    generator = OpenAPIGenerator(collection, fast_build=fast_build)
+    converted = peak_rss_mb()
+
+    start = time.perf_counter()
+    if mode == "tree":
+        _ = generator.spec_data
+    generator.to_json(Path(output))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"converted": converted, "written": peak_rss_mb(), "s": elapsed}))
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark streamed JSON")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument(
+        "--scale", type=float, help="Use a synthetic collection of this scale"
+    )
+    arg_parser.add_argument("--fast-build", action="store_true")
+    arg_parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    arg_parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        child(args.child, args.collection, args.output, args.fast_build)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collection_path = args.collection
+        if args.scale:
+            collection_path = str(Path(tmp) / "collection.json")
+            with open(collection_path, "w", encoding="utf-8") as f:
+                json.dump(generate_collection(SyntheticOptions(scale=args.scale)), f)
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, ["src", ".", env.get("PYTHONPATH", "")])
+        )
+        print(f"{'mode':<8}{'converted MB':>14}{'written MB':>12}{'extra MB':>10}  s")
+        outputs = []
+        for mode in MODES:
+            output = str(Path(tmp) / f"{mode}.json")
+            command = [
+                sys.executable,
+                "-m",
+                "benchmarks.stream",
+                "--child",
+                mode,
+                "--collection",
+                collection_path,
+                "--output",
+                output,
+            ]
+            if args.fast_build:
+                command.append("--fast-build")
+            result = subprocess.run(
+                command, env=env, capture_output=True, text=True, check=True
+            )
+            measured = json.loads(result.stdout)
+            extra = measured["written"] - measured["converted"]
+            print(
+                f"{mode:<8}{measured['converted']:>14.1f}{measured['written']:>12.1f}"
+                f"{extra:>10.1f}  {measured['s']:.2f}"
+            )
+            outputs.append(output)
+
+        if not filecmp.cmp(*outputs, shallow=False):
+            print("FAIL: streamed document differs from the dumped tree")
+            sys.exit(1)
+        print(f"identical output, {Path(outputs[0]).stat().st_size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Offline benchmark suite for every stage of the generator pipeline.
+
+Each scale builds a seeded synthetic collection (see benchmarks.synthetic),
+writes it to a temporary file and times the phases separately:
+
+    from_file     PostmanParser.from_file (read and decode the collection)
+    from_data     PostmanParser.parse
+    to_openapi    PostmanCollection.to_openapi
+    spec_data     OpenAPIGenerator.spec_data (model_dump_json and json.loads)
+    to_json       OpenAPIGenerator.to_json
+    to_yaml       OpenAPIGenerator.to_yaml
+
+Record a baseline, then compare later runs against it; the comparison exits
+with status 1 when a phase regresses by more than the tolerance:
+
+    PYTHONPATH=src python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    PYTHONPATH=src python -m benchmarks.suite --baseline benchmarks/baseline.json
+
+Timings depend on the machine, so record the baseline on the machine (or CI
+runner type) that runs the comparison. Scales missing from the baseline are
+not compared.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmarks.synthetic import SyntheticOptions, add_options, generate_collection
+from kandji_openapi.configurations import YAML_ENGINES
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+
+PHASES = ("from_file", "from_data", "to_openapi", "spec_data", "to_json", "to_yaml")
+
+# Phases faster than this are too noisy to flag as regressions
+MIN_SECONDS = 0.02
+
+
+def run_once(
+    collection_path: Path, output_dir: Path, yaml_engine: str, fast_build: bool
+) -> dict:
+    timings: dict[str, float] = {}
+
+    def timed(phase: str, func: Any) -> Any:
+        start = time.perf_counter()
+        result = func()
+        timings[phase] = time.perf_counter() - start
+        return result
+
+    parser = timed("from_file", lambda: PostmanParser.from_file(str(collection_path)))
+    collection = timed("from_data", parser.parse)
+
+    # The generator's constructor only runs to_openapi
+    generator = timed(
+        "to_openapi",
+        lambda: OpenAPIGenerator(
+            collection, yaml_engine=yaml_engine, fast_build=fast_build
+        ),
+    )
+
+    timed("spec_data", lambda: generator.spec_data)
+    timed("to_json", lambda: generator.to_json(output_dir / "openapi.json"))
+    timed("to_yaml", lambda: generator.to_yaml(output_dir / "openapi.yaml"))
+    return timings
+
+
+def run_scale(
+    options: SyntheticOptions, repeat: int, yaml_engine: str, fast_build: bool
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        collection_path = Path(tmp) / "collection.json"
+        with open(collection_path, "w", encoding="utf-8") as f:
+            json.dump(generate_collection(options), f, sort_keys=True, indent=2)
+
+        runs = [
+            run_once(collection_path, Path(tmp), yaml_engine, fast_build)
+            for _ in range(repeat)
+        ]
+        size = collection_path.stat().st_size
+
+    return {
+        "collection_bytes": size,
+        "seconds": {phase: min(run[phase] for run in runs) for phase in PHASES},
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Descriptions of every phase slower than the baseline allows"""
+    regressions = []
+    for scale, result in results["scales"].items():
+        expected = baseline.get("scales", {}).get(scale)
+        if not expected:
+            continue
+        for phase, seconds in result["seconds"].items():
+            reference = expected["seconds"].get(phase)
+            if reference is None:
+                continue
+            limit = max(reference * (1 + tolerance), MIN_SECONDS)
+            if seconds > limit:
+                regressions.append(
+                    f"{scale}x {phase}: {seconds:.3f}s > {reference:.3f}s "
+                    f"({seconds / reference - 1:+.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark the pipeline")
+    arg_parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--yaml-engine", choices=YAML_ENGINES, default="ruamel")
+    arg_parser.add_argument(
+        "--fast-build", action="store_true", help="Build without validation"
+    )
+    arg_parser.add_argument("--baseline", help="Fail on regressions against this file")
+    arg_parser.add_argument("--save-baseline", help="Write the results to this file")
+    arg_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against the baseline (default 0.25 = 25%%)",
+    )
+    arg_parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    add_options(arg_parser)
+    args = arg_parser.parse_args()
+
+    results: dict[str, Any] = {
+        "yaml_engine": args.yaml_engine,
+        "fast_build": args.fast_build,
+        "options": {
+            "depth": args.depth,
+            "fanout": args.fanout,
+            "parameters": args.parameters,
+            "example_size": args.example_size,
+            "seed": args.seed,
+        },
+        "scales": {},
+    }
+    for scale in args.scales:
+        options = SyntheticOptions(scale=scale, **results["options"])
+        results["scales"][f"{scale:g}"] = run_scale(
+            options, args.repeat, args.yaml_engine, args.fast_build
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'scale':>6}{'MB':>8}" + "".join(f"{phase:>12}" for phase in PHASES))
+        for scale, result in results["scales"].items():
+            row = f"{scale + 'x':>6}{result['collection_bytes'] / 1e6:>8.1f}"
+            row += "".join(f"{result['seconds'][phase]:>12.3f}" for phase in PHASES)
+            print(row)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        settings = ("options", "yaml_engine")
+        if any(baseline.get(key) != results[key] for key in settings) or (
+            baseline.get("fast_build", False) != args.fast_build
+        ):
+            print("Baseline was recorded with different options or YAML engine")
+            sys.exit(2)
+        if regressions := compare(results, baseline, args.tolerance):
+            print("Regressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
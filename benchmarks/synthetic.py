@@ -0,0 +1,241 @@
+"""Seeded generator of synthetic Postman collections shaped like Kandji's.
+
+`scale=1` produces about as many requests (123) in as many top-level folders
+(13) as kandji_postman_collection.json. The same seed and options always
+produce the same collection.
+
+Write one to disk with:
+
+    PYTHONPATH=src python -m benchmarks.synthetic --scale 10 --output synthetic.json
+"""
+
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from typing import Any
+
+KANDJI_REQUESTS = 123
+KANDJI_FOLDERS = 13
+
+HOST = "https://{sub_domain}.api.kandji.io"
+METHODS = ("GET", "GET", "GET", "POST", "PATCH", "DELETE")
+WORDS = (
+    "device", "blueprint", "library", "item", "user", "tag", "note", "app",
+    "profile", "script", "status", "activity", "integration", "threat", "vuln",
+    "audit", "event", "enrollment", "secret", "command", "setting", "group",
+)  # fmt: skip
+RESPONSE_HEADERS = (
+    ("Content-Type", "application/json"),
+    ("Connection", "keep-alive"),
+    ("Vary", "Origin"),
+    ("X-Frame-Options", "DENY"),
+    ("X-Content-Type-Options", "nosniff"),
+    ("Strict-Transport-Security", "max-age=31536000; includeSubDomains; preload"),
+)
+
+
+@dataclass
+class SyntheticOptions:
+    scale: float = 1.0
+    depth: int = 2
+    fanout: int = 3
+    parameters: int = 3
+    example_size: int = 2000
+    seed: int = 0
+
+
+class CollectionFactory:
+    def __init__(self, options: SyntheticOptions) -> None:
+        self.options = options
+        self.random = random.Random(options.seed)
+        self.counter = 0
+
+    def uid(self) -> str:
+        self.counter += 1
+        return f"{self.options.seed:08x}-0000-4000-8000-{self.counter:012x}"
+
+    def words(self, count: int, separator: str = " ") -> str:
+        return separator.join(self.random.choice(WORDS) for _ in range(count))
+
+    def scalar(self) -> Any:
+        kind = self.random.randrange(5)
+        if kind == 0:
+            return self.random.randrange(10_000)
+        if kind == 1:
+            return self.random.random() < 0.5
+        if kind == 2:
+            return None
+        if kind == 3:
+            return self.uid()
+        return self.words(self.random.randint(1, 4))
+
+    def example(self, size: int, depth: int = 0) -> dict[str, Any]:
+        """JSON object whose serialization is roughly `size` characters"""
+        value: dict[str, Any] = {}
+        length = 2
+        while length < size:
+            key = self.words(self.random.randint(1, 2), "_")
+            if depth < 3 and self.random.random() < 0.15:
+                child = self.example(min(size - length, size // 3), depth + 1)
+                value[key] = [child] if self.random.random() < 0.5 else child
+            else:
+                value[key] = self.scalar()
+            length += len(json.dumps({key: value[key]}))
+        return value
+
+    def response_body(self) -> str:
+        body = json.dumps(self.example(self.options.example_size), indent="\t")
+        # Some examples are hand-edited the way Kandji's are
+        roll = self.random.random()
+        if roll < 0.05:
+            body = body.replace("\n}", ",\n\t...\n}", 1)
+        elif roll < 0.1:
+            body = body.replace(",\n", ",  // example value\n", 1)
+        return body
+
+    def request(self, tag: str) -> dict[str, Any]:
+        resource = self.words(1)
+        path = ["api", "v1", f"{resource}s", f":{resource}_id", self.words(1)]
+        method = self.random.choice(METHODS)
+
+        query = [
+            {
+                "key": self.words(1, "_"),
+                "value": str(self.random.randrange(100)),
+                "description": {
+                    "content": f"<p>{self.words(6)}</p>",
+                    "type": "text/plain",
+                },
+            }
+            for _ in range(self.options.parameters)
+        ]
+        request: dict[str, Any] = {
+            "method": method,
+            "header": [{"key": "Accept", "value": "application/json"}],
+            "description": f"<p>{self.words(12)}</p>\n",
+            "url": f"{HOST}/{'/'.join(path)}",
+            "urlObject": {
+                "host": [HOST],
+                "path": path,
+                "query": query,
+                "variable": [],
+            },
+        }
+        if method in ("POST", "PATCH"):
+            request["header"].append(
+                {"key": "Content-Type", "value": "application/json"}
+            )
+            request["body"] = {
+                "mode": "raw",
+                "raw": json.dumps(self.example(self.options.example_size // 4)),
+                "options": {"raw": {"language": "json"}},
+            }
+
+        responses = [
+            {
+                "id": self.uid(),
+                "name": f"{status} {self.words(2)}",
+                "code": status,
+                "status": "OK" if status < 400 else "Bad Request",
+                "header": [
+                    {"key": key, "value": value} for key, value in RESPONSE_HEADERS
+                ],
+                "body": self.response_body(),
+                "cookie": [],
+                "_postman_previewlanguage": "json",
+            }
+            for status in (200, 400)[: self.random.randint(1, 2)]
+        ]
+
+        uid = self.uid()
+        return {
+            "_postman_id": uid,
+            "id": uid,
+            "name": f"{self.words(1).title()} {self.words(2)} {self.counter}",
+            "request": request,
+            "response": responses,
+        }
+
+    def folder(self, name: str) -> dict[str, Any]:
+        uid = self.uid()
+        return {
+            "_postman_id": uid,
+            "id": uid,
+            "name": name,
+            "description": f"<p>{self.words(10)}</p>",
+            "item": [],
+        }
+
+    def collection(self) -> dict[str, Any]:
+        options = self.options
+        requests = max(1, round(KANDJI_REQUESTS * options.scale))
+        top_level = max(1, round(KANDJI_FOLDERS * options.scale))
+
+        # Build the folder tree breadth first, requests go in the deepest level
+        roots = [self.folder(f"Folder {index + 1}") for index in range(top_level)]
+        level = roots
+        for depth in range(1, options.depth):
+            next_level = []
+            for parent in level:
+                for index in range(options.fanout):
+                    child = self.folder(f"{parent['name']}.{index + 1}")
+                    parent["item"].append(child)
+                    next_level.append(child)
+            level = next_level
+
+        for index in range(requests):
+            folder = level[index % len(level)]
+            folder["item"].append(self.request(folder["name"]))
+
+        return {
+            "info": {
+                "_postman_id": self.uid(),
+                "name": "Synthetic Kandji API",
+                "description": "Generated by benchmarks.synthetic",
+                "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
+            },
+            "auth": {
+                "type": "bearer",
+                "bearer": {"basicConfig": [{"key": "token", "value": "{api_token}"}]},
+            },
+            "item": roots,
+        }
+
+
+def generate_collection(options: SyntheticOptions) -> dict[str, Any]:
+    """Build a synthetic collection for the given options"""
+    return CollectionFactory(options).collection()
+
+
+def add_options(arg_parser: argparse.ArgumentParser) -> None:
+    """Register the generator options on an argument parser"""
+    defaults = SyntheticOptions()
+    arg_parser.add_argument("--depth", type=int, default=defaults.depth)
+    arg_parser.add_argument("--fanout", type=int, default=defaults.fanout)
+    arg_parser.add_argument("--parameters", type=int, default=defaults.parameters)
+    arg_parser.add_argument("--example-size", type=int, default=defaults.example_size)
+    arg_parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Write a synthetic collection")
+    arg_parser.add_argument("--scale", type=float, default=1.0)
+    arg_parser.add_argument("--output", default="synthetic_collection.json")
+    add_options(arg_parser)
+    args = arg_parser.parse_args()
+
+    options = SyntheticOptions(
+        scale=args.scale,
+        depth=args.depth,
+        fanout=args.fanout,
+        parameters=args.parameters,
+        example_size=args.example_size,
+        seed=args.seed,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(generate_collection(options), f, sort_keys=True, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare the tolerant JSON reader with the regex clean-up it replaced.
+
+Times both on every JSON response body in the collection and reports how many
+bodies each can read and how many values the regex chain altered.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.tolerant_json
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Any, Callable, Iterator
+
+from kandji_openapi import tolerant_json
+
+
+def regex_chain(body: str) -> Any:
+    """The clean-up PostmanResponse.to_openapi used before tolerant_json"""
+    modified_body = re.sub(r"[\n\t]|\.{3}", "", body)
+    modified_body = re.sub(r"[“”‘’]", "'", modified_body)
+    modified_body = re.sub(r"// [^\n}]*", "", modified_body)
+    modified_body = re.sub(r",\s*}", "}", modified_body)
+    modified_body = re.sub(r",\s*]", "]", modified_body)
+    modified_body = re.sub(r",s", ",", modified_body)
+    return json.loads(modified_body)
+
+
+def json_bodies(tree: Any) -> Iterator[str]:
+    """Bodies of the saved responses that declare a JSON content type"""
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for response in node.get("response") or []:
+                headers = response.get("header") or []
+                content_type = next(
+                    (
+                        header.get("value") or ""
+                        for header in headers
+                        if header and header.get("key", "").lower() == "content-type"
+                    ),
+                    "",
+                )
+                if "json" in content_type.lower() and response.get("body"):
+                    yield response["body"]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def run(bodies: list[str], parse: Callable[[str], Any]) -> tuple[list[Any], float]:
+    results = []
+    start = time.perf_counter()
+    for body in bodies:
+        try:
+            results.append(parse(body))
+        except json.JSONDecodeError:
+            results.append(None)
+    return results, time.perf_counter() - start
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark tolerant_json")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    with open(args.collection, "r", encoding="utf-8") as f:
+        bodies = list(json_bodies(json.load(f)))
+    strict = 0
+    for body in bodies:
+        try:
+            json.loads(body)
+            strict += 1
+        except json.JSONDecodeError:
+            pass
+    print(
+        f"{len(bodies)} JSON bodies, {sum(map(len, bodies)):,} characters, "
+        f"{strict} valid JSON"
+    )
+
+    print(f"{'reader':<16}{'seconds':>10}{'read':>8}{'altered':>10}")
+    reference, _ = run(bodies, tolerant_json.loads)
+    for name, parse in (
+        ("regex chain", regex_chain),
+        ("tolerant_json", tolerant_json.loads),
+    ):
+        results, elapsed = min(
+            (run(bodies, parse) for _ in range(args.repeat)), key=lambda r: r[1]
+        )
+        read = sum(result is not None for result in results)
+        altered = sum(
+            result is not None and result != expected
+            for result, expected in zip(results, reference)
+        )
+        print(f"{name:<16}{elapsed:>10.4f}{read:>8}{altered:>10}")
+
+
+if __name__ == "__main__":
+    main()
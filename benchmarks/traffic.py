@@ -0,0 +1,163 @@
+"""Time `generator validate-traffic` on synthetic recorded traffic.
+
+The traffic replays the documented response examples of the spec with the
+path parameters filled in. A share of the records is mutated (a property
+added or given another type, or an undocumented status), so there is drift
+to find. The same records are written as JSON Lines and as a HAR
+file. Every run must produce the same report, the mutated properties must be
+reported, and the traced memory of a serial run must not grow with the
+number of records:
+
+    PYTHONPATH=src python -m benchmarks.traffic --records 20000 --jobs 1 2
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from kandji_openapi.interning import HTTP_METHODS
+from kandji_openapi.routes import PARAMETER
+from kandji_openapi.traffic import validate_traffic
+
+
+def examples(spec: dict[str, Any]) -> list[tuple[str, str, int, Any]]:
+    """(method, template, status, body) of every documented JSON example"""
+    found = []
+    for template, path_item in spec["paths"].items():
+        for method in HTTP_METHODS:
+            operation = path_item.get(method) or {}
+            for status, response in operation.get("responses", {}).items():
+                if not status.isdigit():
+                    continue
+                media_type = response.get("content", {}).get("application/json", {})
+                if isinstance(body := media_type.get("example", {}).get("value"), dict):
+                    found.append((method.upper(), template, int(status), body))
+    return found
+
+
+def mutate(body: dict[str, Any], rng: random.Random) -> tuple[Any, str]:
+    """Changed copy of a response body and the pointer of the change"""
+    body = copy.deepcopy(body)
+    # Only scalars are documented with a type, lists and nulls accept anything
+    typed = sorted(name for name, value in body.items() if isinstance(value, str))
+    if typed and rng.random() < 0.5:
+        name = rng.choice(typed)
+        body[name] = [body[name]]
+        return body, f"type /{name}"
+    body["drifted_field"] = rng.randrange(100)
+    return body, "undocumented /drifted_field"
+
+
+def write_traffic(
+    spec: dict[str, Any], directory: Path, count: int, seed: int
+) -> tuple[Path, Path, set[str]]:
+    """Write the records as JSON Lines and HAR, returning the expected issues"""
+    rng = random.Random(seed)
+    available = examples(spec)
+    expected: set[str] = set()
+    jsonl = directory / "traffic.jsonl"
+    har = directory / "traffic.har"
+    with (
+        open(jsonl, "w", encoding="utf-8") as lines,
+        open(har, "w", encoding="utf-8") as entries,
+    ):
+        entries.write('{"log": {"version": "1.2", "entries": [\n')
+        for index in range(count):
+            method, template, status, body = rng.choice(available)
+            url = "https://acme.api.kandji.io" + PARAMETER.sub(
+                lambda _: f"{rng.randrange(10**6):x}", template
+            )
+            if rng.random() < 0.1:
+                body, issue = mutate(body, rng)
+                expected.add(issue)
+            elif rng.random() < 0.02:
+                status = 418
+                expected.add("status /")
+
+            record = {"method": method, "url": url, "status": status, "body": body}
+            lines.write(json.dumps(record) + "\n")
+            entry = {
+                "request": {"method": method, "url": url, "headers": []},
+                "response": {
+                    "status": status,
+                    "content": {
+                        "mimeType": "application/json",
+                        "text": json.dumps(body),
+                    },
+                },
+            }
+            entries.write(("," if index else "") + json.dumps(entry, indent=1))
+        entries.write("\n]}}\n")
+    return jsonl, har, expected
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark traffic validation")
+    arg_parser.add_argument("--spec", default="openapi.json")
+    arg_parser.add_argument("--records", type=int, default=20_000)
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2])
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    with open(args.spec, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    failures = []
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        small = Path(tmp) / "small"
+        small.mkdir()
+        _, small_har, _ = write_traffic(spec, small, args.records // 4, args.seed)
+        jsonl, har, expected = write_traffic(spec, Path(tmp), args.records, args.seed)
+        print(
+            f"{args.records:,} records, JSON Lines {jsonl.stat().st_size / 2**20:.1f} "
+            f"MB, HAR {har.stat().st_size / 2**20:.1f} MB"
+        )
+
+        for path in (jsonl, har):
+            for jobs in args.jobs:
+                start = time.perf_counter()
+                report = validate_traffic(spec, [path], jobs=jobs)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{path.suffix:<7}jobs {jobs:<3}{elapsed:8.2f}s "
+                    f"{args.records / elapsed:>10,.0f} records/s"
+                )
+                reports.append(report.to_dict())
+
+        peaks = []
+        for path in (small_har, har):
+            tracemalloc.start()
+            validate_traffic(spec, [path], jobs=1)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 2**20)
+            tracemalloc.stop()
+        print(
+            f"traced peak, HAR of {args.records // 4:,} records {peaks[0]:.1f} MB, "
+            f"of {args.records:,} records {peaks[1]:.1f} MB"
+        )
+
+    if any(report != reports[0] for report in reports):
+        failures.append("reports differ between formats or job counts")
+    found = {
+        key for drift in reports[0]["operations"].values() for key in drift["issues"]
+    }
+    if missing := expected - found:
+        failures.append(f"drift not reported: {sorted(missing)[:5]}")
+    if peaks[1] > 2 * peaks[0] + 1:
+        failures.append("memory grows with the number of records")
+    print(f"{reports[0]['drifted']:,} drifted records, {len(found)} distinct issues")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Time every YAML engine and check the output against the golden openapi.yaml.
+
+The checked-in openapi.yaml was written by ruamel's pure-Python emitter, so the
+'ruamel' and 'fast' engines must reproduce it byte for byte. The 'libyaml' engine
+quotes and folds differently and only has to load back to the spec data.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.yaml_engines
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ruamel.yaml import YAML
+
+from kandji_openapi.openapi_generator import YAML_ENGINES, OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+
+BYTE_IDENTICAL_ENGINES = ("ruamel", "fast")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark YAML engines")
+    arg_parser.add_argument("--collection", default="kandji_postman_collection.json")
+    arg_parser.add_argument("--golden", default="openapi.yaml")
+    args = arg_parser.parse_args()
+
+    golden = Path(args.golden).read_text()
+
+    collection = PostmanParser.from_file(args.collection).parse()
+    generator = OpenAPIGenerator(collection)
+    _ = generator.spec_data
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in YAML_ENGINES:
+            generator.yaml_engine = engine
+            output = Path(tmp) / f"{engine}.yaml"
+
+            start = time.perf_counter()
+            generator.to_yaml(output)
+            elapsed = time.perf_counter() - start
+
+            text = output.read_text()
+            if engine in BYTE_IDENTICAL_ENGINES:
+                ok = text == golden
+            else:
+                ok = YAML(typ="safe", pure=True).load(text) == generator.spec_data
+            print(f"{engine:<8} {elapsed:8.3f}s  {'ok' if ok else 'MISMATCH'}")
+            if not ok:
+                failures.append(engine)
+
+    if failures:
+        print(f"Output differs from {args.golden}: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
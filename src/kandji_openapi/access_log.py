@@ -0,0 +1,118 @@
+"""Tag access-log lines with the operationId of the request they record.
+
+Every line is searched for an HTTP request line (`"GET /api/v1/devices
+HTTP/1.1"` in the common and combined log formats) or, failing that, a
+method followed by a path or URL. The output is the line prefixed with the
+operationId and a tab, or with `-` when the request matches no operation.
+
+Lines are processed as bytes, so logs in any ASCII-compatible encoding pass
+through unchanged. Large files are split at line boundaries into one chunk
+per worker process, and the tagged chunks are joined in order.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from kandji_openapi.routes import RouteTrie
+
+METHODS = rb"GET|PUT|POST|DELETE|OPTIONS|HEAD|PATCH|TRACE"
+REQUEST_LINE = re.compile(rb'"(' + METHODS + rb') (\S+) HTTP/[0-9.]+"')
+REQUEST = re.compile(rb"\b(" + METHODS + rb")\s+((?:https?://|/)\S*)")
+UNMATCHED = b"-"
+# Distinct requests whose route is remembered, paths with IDs rarely repeat
+SEEN_LIMIT = 100_000
+# Files smaller than this are tagged in-process, workers would cost more
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+
+def tag_lines(
+    trie: RouteTrie, source: Iterable[bytes], output: BinaryIO
+) -> Counter[str]:
+    """Tag every line of `source`, returning the number of lines per operation"""
+    counts: Counter[bytes] = Counter()
+    # Routes are looked up once per distinct request
+    seen: dict[tuple[bytes, bytes], bytes] = {}
+    write = output.write
+    for line in source:
+        tag = UNMATCHED
+        if found := REQUEST_LINE.search(line) or REQUEST.search(line):
+            request = (found[1], found[2])
+            if (cached := seen.get(request)) is None:
+                route = trie.match(found[1].decode(), found[2].decode("latin-1"))
+                cached = UNMATCHED
+                if route:
+                    cached = (route.operation_id or route.template).encode()
+                if len(seen) < SEEN_LIMIT:
+                    seen[request] = cached
+            tag = cached
+        counts[tag] += 1
+        write(tag + b"\t" + line)
+        if not line.endswith(b"\n"):
+            write(b"\n")
+    return Counter({tag.decode(): count for tag, count in counts.items()})
+
+
+def _chunks(path: Path, count: int) -> list[tuple[int, int]]:
+    """(start, end) byte ranges of `path` split at line boundaries"""
+    size = path.stat().st_size
+    bounds = [0]
+    with open(path, "rb") as f:
+        for index in range(1, count):
+            f.seek(max(size * index // count, bounds[-1]))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _read_range(f: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    """Lines of the byte range `start` to `end` of `f`"""
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0 and (line := f.readline()):
+        remaining -= len(line)
+        yield line
+
+
+def _tag_chunk(
+    trie: RouteTrie, path: Path, start: int, end: int, output: Path
+) -> Counter[str]:
+    """Process pool entry point, tags one byte range into `output`"""
+    with open(path, "rb") as source, open(output, "wb") as f:
+        return tag_lines(trie, _read_range(source, start, end), f)
+
+
+def tag_file(
+    trie: RouteTrie,
+    path: Path,
+    output: BinaryIO,
+    jobs: Optional[int] = None,
+    parallel_min_bytes: int = PARALLEL_MIN_BYTES,
+) -> Counter[str]:
+    """Tag the lines of the file at `path`, in parallel when it is large"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or path.stat().st_size < parallel_min_bytes:
+        with open(path, "rb") as source:
+            return tag_lines(trie, source, output)
+
+    counts: Counter[str] = Counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        chunks = _chunks(path, jobs)
+        parts = [Path(tmp) / f"{index}.log" for index in range(len(chunks))]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(_tag_chunk, trie, path, start, end, part)
+                for (start, end), part in zip(chunks, parts)
+            ]
+            for future in futures:
+                counts.update(future.result())
+        for part in parts:
+            with open(part, "rb") as f:
+                shutil.copyfileobj(f, output)
+    return counts
@@ -0,0 +1,113 @@
+"""Write minified and precompressed variants of the generated documents.
+
+The variants are produced from the text the writers emit, while they emit
+it: `artifact_write` returns a file that forwards every write to the
+document and to a gzip or zstd compressor per requested format, so nothing
+is serialized twice. The minified JSON is encoded alongside the pretty one,
+member by member (see `json_stream.dump_streaming`).
+
+Variants are named after their document:
+
+    openapi.json       openapi.json.gz      openapi.json.zst
+    openapi.min.json   openapi.min.json.gz  openapi.min.json.zst
+
+zstd needs the `zstandard` package, which is only imported when requested.
+"""
+
+import gzip
+import io
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Sequence, TextIO, cast
+
+from kandji_openapi.files import atomic_write, atomic_write_bytes
+
+COMPRESSIONS = ("gz", "zst")
+# Written once and downloaded on every deploy, so favour size over speed
+GZIP_LEVEL = 9
+ZSTD_LEVEL = 19
+
+
+def minified_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.min{path.suffix}")
+
+
+def compressed_path(path: Path, compression: str) -> Path:
+    return path.with_name(f"{path.name}.{compression}")
+
+
+def variant_paths(
+    path: Path, compressions: Sequence[str], minified: bool = False
+) -> list[Path]:
+    """Files written besides `path` for these options"""
+    documents = [path, minified_path(path)] if minified else [path]
+    paths = documents[1:]
+    for document in documents:
+        paths.extend(compressed_path(document, c) for c in compressions)
+    return paths
+
+
+def check_compressions(compressions: Sequence[str]) -> None:
+    """Raise ValueError for an unknown format or a missing compressor"""
+    for compression in compressions:
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression '{compression}', expected one of {COMPRESSIONS}"
+            )
+    if "zst" in compressions:
+        try:
+            import zstandard  # noqa: F401  # pyright: ignore[reportMissingImports]
+        except ImportError:
+            raise ValueError("zstd compression requires the zstandard package")
+
+
+class _Tee(io.TextIOBase):
+    """Text file forwarding every write to several others"""
+
+    def __init__(self, files: list[TextIO]) -> None:
+        self.files = files
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        for file in self.files:
+            file.write(text)
+        return len(text)
+
+
+def _compressor(compression: str, raw: BinaryIO) -> TextIO:
+    """Text file compressing what is written to it into `raw`"""
+    if compression == "gz":
+        # No name or timestamp in the header, so the same text gives the same file
+        binary = gzip.GzipFile(
+            filename="", mode="wb", compresslevel=GZIP_LEVEL, fileobj=raw, mtime=0
+        )
+    else:
+        import zstandard  # pyright: ignore[reportMissingImports]
+
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        binary = compressor.stream_writer(raw, closefd=False)
+    return io.TextIOWrapper(cast(BinaryIO, binary), encoding="utf-8", newline="")
+
+
+@contextmanager
+def artifact_write(
+    file_path: Path, compressions: Sequence[str] = ()
+) -> Iterator[TextIO]:
+    """`atomic_write` that also writes a compressed copy per format.
+
+    Either every file is replaced or, on an error, none of them.
+    """
+    with ExitStack() as stack:
+        files = [stack.enter_context(atomic_write(file_path))]
+        if not compressions:
+            yield files[0]
+            return
+        for compression in compressions:
+            raw = stack.enter_context(
+                atomic_write_bytes(compressed_path(file_path, compression))
+            )
+            # Closed before `raw` is renamed into place, which flushes the frame
+            files.append(stack.enter_context(_compressor(compression, raw)))
+        yield cast(TextIO, _Tee(files))
@@ -0,0 +1,276 @@
+"""Convert many collections in one process pool.
+
+Every collection gets its own output directory, named after the file. The
+workers are started once and convert several collections each, so the
+imports and the per-process caches are reused from one collection to the
+next:
+
+- the normalized description and name text (`strings.string_formatting`)
+- the shared parameter and header components (`models.components`)
+- the converted operations of every request (`cache.ConversionCache`), so a
+  request that is unchanged between two versions of a collection is
+  converted once per worker
+
+The conversion cache is also shared between the workers on disk: in the
+cache directory when one is given, which later runs reuse too, otherwise in
+a temporary directory removed after the batch. The text and component caches
+are plain in-process caches and are not shared between workers, and the
+interned schemas and components are rebuilt for every collection, since
+interning works on one finished document.
+
+Collections are handed out in runs of consecutive files, so versions of the
+same collection listed in order mostly land on the same worker. The result
+is a `BatchReport` with the timing of every collection.
+"""
+
+import glob
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Optional
+
+from kandji_openapi.cache import ConversionCache
+from kandji_openapi.examples import ExampleLimits
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+
+PHASES = ("parse", "convert", "write")
+
+
+@dataclass
+class BatchOptions:
+    """Output names and generator options shared by every collection"""
+
+    json_name: Optional[str] = "openapi.json"
+    yaml_name: Optional[str] = "openapi.yaml"
+    yaml_engine: str = "ruamel"
+    intern_schemas: bool = False
+    intern_components: bool = False
+    fast_build: bool = False
+    minify: bool = False
+    compressions: tuple[str, ...] = ()
+    examples: Optional[ExampleLimits] = None
+    parallel_writes: bool = False
+    cache_dir: Optional[str] = None
+    cache_max_bytes: int = 64 * 1024 * 1024
+
+
+@dataclass
+class CollectionResult:
+    collection: str
+    output_dir: str
+    worker: int = 0
+    requests: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    seconds: dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+
+@dataclass
+class BatchReport:
+    results: list[CollectionResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def failed(self) -> list[CollectionResult]:
+        return [result for result in self.results if result.error]
+
+    def phase_totals(self) -> dict[str, float]:
+        return {
+            phase: sum(result.seconds.get(phase, 0.0) for result in self.results)
+            for phase in PHASES
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "wall_seconds": self.wall_seconds,
+            "phase_seconds": self.phase_totals(),
+            "collections": [asdict(result) for result in self.results],
+        }
+
+    def report(self) -> str:
+        """Human-readable table of every collection and the totals"""
+        width = max([len(Path(r.collection).name) for r in self.results] + [10])
+        lines = [
+            f"{'collection':<{width}}  {'requests':>8}  {'cached':>6}  "
+            + "".join(f"{phase:>9}" for phase in PHASES)
+            + f"{'total':>9}  output"
+        ]
+        for result in self.results:
+            name = Path(result.collection).name
+            if result.error:
+                lines.append(f"{name:<{width}}  FAILED: {result.error}")
+                continue
+            lines.append(
+                f"{name:<{width}}  {result.requests:>8}  {result.cache_hits:>6}  "
+                + "".join(f"{result.seconds.get(p, 0.0):>8.2f}s" for p in PHASES)
+                + f"{result.total_seconds:>8.2f}s  {result.output_dir}"
+            )
+
+        totals = self.phase_totals()
+        converted = len(self.results) - len(self.failed)
+        busy = sum(totals.values())
+        lines.append(
+            f"{'total':<{width}}  {sum(r.requests for r in self.results):>8}  "
+            f"{sum(r.cache_hits for r in self.results):>6}  "
+            + "".join(f"{totals[p]:>8.2f}s" for p in PHASES)
+            + f"{busy:>8.2f}s"
+        )
+        lines.append(
+            f"{converted} of {len(self.results)} collections converted in "
+            f"{self.wall_seconds:.2f}s by {self.workers} worker(s), "
+            f"{busy / max(self.wall_seconds, 1e-9):.1f}x the work of one process"
+        )
+        return "\n".join(lines)
+
+
+def expand_collections(patterns: list[str]) -> list[Path]:
+    """Collection files named by `patterns`, expanding globs in sorted order"""
+    paths: list[Path] = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise ValueError(f"No collections match '{pattern}'")
+            paths.extend(Path(match) for match in matches)
+        else:
+            paths.append(Path(pattern))
+    return list(dict.fromkeys(paths))
+
+
+def output_dirs(collections: list[Path], root: Path) -> list[Path]:
+    """A distinct directory under `root` for every collection, named by its stem"""
+    taken: set[str] = set()
+    directories = []
+    for collection in collections:
+        name = base = collection.stem
+        suffix = 2
+        while name in taken:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        taken.add(name)
+        directories.append(root / name)
+    return directories
+
+
+_cache: Optional[ConversionCache] = None
+
+
+def _init_worker(options: BatchOptions) -> None:
+    global _cache
+    _cache = ConversionCache(
+        Path(options.cache_dir) if options.cache_dir else None,
+        max_bytes=options.cache_max_bytes,
+        in_memory=True,
+    )
+
+
+def convert_collection(
+    collection: Path, output_dir: Path, options: BatchOptions
+) -> CollectionResult:
+    """Convert one collection with this process's caches"""
+    if _cache is None:
+        _init_worker(options)
+    assert _cache is not None
+    result = CollectionResult(str(collection), str(output_dir), worker=os.getpid())
+    hits, misses = _cache.hits, _cache.misses
+
+    try:
+        start = time.perf_counter()
+        parsed = PostmanParser.from_file(str(collection)).parse()
+        result.seconds["parse"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        generator = OpenAPIGenerator(
+            parsed,
+            yaml_engine=options.yaml_engine,
+            cache=_cache,
+            intern_schemas=options.intern_schemas,
+            intern_components=options.intern_components,
+            fast_build=options.fast_build,
+            minify=options.minify,
+            compressions=options.compressions,
+            examples=options.examples,
+        )
+        result.seconds["convert"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        generator.write(
+            output_dir / options.json_name if options.json_name else None,
+            output_dir / options.yaml_name if options.yaml_name else None,
+            parallel=options.parallel_writes,
+        )
+        result.seconds["write"] = time.perf_counter() - start
+
+        leaves = parsed.index.leaves
+        result.requests = len(leaves)
+        # Kept for the next collection, which is most likely the next version
+        _cache.retain({leaf.digest for leaf in leaves})
+    except Exception as e:
+        # One broken collection must not stop the others
+        result.error = f"{type(e).__name__}: {e}"
+
+    result.cache_hits = _cache.hits - hits
+    result.cache_misses = _cache.misses - misses
+    return result
+
+
+def _convert_run(
+    run: list[tuple[Path, Path]], options: BatchOptions
+) -> list[CollectionResult]:
+    """Process pool entry point, converts consecutive collections in order"""
+    return [convert_collection(path, output, options) for path, output in run]
+
+
+def run_batch(
+    collections: list[Path],
+    root: Path,
+    options: BatchOptions,
+    jobs: Optional[int] = None,
+) -> BatchReport:
+    """Convert every collection to its directory under `root`"""
+    jobs = min(jobs or os.cpu_count() or 1, max(1, len(collections)))
+    pairs = list(zip(collections, output_dirs(collections, root)))
+    report = BatchReport(workers=jobs)
+    start = time.perf_counter()
+
+    if jobs == 1:
+        _init_worker(options)
+        report.results = _convert_run(pairs, options)
+    else:
+        # Runs of consecutive collections, two per worker to balance the load
+        size = math.ceil(len(pairs) / (jobs * 2))
+        runs = [pairs[index : index + size] for index in range(0, len(pairs), size)]
+        with ExitStack() as stack:
+            if not options.cache_dir:
+                # Shared by the workers for this batch only
+                cache_dir = stack.enter_context(
+                    tempfile.TemporaryDirectory(prefix="kandji-openapi-batch-")
+                )
+                options = replace(options, cache_dir=cache_dir)
+            pool = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=jobs, initializer=_init_worker, initargs=(options,)
+                )
+            )
+            for results in pool.map(_convert_run, runs, [options] * len(runs)):
+                report.results.extend(results)
+
+    if options.cache_dir and Path(options.cache_dir).exists():
+        # Every worker wrote to the directory, trim it once at the end
+        ConversionCache(Path(options.cache_dir), options.cache_max_bytes).close()
+    report.wall_seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from openapi_pydantic import Operation
+
+from kandji_openapi.files import atomic_write
+from kandji_openapi.models.construction import plain_data
+from kandji_openapi.version import generator_version
+
+
+class ConversionCache:
+    """Content-addressed on-disk cache of converted Postman items.
+
+    Each entry holds the OpenAPI operations produced by one request item and is
+    keyed by the hash of the item's raw JSON (see `PostmanItem.digest`) combined
+    with the generator version. The cache directory is kept under `max_bytes` by
+    evicting the least recently used entries when the cache is closed.
+
+    With `in_memory` the entries are also kept in this process, so a long-lived
+    caller only reconverts items that changed. Without a `directory` the cache
+    lives in memory only.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        in_memory: bool = False,
+    ) -> None:
+        self.directory = Path(directory) if directory else None
+        self.max_bytes = max_bytes
+        self.in_memory = in_memory or directory is None
+        self.memory: dict[str, dict[str, Operation]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        assert self.directory
+        key = hashlib.sha256(f"{generator_version()}:{digest}".encode()).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def get(self, digest: str) -> Optional[dict[str, Operation]]:
+        """Return the cached operations for an item digest, if present"""
+        if (operations := self.memory.get(digest)) is not None:
+            self.hits += 1
+            return operations
+        if not self.directory:
+            self.misses += 1
+            return None
+
+        path = self._path(digest)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            operations = {
+                method: Operation.model_validate(operation)
+                for method, operation in data.items()
+            }
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except ValueError:
+            # Corrupt or outdated entry, convert the item again
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        # Refresh the access time used for LRU eviction
+        os.utime(path)
+        self.hits += 1
+        if self.in_memory:
+            self.memory[digest] = operations
+        return operations
+
+    def put(self, digest: str, operations: dict[str, Operation]) -> None:
+        """Store the operations converted from an item digest"""
+        if self.in_memory:
+            self.memory[digest] = operations
+        if not self.directory:
+            return
+
+        # Operations built with fast construction are plain data already
+        data = plain_data(operations)
+
+        # Write atomically so concurrent runs never observe a partial entry
+        with atomic_write(self._path(digest)) as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def retain(self, digests: set[str]) -> None:
+        """Drop the in-memory entries of items that are no longer present"""
+        self.memory = {
+            digest: operations
+            for digest, operations in self.memory.items()
+            if digest in digests
+        }
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits `max_bytes`"""
+        if not self.directory:
+            return
+
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    def merge_counts(self, other: "ConversionCache") -> None:
+        """Add the hit/miss counts of a copy used in another process"""
+        self.hits += other.hits
+        self.misses += other.misses
+        self.evictions += other.evictions
+
+    def close(self) -> None:
+        self.evict()
+
+    def summary(self) -> str:
+        return (
+            f"Conversion cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.evictions} evicted"
+        )
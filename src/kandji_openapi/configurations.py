@@ -1 +1,5 @@
 KANDJI_API_DOCS_URL = "https://api-docs.kandji.io"
+
+YAML_ENGINES = ("ruamel", "libyaml", "fast")
+
+OUTPUT_FORMATS = ("json", "yaml", "both")
@@ -0,0 +1,156 @@
+"""Shrink the request and response examples of the generated spec.
+
+Examples are copied verbatim from the collection, so a response listing every
+device ends up in the spec in full. Like the interning passes, these passes
+work on the plain-data tree (`OpenAPIGenerator.spec_data`) in place:
+
+- `cap_examples` keeps the first items of arrays and replaces objects and
+  arrays nested deeper than a limit with empty ones
+- `externalize_examples` moves examples above a size to separate files and
+  points the example at them with `externalValue`
+
+Both return the bytes saved per operation ("METHOD /path"), measured as the
+compact JSON of the examples before and after. `ExampleLimits` holds the
+command line options and runs both.
+"""
+
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from kandji_openapi.interning import HTTP_METHODS, canonical
+
+
+def _size(value: Any) -> int:
+    return len(canonical(value).encode())
+
+
+def iter_examples(spec: dict[str, Any]) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """(operation, name hint, Example object) of every request and response body"""
+    paths = spec.get("paths", {})
+    for path in sorted(paths):
+        for method in HTTP_METHODS:
+            if not (operation := paths[path].get(method)):
+                continue
+            key = f"{method.upper()} {path}"
+            prefix = operation.get("operationId") or key
+
+            media_types = []
+            request_body = operation.get("requestBody", {})
+            for content_type, media_type in request_body.get("content", {}).items():
+                media_types.append((f"{prefix}.request.{content_type}", media_type))
+            for status, response in sorted(operation.get("responses", {}).items()):
+                for content_type, media_type in response.get("content", {}).items():
+                    media_types.append(
+                        (f"{prefix}.{status}.{content_type}", media_type)
+                    )
+
+            for hint, media_type in media_types:
+                example = media_type.get("example")
+                if isinstance(example, dict) and "value" in example:
+                    yield key, hint, example
+                for name, example in sorted(media_type.get("examples", {}).items()):
+                    if isinstance(example, dict) and "value" in example:
+                        yield key, f"{hint}.{name}", example
+
+
+def truncate(
+    value: Any, max_items: Optional[int], max_depth: Optional[int], depth: int = 0
+) -> Any:
+    """Copy of `value` with arrays cut to `max_items` and nesting to `max_depth`"""
+    if isinstance(value, dict):
+        if max_depth is not None and depth >= max_depth:
+            return {}
+        return {
+            key: truncate(item, max_items, max_depth, depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        if max_depth is not None and depth >= max_depth:
+            return []
+        items = value if max_items is None else value[:max_items]
+        return [truncate(item, max_items, max_depth, depth + 1) for item in items]
+    return value
+
+
+def cap_examples(
+    spec: dict[str, Any], max_items: Optional[int], max_depth: Optional[int]
+) -> Counter[str]:
+    """Truncate every example, returning the bytes saved per operation"""
+    saved: Counter[str] = Counter()
+    for operation, _, example in iter_examples(spec):
+        value = example["value"]
+        if not isinstance(value, (dict, list)):
+            continue
+        capped = truncate(value, max_items, max_depth)
+        if (difference := _size(value) - _size(capped)) > 0:
+            example["value"] = capped
+            saved[operation] += difference
+    return saved
+
+
+def file_name(hint: str) -> str:
+    """File name for the example described by `hint`"""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", hint).strip("-") + ".json"
+
+
+def relative_prefix(directory: Path, document_dir: Path) -> str:
+    """`externalValue` prefix of files in `directory` for a document in
+    `document_dir`, which is what the reference is resolved against"""
+    return Path(os.path.relpath(directory, document_dir)).as_posix() + "/"
+
+
+def externalize_examples(
+    spec: dict[str, Any], min_bytes: int, prefix: str = ""
+) -> tuple[dict[str, Any], Counter[str]]:
+    """Move examples of at least `min_bytes` out of the spec.
+
+    Returns the example values by file name, for the caller to write, and the
+    bytes saved per operation. The examples refer to `prefix` + file name.
+    """
+    files: dict[str, Any] = {}
+    saved: Counter[str] = Counter()
+    for operation, hint, example in iter_examples(spec):
+        value = example["value"]
+        if _size(value) < min_bytes:
+            continue
+        before = _size(example)
+
+        name = base = file_name(hint)
+        suffix = 2
+        while name in files:
+            name = f"{base.removesuffix('.json')}-{suffix}.json"
+            suffix += 1
+        files[name] = value
+
+        del example["value"]
+        example["externalValue"] = prefix + name
+        saved[operation] += before - _size(example)
+    return files, saved
+
+
+@dataclass
+class ExampleLimits:
+    max_items: Optional[int] = None
+    max_depth: Optional[int] = None
+    # Examples of at least `min_bytes` are moved to files in `directory`,
+    # which the spec refers to as `prefix`
+    directory: Optional[Path] = None
+    min_bytes: int = 4096
+    prefix: str = ""
+
+    def apply(self, spec: dict[str, Any]) -> tuple[dict[str, Any], Counter[str]]:
+        """Shrink the examples of `spec`, see `externalize_examples`"""
+        saved: Counter[str] = Counter()
+        if self.max_items is not None or self.max_depth is not None:
+            saved += cap_examples(spec, self.max_items, self.max_depth)
+        files: dict[str, Any] = {}
+        if self.directory:
+            files, externalized = externalize_examples(
+                spec, self.min_bytes, self.prefix
+            )
+            saved += externalized
+        return files, saved
@@ -0,0 +1,154 @@
+"""Download the Postman collection, skipping the work when it has not changed.
+
+The ETag and Last-Modified validators of the last download are kept in a
+small state file next to the collection and sent back as If-None-Match and
+If-Modified-Since, so an unchanged collection costs a single 304 response.
+The body is requested gzip-compressed, decompressed while it streams to
+disk and written in the canonical form the repository keeps
+(`json.dump(..., sort_keys=True, indent=2)`).
+"""
+
+import http.client
+import json
+import os
+import tempfile
+import urllib.error
+import urllib.request
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Optional
+
+from kandji_openapi.files import atomic_write
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class FetchState:
+    """Validators of the last successful download"""
+
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["FetchState"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(**json.load(f))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        with atomic_write(path) as f:
+            json.dump(asdict(self), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+def default_state_path(output: Path) -> Path:
+    return output.with_name(f"{output.stem}.fetch.json")
+
+
+def _read(response: IO[bytes], url: str) -> bytes:
+    """Next chunk of the body, with a timeout or dropped connection as URLError"""
+    try:
+        return response.read(CHUNK_SIZE)
+    except (OSError, http.client.HTTPException) as e:
+        raise urllib.error.URLError(f"reading {url} failed: {e!r}")
+
+
+def _stream_to(
+    response: IO[bytes], destination: IO[bytes], encoding: str, url: str = ""
+) -> int:
+    """Copy the response body to `destination`, decompressing it if needed.
+
+    Returns the number of bytes received over the wire. Raises `URLError` if
+    reading the body fails and `ValueError` if it cannot be decompressed.
+    """
+    decompressor = None
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        decompressor = zlib.decompressobj()
+    elif encoding not in ("", "identity"):
+        raise ValueError(f"Unsupported Content-Encoding '{encoding}'")
+
+    received = 0
+    try:
+        while chunk := _read(response, url):
+            received += len(chunk)
+            destination.write(decompressor.decompress(chunk) if decompressor else chunk)
+        if decompressor:
+            destination.write(decompressor.flush())
+    except zlib.error as e:
+        raise ValueError(f"Corrupt {encoding} response body: {e}")
+    if decompressor and not decompressor.eof:
+        raise ValueError(f"Truncated {encoding} response body")
+    return received
+
+
+def fetch_collection(
+    url: str,
+    output: Path,
+    state_path: Optional[Path] = None,
+    force: bool = False,
+    timeout: float = 60,
+) -> Optional[int]:
+    """Download the collection at `url` to `output` if it changed.
+
+    Returns the number of bytes received, or None when the server answered
+    304 Not Modified and nothing was written. Raises `urllib.error.URLError`
+    on network and HTTP errors and `ValueError` if the body is not a Postman
+    collection.
+    """
+    state_path = state_path or default_state_path(output)
+    state = FetchState.load(state_path)
+
+    request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+    # Only a collection that is still on disk can be reused
+    if state and state.url == url and output.exists() and not force:
+        if state.etag:
+            request.add_header("If-None-Match", state.etag)
+        if state.last_modified:
+            request.add_header("If-Modified-Since", state.last_modified)
+
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
+    except urllib.error.URLError:
+        raise
+    except (OSError, http.client.HTTPException) as e:
+        # A timeout or dropped connection while reading the status and headers
+        raise urllib.error.URLError(f"requesting {url} failed: {e!r}")
+
+    with response:
+        encoding = response.headers.get("Content-Encoding", "").strip().lower()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # The raw body is spooled next to the output, sorting keys needs all of it
+        fd, temp_name = tempfile.mkstemp(
+            dir=output.parent, prefix=f".{output.name}.", suffix=".download"
+        )
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                received = _stream_to(response, temp, encoding, url)
+            with open(temp_name, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        finally:
+            os.unlink(temp_name)
+
+        if not isinstance(data, dict) or "info" not in data:
+            raise ValueError(f"{url} did not return a Postman collection")
+
+        with atomic_write(output) as f:
+            json.dump(data, f, sort_keys=True, indent=2)
+
+        FetchState(
+            url=url,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        ).save(state_path)
+    return received
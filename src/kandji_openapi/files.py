@@ -0,0 +1,80 @@
+import filecmp
+import hashlib
+import os
+import stat
+import tempfile
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, TextIO
+
+
+def sha256_file(file_path: Path) -> str:
+    """Hex sha256 digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_umask() -> int:
+    """The process umask, without changing it where the system allows"""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    # Elsewhere it can only be read by setting it, which is process-global
+    # and must not race with the writer threads, so this only runs on import
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _file_mode(file_path: Path) -> int:
+    """Permissions of an existing file, or the umask default for a new one"""
+    try:
+        return stat.S_IMODE(file_path.stat().st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write(file_path: Path) -> AbstractContextManager[TextIO]:
+    """Write to a temporary file and rename it over `file_path` on success.
+
+    Readers never see a partially written file, and the destination is left
+    untouched (including its mtime) when the new content is identical.
+    """
+    return _atomic_write(file_path, "w")
+
+
+def atomic_write_bytes(file_path: Path) -> AbstractContextManager[BinaryIO]:
+    """`atomic_write` in binary mode"""
+    return _atomic_write(file_path, "wb")
+
+
+@contextmanager
+def _atomic_write(file_path: Path, mode: str) -> Iterator[Any]:
+    file_path = Path(file_path)
+    fd, temp_path = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, mode) as temp:
+            yield temp
+
+        if file_path.exists() and filecmp.cmp(temp_path, file_path, shallow=False):
+            os.unlink(temp_path)
+        else:
+            # mkstemp creates owner-only files, use the permissions open() would
+            os.chmod(temp_path, _file_mode(file_path))
+            os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
@@ -0,0 +1,204 @@
+"""Move repeated structures of the generated spec into `components`.
+
+The passes work on the plain-data tree shared by the JSON and YAML writers
+(`OpenAPIGenerator.spec_data`) and mutate it in place. Structures are compared
+by their canonical JSON, so two objects are shared only if they would be
+written identically.
+"""
+
+import json
+import re
+from collections import Counter, defaultdict
+from typing import Any, Iterator
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+
+def canonical(value: Any) -> str:
+    """Stable text form of a plain-data value, used as its identity"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def component_name(hint: str) -> str:
+    """PascalCase component name made of characters allowed by OpenAPI"""
+    words = re.split(r"[^a-zA-Z0-9]+", hint)
+    return "".join(word[:1].upper() + word[1:] for word in words) or "Component"
+
+
+def iter_operations(spec: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Operations of the spec in sorted path and method order"""
+    paths = spec.get("paths", {})
+    for path in sorted(paths):
+        for method in HTTP_METHODS:
+            if operation := paths[path].get(method):
+                yield operation
+
+
+class Interner:
+    """Names and stores the shared objects of one `components` section"""
+
+    def __init__(self, spec: dict[str, Any], section: str) -> None:
+        self.spec = spec
+        self.section = section
+        self.prefix = f"#/components/{section}/"
+        self.names: dict[str, str] = {}
+        # Detached while interning so references are only counted once
+        self.store: dict[str, Any] = spec.get("components", {}).pop(section, {})
+
+    def ref(self, key: str, value: Any, hint: str) -> dict[str, str]:
+        """Reference to the component holding `value`, creating it if needed"""
+        if key not in self.names:
+            name = base = component_name(hint)
+            suffix = 2
+            while name in self.store:
+                name = f"{base}{suffix}"
+                suffix += 1
+            self.names[key] = name
+            self.store[name] = value
+        return {"$ref": self.prefix + self.names[key]}
+
+    def is_new(self, key: str) -> bool:
+        return key not in self.names
+
+    def finish(self) -> int:
+        """Inline components referenced only once and publish the section"""
+        refs: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for ref in iter_refs([self.spec, self.store], self.prefix):
+            refs[ref["$ref"]].append(ref)
+
+        for name in list(self.names.values()):
+            if len(found := refs[self.prefix + name]) == 1:
+                found[0].clear()
+                found[0].update(self.store.pop(name))
+
+        if self.store:
+            components = self.spec.setdefault("components", {})
+            components[self.section] = dict(sorted(self.store.items()))
+        return len(self.store)
+
+
+def iter_refs(tree: Any, prefix: str) -> Iterator[dict[str, Any]]:
+    """Every `$ref` object in `tree` pointing at a name starting with `prefix`"""
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith(prefix):
+                yield node
+            else:
+                stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _is_object_schema(schema: Any) -> bool:
+    return (
+        isinstance(schema, dict)
+        and schema.get("type") == "object"
+        and bool(schema.get("properties"))
+    )
+
+
+def _response_schema_slots(
+    spec: dict[str, Any],
+) -> Iterator[tuple[dict[str, Any], str, str]]:
+    """(media type, "schema", name hint) of every response body schema"""
+    for operation in iter_operations(spec):
+        operation_id = operation.get("operationId", "")
+        for status, response in sorted(operation.get("responses", {}).items()):
+            for media_type in response.get("content", {}).values():
+                if _is_object_schema(media_type.get("schema")):
+                    yield media_type, "schema", f"{operation_id} {status} response"
+
+
+def intern_schemas(spec: dict[str, Any]) -> int:
+    """Store repeated inferred response schemas once under components/schemas.
+
+    Object schemas (at any depth) that occur more than once are replaced by a
+    `$ref`. Returns the number of shared schemas.
+    """
+    slots = list(_response_schema_slots(spec))
+
+    counts: Counter[str] = Counter()
+    stack = [media_type[key] for media_type, key, _ in slots]
+    while stack:
+        schema = stack.pop()
+        if _is_object_schema(schema):
+            counts[canonical(schema)] += 1
+            stack.extend(schema["properties"].values())
+
+    interner = Interner(spec, "schemas")
+    # Reversed so the first use in document order names the component
+    pending = list(reversed(slots))
+    while pending:
+        parent, key, hint = pending.pop()
+        schema = parent[key]
+        if not _is_object_schema(schema):
+            continue
+
+        children = [(schema["properties"], name, name) for name in schema["properties"]]
+        schema_key = canonical(schema)
+        if counts[schema_key] > 1:
+            # Only the first copy is kept, its nested schemas are interned too
+            if not interner.is_new(schema_key):
+                children = []
+            parent[key] = interner.ref(schema_key, schema, hint)
+        pending.extend(reversed(children))
+
+    return interner.finish()
+
+
+def _intern_slots(
+    spec: dict[str, Any], section: str, slots: list[tuple[Any, Any, str]]
+) -> int:
+    """Move values found more than once in `slots` to components/<section>"""
+    slots = [
+        (parent, key, hint) for parent, key, hint in slots if "$ref" not in parent[key]
+    ]
+    counts = Counter(canonical(parent[key]) for parent, key, _ in slots)
+
+    interner = Interner(spec, section)
+    for parent, key, hint in slots:
+        value_key = canonical(parent[key])
+        # Values no bigger than a reference to them are left inline
+        ref_size = len(interner.prefix) + len(component_name(hint)) + len('{"$ref":""}')
+        if counts[value_key] > 1 and len(value_key) > ref_size:
+            parent[key] = interner.ref(value_key, parent[key], hint)
+    return interner.finish()
+
+
+def intern_parameters(spec: dict[str, Any]) -> int:
+    """Store repeated operation parameters once under components/parameters"""
+    slots = []
+    for operation in iter_operations(spec):
+        for position, parameter in enumerate(operation.get("parameters", [])):
+            hint = f"{parameter.get('name', '')} {parameter.get('in', '')}"
+            slots.append((operation["parameters"], position, hint))
+    return _intern_slots(spec, "parameters", slots)
+
+
+def intern_headers(spec: dict[str, Any]) -> int:
+    """Store repeated response headers once under components/headers"""
+    slots = []
+    for operation in iter_operations(spec):
+        for _, response in sorted(operation.get("responses", {}).items()):
+            headers = response.get("headers", {})
+            for name in sorted(headers):
+                slots.append((headers, name, name))
+    return _intern_slots(spec, "headers", slots)
+
+
+def intern_request_bodies(spec: dict[str, Any]) -> int:
+    """Store repeated request bodies once under components/requestBodies"""
+    slots = []
+    for operation in iter_operations(spec):
+        if "requestBody" in operation:
+            hint = f"{operation.get('operationId', '')} request"
+            slots.append((operation, "requestBody", hint))
+    return _intern_slots(spec, "requestBodies", slots)
+
+
+def intern_shared_components(spec: dict[str, Any]) -> int:
+    """Intern parameters, response headers and request bodies"""
+    return intern_parameters(spec) + intern_headers(spec) + intern_request_bodies(spec)
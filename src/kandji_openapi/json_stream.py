@@ -0,0 +1,85 @@
+"""Write a JSON document one member at a time.
+
+`dump_streaming` produces exactly what `json.dump(document, f, sort_keys=True,
+indent=2)` would, but the members of one large object (the spec's `paths`)
+are produced lazily and written as they arrive, so only one of them is held
+as plain data at a time. The same pass can write the document minified, as
+`json.dump(document, f, sort_keys=True, separators=(",", ":"))` would.
+"""
+
+import json
+from typing import Any, Callable, Iterable, Optional, TextIO
+
+INDENT = 2
+
+
+def _encode(value: Any, level: int) -> str:
+    """`value` as it appears nested `level` objects deep in the document"""
+    text = json.dumps(value, sort_keys=True, indent=INDENT)
+    # Strings never contain a raw newline, so every newline starts a new line
+    return text.replace("\n", "\n" + " " * INDENT * level)
+
+
+def _key(name: str, level: int) -> str:
+    return "\n" + " " * INDENT * level + json.dumps(name) + ": "
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def dump_streaming(
+    head: dict[str, Any],
+    name: str,
+    members: Iterable[tuple[str, Any]],
+    file: TextIO,
+    on_member: Optional[Callable[[str, Any, int, int], None]] = None,
+    minified: Optional[TextIO] = None,
+) -> None:
+    """Write `head` with a `name` member holding `members`, which must be sorted
+
+    `on_member(key, value, offset, length)` is called with the position of
+    every member's value in the output. The output is ASCII (`json.dumps`
+    escapes everything else), so character and byte positions are the same.
+    The minified document is written to `minified` when given.
+    """
+    position = 0
+
+    def write(text: str) -> None:
+        nonlocal position
+        file.write(text)
+        position += len(text)
+
+    def write_minified(text: str) -> None:
+        if minified:
+            minified.write(text)
+
+    write("{")
+    write_minified("{")
+    for index, key in enumerate(sorted([*head, name])):
+        if index:
+            write(",")
+            write_minified(",")
+        write(_key(key, 1))
+        write_minified(json.dumps(key) + ":")
+        if key != name:
+            write(_encode(head[key], 1))
+            write_minified(_compact(head[key]))
+            continue
+
+        write("{")
+        write_minified("{")
+        empty = True
+        for member, value in members:
+            write(_key(member, 2) if empty else "," + _key(member, 2))
+            write_minified(("" if empty else ",") + json.dumps(member) + ":")
+            text = _encode(value, 2)
+            if on_member:
+                on_member(member, value, position, len(text))
+            write(text)
+            write_minified(_compact(value))
+            empty = False
+        write("}" if empty else "\n" + " " * INDENT + "}")
+        write_minified("}")
+    write("\n}")
+    write_minified("}")
@@ -1,28 +1,161 @@
 import argparse
+import json
+import sys
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence
 
-from kandji_openapi.models.postman_collection import PostmanCollection
-from kandji_openapi.openapi_generator import OpenAPIGenerator
-from kandji_openapi.parser import PostmanParser
+from kandji_openapi.configurations import OUTPUT_FORMATS, YAML_ENGINES
 
+# The model and generator modules pull in pydantic and the YAML writer pulls in
+# ruamel.yaml, which dominate start-up time. Everything beyond argument parsing
+# is imported on first use, so `--help`, an up-to-date run or a JSON-only run
+# only load what they need.
+if TYPE_CHECKING:
+    from kandji_openapi.cache import ConversionCache
+    from kandji_openapi.examples import ExampleLimits
+    from kandji_openapi.models.postman_collection import PostmanCollection
+    from kandji_openapi.profiler import Profiler
 
-def parse_postman_collection(collection_path: Path) -> PostmanCollection:
+
+def _phase(profiler: Optional["Profiler"], name: str) -> AbstractContextManager:
+    """Profile a pipeline phase when profiling is enabled"""
+    return profiler.phase(name) if profiler else nullcontext()
+
+
+def _example_limits(
+    args: argparse.Namespace, outputs: list[Path]
+) -> Optional["ExampleLimits"]:
+    """How to shrink the examples, or None to keep them as they are"""
+    capped = args.example_max_items is not None or args.example_max_depth is not None
+    if not capped and not args.externalize_examples:
+        return None
+    from kandji_openapi.examples import ExampleLimits, relative_prefix
+
+    directory = Path(args.externalize_examples) if args.externalize_examples else None
+    prefix = ""
+    if directory and outputs:
+        prefix = relative_prefix(directory, outputs[0].parent)
+    return ExampleLimits(
+        max_items=args.example_max_items,
+        max_depth=args.example_max_depth,
+        directory=directory,
+        min_bytes=args.externalize_min_bytes,
+        prefix=prefix,
+    )
+
+
+def parse_postman_collection(
+    collection_path: Path, profiler: Optional["Profiler"] = None
+) -> "PostmanCollection":
     """Parse the Postman collection from the given path."""
-    return PostmanParser.from_file(str(collection_path)).parse()
+    from kandji_openapi.parser import PostmanParser
+
+    with _phase(profiler, "load"):
+        parser = PostmanParser.from_file(str(collection_path))
+    with _phase(profiler, "from_data"):
+        return parser.parse()
 
 
 def generate_openapi_spec(
-    collection: PostmanCollection, output_json: Path, output_yaml: Path
-) -> None:
-    """Generate OpenAPI specification from the parsed collection."""
-    generator = OpenAPIGenerator(collection)
-    generator.to_json(output_json)
-    generator.to_yaml(output_yaml)
-    print(
-        f"Successfully converted to OpenAPI specification.\n\n"
-        f"JSON file created: {output_json}\n"
-        f"YAML file created: {output_yaml}"
-    )
+    collection: "PostmanCollection",
+    output_json: Optional[Path],
+    output_yaml: Optional[Path],
+    parallel_writes: bool = False,
+    yaml_engine: str = "ruamel",
+    cache: Optional["ConversionCache"] = None,
+    jobs: int = 1,
+    intern_schemas: bool = False,
+    intern_components: bool = False,
+    profiler: Optional["Profiler"] = None,
+    fast_build: bool = False,
+    shard_dir: Optional[Path] = None,
+    index_path: Optional[Path] = None,
+    examples: Optional["ExampleLimits"] = None,
+    example_report: Optional[Path] = None,
+    minify: bool = False,
+    compressions: Sequence[str] = (),
+) -> list[Path]:
+    """Generate OpenAPI specification from the parsed collection.
+
+    Returns the paths of the per-tag shards written to `shard_dir` and of the
+    examples moved out of the spec.
+    """
+    from kandji_openapi.openapi_generator import OpenAPIGenerator
+
+    with _phase(profiler, "to_openapi"):
+        generator = OpenAPIGenerator(
+            collection,
+            yaml_engine=yaml_engine,
+            cache=cache,
+            jobs=jobs,
+            intern_schemas=intern_schemas,
+            intern_components=intern_components,
+            profiler=profiler,
+            fast_build=fast_build,
+            examples=examples,
+            minify=minify,
+            compressions=compressions,
+        )
+
+    if profiler:
+        # Written one after the other so each phase is measured on its own
+        if output_yaml or not generator.streamable:
+            with profiler.phase("model_dump_json"):
+                generator.spec_data
+        if output_json:
+            with profiler.phase("json write"):
+                generator.to_json(output_json)
+        if output_yaml:
+            with profiler.phase("yaml write"):
+                generator.to_yaml(output_yaml)
+    else:
+        generator.write(output_json, output_yaml, parallel=parallel_writes)
+
+    shards: list[Path] = []
+    if shard_dir:
+        with _phase(profiler, "shard write"):
+            shards = generator.write_shards(
+                shard_dir,
+                json_format=bool(output_json),
+                yaml_format=bool(output_yaml),
+                parallel=parallel_writes,
+            )
+
+    example_files = generator.write_examples()
+
+    print("Successfully converted to OpenAPI specification.\n")
+    if output_json:
+        print(f"JSON file created: {output_json}")
+    if output_yaml:
+        print(f"YAML file created: {output_yaml}")
+    if variants := generator.variant_files(output_json, output_yaml):
+        print(f"{len(variants)} minified or compressed files created")
+    if shards:
+        print(f"{len(shards)} shard files created in {shard_dir}")
+    if example_files and examples:
+        print(f"{len(example_files)} example files created in {examples.directory}")
+    if index_path:
+        generator.write_index(index_path)
+        print(f"Index file created: {index_path}")
+    if examples:
+        savings = generator.example_savings
+        if example_report:
+            from kandji_openapi.files import atomic_write
+
+            with atomic_write(example_report) as f:
+                report = {
+                    "total": savings.total(),
+                    "operations": dict(savings.most_common()),
+                }
+                json.dump(report, f, indent=2)
+                f.write("\n")
+        print(
+            f"Examples shrunk by {savings.total():,} bytes in {len(savings)} operations"
+        )
+        for operation, saved in savings.most_common(10):
+            print(f"  {saved:>10,}  {operation}")
+    return shards + example_files
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -47,13 +180,686 @@ def parse_arguments() -> argparse.Namespace:
         help="Path to the output OpenAPI YAML file",
         default="openapi.yaml",
     )
-    return arg_parser.parse_args()
+    arg_parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        help="Output formats to write; 'json' never loads the YAML libraries",
+        default="both",
+    )
+    arg_parser.add_argument(
+        "--shard-dir",
+        type=str,
+        help=(
+            "Also write one spec per tag, referencing a shared components file, "
+            "to this directory"
+        ),
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--index",
+        type=str,
+        help=(
+            "Also write an index of the JSON spec's operations by operationId, "
+            "path and tag to this path (see kandji_openapi.spec_index)"
+        ),
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="Also write the JSON spec without whitespace, as <name>.min.json",
+    )
+    arg_parser.add_argument(
+        "--compress",
+        choices=("gz", "zst"),
+        nargs="+",
+        help=(
+            "Also write compressed copies of every spec file with these formats "
+            "('zst' needs the zstandard package)"
+        ),
+        default=[],
+    )
+    arg_parser.add_argument(
+        "--example-max-items",
+        type=int,
+        help="Truncate the arrays in request and response examples to this length",
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--example-max-depth",
+        type=int,
+        help="Empty the objects and arrays nested deeper than this in examples",
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--externalize-examples",
+        type=str,
+        help=(
+            "Move large examples to JSON files in this directory, referenced "
+            "with externalValue"
+        ),
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--externalize-min-bytes",
+        type=int,
+        help="Size of the compact JSON from which examples are moved out",
+        default=4096,
+    )
+    arg_parser.add_argument(
+        "--example-report",
+        type=str,
+        help="Write the bytes saved per operation as JSON to this path",
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--parallel-writes",
+        action="store_true",
+        help="Write the JSON and YAML files (and the shards) on separate threads",
+    )
+    arg_parser.add_argument(
+        "--yaml-engine",
+        choices=YAML_ENGINES,
+        help=(
+            "YAML emitter backend: 'ruamel' (pure Python, reference output), "
+            "'libyaml' (ruamel's C emitter when installed, equivalent YAML with "
+            "different quoting) or 'fast' (byte-identical to 'ruamel')"
+        ),
+        default="ruamel",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory for the per-item conversion cache (disabled when omitted)",
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        help="Maximum size of the conversion cache in megabytes",
+        default=64,
+    )
+    arg_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of worker processes converting top-level folders",
+        default=1,
+    )
+    arg_parser.add_argument(
+        "--intern-schemas",
+        action="store_true",
+        help="Store repeated response schemas once under components/schemas",
+    )
+    arg_parser.add_argument(
+        "--intern-components",
+        action="store_true",
+        help=(
+            "Store repeated parameters, response headers and request bodies once "
+            "under components"
+        ),
+    )
+    arg_parser.add_argument(
+        "--fast-build",
+        action="store_true",
+        help=(
+            "Build the specification without validating each object and validate "
+            "the finished document once instead (same output, less time)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running and regenerate the outputs whenever the collection "
+            "changes, reconverting only the requests that changed"
+        ),
+    )
+    arg_parser.add_argument(
+        "--watch-interval",
+        type=float,
+        help="Seconds between checks of the collection file in --watch mode",
+        default=0.5,
+    )
+    arg_parser.add_argument(
+        "--manifest",
+        type=str,
+        help=(
+            "Path to a manifest of the collection and output hashes; the run is "
+            "skipped when none of them changed since it was written"
+        ),
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate the outputs even if the manifest is up to date",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Report wall time and peak memory of each pipeline phase and the "
+            "slowest request conversions"
+        ),
+    )
+    arg_parser.add_argument(
+        "--profile-json",
+        type=str,
+        help="Also write the profile as JSON to this path (implies --profile)",
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--profile-top",
+        type=int,
+        help="Number of slowest request conversions to report",
+        default=10,
+    )
+
+    commands = arg_parser.add_subparsers(dest="command", title="commands")
+    fetch_parser = commands.add_parser(
+        "fetch", help="Download the Postman collection if it changed"
+    )
+    fetch_parser.add_argument(
+        "--url", type=str, help="URL of the Postman collection", required=True
+    )
+    fetch_parser.add_argument(
+        "--collection",
+        type=str,
+        help="Path to write the Postman collection JSON file to, with sorted keys",
+        default="postman_collection.json",
+    )
+    fetch_parser.add_argument(
+        "--state",
+        type=str,
+        help=(
+            "Path to the ETag/Last-Modified state of the last download "
+            "(default: <collection stem>.fetch.json next to the collection)"
+        ),
+        default=None,
+    )
+    fetch_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Download even if the collection did not change",
+    )
+    fetch_parser.add_argument(
+        "--timeout", type=float, help="Network timeout in seconds", default=60
+    )
+
+    diff_parser = commands.add_parser(
+        "diff",
+        help=(
+            "Classify the changes between two OpenAPI JSON files as breaking, "
+            "additive or docs-only"
+        ),
+    )
+    diff_parser.add_argument("old", type=str, help="Path to the previous spec")
+    diff_parser.add_argument("new", type=str, help="Path to the new spec")
+    diff_parser.add_argument(
+        "--json",
+        type=str,
+        help="Write the machine-readable summary to this path ('-' for stdout)",
+        default=None,
+    )
+    diff_parser.add_argument(
+        "--docs",
+        action="store_true",
+        help=(
+            "Also list documentation-only changes and components only used "
+            "through $ref in the report"
+        ),
+    )
+
+    match_parser = commands.add_parser(
+        "match", help="Tag access-log lines with the operationId of their request"
+    )
+    match_parser.add_argument(
+        "log", type=str, help="Path to the access log ('-' for stdin)"
+    )
+    match_parser.add_argument(
+        "--spec",
+        type=str,
+        help="Path to the generated OpenAPI JSON file",
+        default="openapi.json",
+    )
+    match_parser.add_argument(
+        "--tagged-log",
+        type=str,
+        help="Path to write the tagged lines to ('-' for stdout)",
+        default="-",
+    )
+    match_parser.add_argument(
+        "--summary",
+        type=str,
+        help="Write the number of lines per operationId as JSON to this path",
+        default=None,
+    )
+    match_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of worker processes for large logs (default: CPU count)",
+        default=None,
+    )
+
+    traffic_parser = commands.add_parser(
+        "validate-traffic",
+        help="Report where recorded responses drift from the documented schemas",
+    )
+    traffic_parser.add_argument(
+        "traffic", type=str, nargs="+", help="HAR (*.har) or JSON Lines traffic files"
+    )
+    traffic_parser.add_argument(
+        "--spec",
+        type=str,
+        help="Path to the generated OpenAPI JSON file",
+        default="openapi.json",
+    )
+    traffic_parser.add_argument(
+        "--json",
+        type=str,
+        help="Write the per-operation drift statistics as JSON to this path",
+        default=None,
+    )
+    traffic_parser.add_argument(
+        "--top",
+        type=int,
+        help="Number of issues listed per drifting operation",
+        default=5,
+    )
+    traffic_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of worker processes (default: CPU count)",
+        default=None,
+    )
+    batch_parser = commands.add_parser(
+        "batch",
+        help=(
+            "Convert many collections in a pool of worker processes that share "
+            "their caches; the generation options go before the command"
+        ),
+        description=(
+            "Convert many collections, each into its own directory. The workers "
+            "share converted requests through --cache-dir, which later runs "
+            "reuse, or a temporary directory removed after the batch when it is "
+            "not given. The text normalization and shared component caches are "
+            "in-process caches, so each worker keeps its own from one collection "
+            "to the next, and --intern-schemas/--intern-components intern every "
+            "collection separately. Generation options such as --format, "
+            "--intern-schemas, --compress and --example-max-items go before the "
+            "command; --shard-dir, --index, --manifest, --externalize-examples, "
+            "--example-report, --watch and --profile are not supported."
+        ),
+    )
+    batch_parser.add_argument(
+        "collections",
+        type=str,
+        nargs="+",
+        help="Collection files or glob patterns such as 'collections/*.json'",
+    )
+    batch_parser.add_argument(
+        "--output-dir",
+        type=str,
+        help="Directory for the per-collection output directories",
+        default="batch",
+    )
+    batch_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of worker processes (default: one per CPU)",
+        default=None,
+    )
+    batch_parser.add_argument(
+        "--json",
+        type=str,
+        help="Write the timing report as JSON to this path",
+        default=None,
+    )
+
+    args = arg_parser.parse_args()
+    if args.command == "batch":
+        # Outputs and modes of a single run, without a per-collection meaning
+        unsupported = [
+            option
+            for option, dest in (
+                ("--shard-dir", "shard_dir"),
+                ("--index", "index"),
+                ("--manifest", "manifest"),
+                ("--externalize-examples", "externalize_examples"),
+                ("--example-report", "example_report"),
+                ("--watch", "watch"),
+                ("--profile", "profile"),
+                ("--profile-json", "profile_json"),
+            )
+            if getattr(args, dest) != arg_parser.get_default(dest)
+        ]
+        if unsupported:
+            arg_parser.error(f"batch does not support {', '.join(unsupported)}")
+        if args.minify and args.format == "yaml":
+            arg_parser.error(
+                "--minify requires the JSON output, use --format json or both"
+            )
+    return args
+
+
+def watch(
+    args: argparse.Namespace, output_json: Optional[Path], output_yaml: Optional[Path]
+) -> None:
+    """Regenerate the outputs on every change of the collection"""
+    from kandji_openapi.cache import ConversionCache
+    from kandji_openapi.watch import Watcher
+
+    cache = ConversionCache(
+        Path(args.cache_dir) if args.cache_dir else None,
+        max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        in_memory=True,
+    )
+    Watcher(
+        Path(args.collection),
+        output_json,
+        output_yaml,
+        yaml_engine=args.yaml_engine,
+        intern_schemas=args.intern_schemas,
+        intern_components=args.intern_components,
+        fast_build=args.fast_build,
+        shard_dir=Path(args.shard_dir) if args.shard_dir else None,
+        index_path=Path(args.index) if args.index else None,
+        examples=_example_limits(args, [o for o in (output_json, output_yaml) if o]),
+        minify=args.minify,
+        compressions=args.compress,
+        interval=args.watch_interval,
+        cache=cache,
+    ).run()
+
+
+def fetch(args: argparse.Namespace) -> None:
+    """Download the Postman collection unless the server reports no change"""
+    from urllib.error import URLError
+
+    from kandji_openapi.fetch import fetch_collection
+
+    collection_path = Path(args.collection)
+    try:
+        received = fetch_collection(
+            args.url,
+            collection_path,
+            state_path=Path(args.state) if args.state else None,
+            force=args.force,
+            timeout=args.timeout,
+        )
+    except (URLError, ValueError) as e:
+        sys.exit(f"Could not fetch the collection: {e}")
+
+    if received is None:
+        print("Collection not modified, nothing to do.")
+    else:
+        print(f"Collection written to {collection_path} ({received:,} bytes received)")
+
+
+def diff(args: argparse.Namespace) -> None:
+    """Print the structural diff of two specs"""
+    from kandji_openapi.spec_diff import diff_specs
+
+    with open(args.old, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    spec_diff = diff_specs(old, new)
+
+    if args.json == "-":
+        print(json.dumps(spec_diff.to_dict(), indent=2))
+        return
+
+    if args.json:
+        from kandji_openapi.files import atomic_write
+
+        with atomic_write(Path(args.json)) as f:
+            json.dump(spec_diff.to_dict(), f, indent=2)
+            f.write("\n")
+    print(spec_diff.report(include_docs=args.docs))
+
+
+def match(args: argparse.Namespace) -> None:
+    """Tag the lines of an access log with their operationId"""
+    import time
+
+    from kandji_openapi.access_log import tag_file, tag_lines
+    from kandji_openapi.routes import RouteTrie
+
+    with open(args.spec, "r", encoding="utf-8") as f:
+        trie = RouteTrie.from_spec(json.load(f))
+    for conflict in trie.conflicts:
+        print(f"Warning: {conflict}", file=sys.stderr)
+
+    start = time.perf_counter()
+    output = (
+        sys.stdout.buffer if args.tagged_log == "-" else open(args.tagged_log, "wb")
+    )
+    try:
+        if args.log == "-":
+            counts = tag_lines(trie, sys.stdin.buffer, output)
+        else:
+            counts = tag_file(trie, Path(args.log), output, jobs=args.jobs)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+        else:
+            output.flush()
+    elapsed = time.perf_counter() - start
+
+    lines = sum(counts.values())
+    print(
+        f"{lines:,} lines in {elapsed:.2f}s ({lines / max(elapsed, 1e-9):,.0f}/s), "
+        f"{lines - counts.get('-', 0):,} matched {trie.routes} routes",
+        file=sys.stderr,
+    )
+    if args.summary:
+        from kandji_openapi.files import atomic_write
+
+        with atomic_write(Path(args.summary)) as f:
+            json.dump(dict(counts.most_common()), f, indent=2)
+            f.write("\n")
+
+
+def validate_traffic(args: argparse.Namespace) -> None:
+    """Print the drift of recorded traffic from the spec"""
+    from kandji_openapi import traffic
+
+    with open(args.spec, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    try:
+        report = traffic.validate_traffic(
+            spec, [Path(path) for path in args.traffic], jobs=args.jobs
+        )
+    except (OSError, ValueError) as e:
+        sys.exit(f"Could not read the traffic: {e}")
+
+    if args.json:
+        from kandji_openapi.files import atomic_write
+
+        with atomic_write(Path(args.json)) as f:
+            json.dump(report.to_dict(), f, indent=2)
+            f.write("\n")
+    print(report.report(args.top))
+
+
+def batch(args: argparse.Namespace) -> None:
+    """Convert every collection to its own directory and report the timings"""
+    from kandji_openapi.batch import BatchOptions, expand_collections, run_batch
+
+    if args.compress:
+        from kandji_openapi.artifacts import check_compressions
+
+        try:
+            check_compressions(args.compress)
+        except ValueError as e:
+            sys.exit(str(e))
+    try:
+        collections = expand_collections(args.collections)
+    except ValueError as e:
+        sys.exit(str(e))
+
+    options = BatchOptions(
+        json_name=Path(args.output_json).name if args.format != "yaml" else None,
+        yaml_name=Path(args.output_yaml).name if args.format != "json" else None,
+        yaml_engine=args.yaml_engine,
+        intern_schemas=args.intern_schemas,
+        intern_components=args.intern_components,
+        fast_build=args.fast_build,
+        minify=args.minify,
+        compressions=tuple(args.compress),
+        examples=_example_limits(args, []),
+        parallel_writes=args.parallel_writes,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=int(args.cache_max_mb * 1024 * 1024),
+    )
+    report = run_batch(collections, Path(args.output_dir), options, jobs=args.jobs)
+
+    if args.json:
+        from kandji_openapi.files import atomic_write
+
+        with atomic_write(Path(args.json)) as f:
+            json.dump(report.to_dict(), f, indent=2)
+            f.write("\n")
+    print(report.report())
+    if report.failed:
+        sys.exit(1)
 
 
 def main() -> None:
     args = parse_arguments()
-    collection = parse_postman_collection(Path(args.collection))
-    generate_openapi_spec(collection, Path(args.output_json), Path(args.output_yaml))
+    if args.command == "fetch":
+        fetch(args)
+        return
+    if args.command == "diff":
+        diff(args)
+        return
+    if args.command == "match":
+        match(args)
+        return
+    if args.command == "validate-traffic":
+        validate_traffic(args)
+        return
+    if args.command == "batch":
+        batch(args)
+        return
+
+    collection_path = Path(args.collection)
+    output_json = Path(args.output_json) if args.format != "yaml" else None
+    output_yaml = Path(args.output_yaml) if args.format != "json" else None
+    outputs = [path for path in (output_json, output_yaml) if path]
+    shard_dir = Path(args.shard_dir) if args.shard_dir else None
+    index_path = Path(args.index) if args.index else None
+    if index_path:
+        if not output_json:
+            sys.exit("--index requires the JSON output, use --format json or both")
+        outputs.append(index_path)
+    variants: dict[Path, list[Path]] = {}
+    if args.minify or args.compress:
+        from kandji_openapi.artifacts import check_compressions, variant_paths
+
+        if args.minify and not output_json:
+            sys.exit("--minify requires the JSON output, use --format json or both")
+        try:
+            check_compressions(args.compress)
+        except ValueError as e:
+            sys.exit(str(e))
+        if output_json:
+            variants[output_json] = variant_paths(
+                output_json, args.compress, args.minify
+            )
+        if output_yaml:
+            variants[output_yaml] = variant_paths(output_yaml, args.compress)
+        outputs += [path for paths in variants.values() for path in paths]
+
+    options = {
+        "yaml_engine": args.yaml_engine,
+        "intern_schemas": args.intern_schemas,
+        "intern_components": args.intern_components,
+        "shard_dir": args.shard_dir,
+        "example_max_items": args.example_max_items,
+        "example_max_depth": args.example_max_depth,
+        "externalize_examples": args.externalize_examples,
+        "externalize_min_bytes": args.externalize_min_bytes,
+        "minify": args.minify,
+        "compress": args.compress,
+    }
+    examples = _example_limits(args, outputs)
+
+    if args.watch:
+        watch(args, output_json, output_yaml)
+        return
+
+    manifest_path = Path(args.manifest) if args.manifest else None
+    if manifest_path and not args.force:
+        from kandji_openapi.manifest import Manifest
+
+        manifest = Manifest.load(manifest_path)
+        if manifest and manifest.is_current(collection_path, outputs, options):
+            print("OpenAPI specification is up to date, nothing to do.")
+            return
+
+    profiler = None
+    if args.profile or args.profile_json:
+        from kandji_openapi.profiler import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+
+    collection = parse_postman_collection(collection_path, profiler)
+
+    cache = None
+    if args.cache_dir:
+        from kandji_openapi.cache import ConversionCache
+
+        cache = ConversionCache(
+            Path(args.cache_dir), max_bytes=int(args.cache_max_mb * 1024 * 1024)
+        )
+
+    shards = generate_openapi_spec(
+        collection,
+        output_json,
+        output_yaml,
+        parallel_writes=args.parallel_writes,
+        yaml_engine=args.yaml_engine,
+        cache=cache,
+        jobs=args.jobs,
+        intern_schemas=args.intern_schemas,
+        intern_components=args.intern_components,
+        profiler=profiler,
+        fast_build=args.fast_build,
+        shard_dir=shard_dir,
+        index_path=index_path,
+        examples=examples,
+        example_report=Path(args.example_report) if args.example_report else None,
+        minify=args.minify,
+        compressions=args.compress,
+    )
+
+    if profiler:
+        profiler.stop()
+        print()
+        print(profiler.report(args.profile_top))
+        if args.profile_json:
+            from kandji_openapi.files import atomic_write
+
+            with atomic_write(Path(args.profile_json)) as f:
+                json.dump(profiler.to_dict(args.profile_top), f, indent=2)
+                f.write("\n")
+
+    if cache:
+        cache.close()
+        print(cache.summary())
+
+    if manifest_path:
+        from kandji_openapi.manifest import Manifest
+
+        # Shards of removed tags and examples no longer moved out of the spec
+        if previous := Manifest.load(manifest_path):
+            for path in previous.stale(shards):
+                path.unlink(missing_ok=True)
+        manifest = Manifest.build(collection_path, outputs, options, variants, shards)
+        manifest.save(manifest_path)
 
 
 if __name__ == "__main__":
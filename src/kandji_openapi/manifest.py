@@ -0,0 +1,105 @@
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from kandji_openapi.files import atomic_write, sha256_file
+from kandji_openapi.version import generator_version
+
+
+@dataclass
+class Manifest:
+    """Inputs and outputs of the last successful generator run"""
+
+    collection_hash: str
+    generator_version: str
+    outputs: dict[str, str] = field(default_factory=dict)
+    # Command line options that change the generated output
+    options: dict[str, Any] = field(default_factory=dict)
+    # Bytes of every output, and the minified and compressed files of each
+    # document, so consumers can pick the smallest one and verify it
+    sizes: dict[str, int] = field(default_factory=dict)
+    variants: dict[str, list[str]] = field(default_factory=dict)
+    # Shard and example files, which depend on the collection's tags and
+    # examples rather than the options, so the next run knows what it wrote
+    generated: list[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, file_path: Path) -> Optional["Manifest"]:
+        """Read a manifest file, returning None if it is missing or unreadable"""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(
+                collection_hash=data["collection_hash"],
+                generator_version=data["generator_version"],
+                outputs=dict(data.get("outputs", {})),
+                options=dict(data.get("options", {})),
+                sizes=dict(data.get("sizes", {})),
+                variants=dict(data.get("variants", {})),
+                generated=list(data.get("generated", [])),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def build(
+        cls,
+        collection_path: Path,
+        outputs: list[Path],
+        options: Optional[dict[str, Any]] = None,
+        variants: Optional[dict[Path, list[Path]]] = None,
+        generated: Optional[list[Path]] = None,
+    ) -> "Manifest":
+        """Record the current collection and output file hashes and sizes"""
+        outputs = outputs + list(generated or [])
+        return cls(
+            collection_hash=sha256_file(collection_path),
+            generator_version=generator_version(),
+            outputs={str(path): sha256_file(path) for path in outputs},
+            options=dict(options or {}),
+            sizes={str(path): path.stat().st_size for path in outputs},
+            variants={
+                str(document): [str(path) for path in paths]
+                for document, paths in (variants or {}).items()
+                if paths
+            },
+            generated=[str(path) for path in generated or []],
+        )
+
+    def is_current(
+        self,
+        collection_path: Path,
+        outputs: list[Path],
+        options: Optional[dict[str, Any]] = None,
+    ) -> bool:
+        """Check whether running the generator again would change nothing
+
+        The generated files recorded by the last run are checked along with
+        `outputs`; other files next to them are not part of the output.
+        """
+        outputs = outputs + [Path(path) for path in self.generated]
+        if self.generator_version != generator_version():
+            return False
+        if self.options != dict(options or {}):
+            return False
+        if set(self.outputs) != {str(path) for path in outputs}:
+            return False
+        if self.collection_hash != sha256_file(collection_path):
+            return False
+
+        for path in outputs:
+            if not path.exists() or sha256_file(path) != self.outputs[str(path)]:
+                return False
+        return True
+
+    def stale(self, generated: list[Path]) -> list[Path]:
+        """Files this run generated that a run writing `generated` would not"""
+        current = {str(path) for path in generated}
+        return [Path(path) for path in self.generated if path not in current]
+
+    def save(self, file_path: Path) -> None:
+        """Write the manifest as JSON"""
+        with atomic_write(file_path) as f:
+            json.dump(asdict(self), f, sort_keys=True, indent=2)
+            f.write("\n")
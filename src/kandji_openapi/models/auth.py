@@ -12,7 +12,7 @@ class AuthType(Enum):
     BEARER = "bearer"
 
 
-@dataclass
+@dataclass(slots=True)
 class Auth:
     type: AuthType
     data: dict[str, list[dict[str, str]]]
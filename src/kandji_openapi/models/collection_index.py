@@ -0,0 +1,54 @@
+from dataclasses import dataclass, field
+
+from kandji_openapi.models.auth import Auth
+from kandji_openapi.models.item import PostmanItem
+
+
+@dataclass
+class CollectionIndex:
+    """Flat view of every item in a collection, at any nesting depth"""
+
+    # Leaf requests grouped by the top-level item they belong to
+    groups: list[list[PostmanItem]] = field(default_factory=list)
+    folders: list[PostmanItem] = field(default_factory=list)
+    hosts: list[str] = field(default_factory=list)
+    auths: list[Auth] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, items: list[PostmanItem]) -> "CollectionIndex":
+        """Index items with a single iterative pre-order walk"""
+        index = cls()
+        seen_hosts: set[str] = set()
+
+        for root in items:
+            group: list[PostmanItem] = []
+            index.groups.append(group)
+
+            stack = [root]
+            while stack:
+                item = stack.pop()
+
+                if item.is_folder():
+                    index.folders.append(item)
+                elif item.get_path():
+                    group.append(item)
+
+                if (host := item.get_host()) and host not in seen_hosts:
+                    seen_hosts.add(host)
+                    index.hosts.append(host)
+
+                if item_auth := item.get_auth():
+                    index.auths.append(item_auth)
+                if (request := item.get_request()) and (
+                    request_auth := request.get_auth()
+                ):
+                    index.auths.append(request_auth)
+
+                # Reversed so children are visited in document order
+                stack.extend(reversed(item.get_items()))
+
+        return index
+
+    @property
+    def leaves(self) -> list[PostmanItem]:
+        return [leaf for group in self.groups for leaf in group]
@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from openapi_pydantic import (
+    DataType,
+    Example,
+    Header,
+    Parameter,
+    ParameterLocation,
+    Schema,
+)
+
+from kandji_openapi.models.construction import build, validating
+
+# Components built in the current `sharing_components` block, None outside one
+_shared: Optional[dict[tuple[Any, ...], Any]] = None
+
+
+@contextmanager
+def sharing_components() -> Iterator[None]:
+    """Share equal parameters and headers built in the `with` block.
+
+    The table only lives for the block, typically one document, so watch and
+    batch rebuilds start empty. Nested blocks use the outermost table.
+    """
+    global _shared
+    outermost = _shared is None
+    if outermost:
+        _shared = {}
+    try:
+        yield
+    finally:
+        if outermost:
+            _shared = None
+
+
+def _shared_build(key: tuple[Any, ...], create: Callable[[], Any]) -> Any:
+    """Component for `key`, created once per construction mode within a block.
+
+    Outside a block, or when the key holds an unhashable example such as a
+    list or dict value in the collection, a new component is built.
+    """
+    if _shared is None:
+        return create()
+    key = (validating(), *key)
+    try:
+        if (component := _shared.get(key)) is None:
+            component = _shared[key] = create()
+    except TypeError:
+        return create()
+    return component
+
+
+def shared_parameter(
+    name: str,
+    location: ParameterLocation,
+    required: bool,
+    description: Optional[str] = None,
+    example: Optional[str] = None,
+) -> Parameter:
+    """String parameter, built once per distinct set of fields.
+
+    The same header and query parameters appear on most operations, so the
+    instance is shared. Callers must not modify it.
+    """
+    return _shared_build(
+        ("parameter", name, location, required, description, example),
+        lambda: build(
+            Parameter,
+            name=name,
+            param_in=location,  # type: ignore
+            schema=build(Schema, type=DataType("string")),
+            required=required,
+            description=description,
+            example=example,
+        ),
+    )
+
+
+def shared_header(
+    description: Optional[str] = None, example: Optional[str] = None
+) -> Header:
+    """String response header, built once per distinct description and example.
+
+    Callers must not modify the returned instance.
+    """
+    return _shared_build(
+        ("header", description, example),
+        lambda: build(
+            Header,
+            description=description,
+            schema=build(Schema, type=DataType(value="string")),
+            example=build(Example, value=example) if example is not None else None,
+        ),
+    )
@@ -0,0 +1,110 @@
+"""Construction of openapi-pydantic objects, optionally without validation.
+
+The converters build thousands of small objects from data they produced
+themselves. Validating each of them, and later serializing the model tree,
+dominates the conversion time. Inside `fast_construction()` `build` returns
+the plain data a model would dump to instead, and the finished document is
+validated once with `validate_document`.
+"""
+
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Iterator, TypeVar
+
+from openapi_pydantic import OpenAPI, PathItem
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined, to_json
+
+Model = TypeVar("Model", bound=BaseModel)
+
+_validate = True
+
+
+@dataclass(frozen=True)
+class _Layout:
+    # Field name of every field name and alias
+    names: dict[str, str]
+    # Dumped key and position of every field name
+    keys: dict[str, str]
+    positions: dict[str, int]
+    # Defaults that are dumped when the field is not passed
+    defaults: dict[str, Any]
+
+
+@cache
+def _layout(model: type[BaseModel]) -> _Layout:
+    layout = _Layout(names={}, keys={}, positions={}, defaults={})
+    for position, (name, info) in enumerate(model.model_fields.items()):
+        layout.names[name] = name
+        if info.alias:
+            layout.names[info.alias] = name
+        layout.keys[name] = info.serialization_alias or info.alias or name
+        layout.positions[name] = position
+
+        default = info.get_default(call_default_factory=True)
+        if default is not None and default is not PydanticUndefined:
+            layout.defaults[name] = default
+    return layout
+
+
+def _plain(model: type[BaseModel], fields: dict[str, Any]) -> dict[str, Any]:
+    """Dict with the keys and key order of `model.model_dump(by_alias=True)`"""
+    layout = _layout(model)
+    values = dict(layout.defaults)
+    for key, value in fields.items():
+        name = layout.names[key]
+        if value is None:
+            values.pop(name, None)
+        else:
+            values[name] = value
+    return {
+        layout.keys[name]: values[name]
+        for name in sorted(values, key=layout.positions.__getitem__)
+    }
+
+
+def build(model: type[Model], **fields: Any) -> Model:
+    """Instance of `model`, or its plain data when fast construction is enabled.
+
+    Plain data may still hold models and enums, `plain_data` serializes both.
+    Pass every field here, the plain form does not support assigning later.
+    """
+    if _validate:
+        return model(**fields)
+    return _plain(model, fields)  # type: ignore
+
+
+def validating() -> bool:
+    """Whether `build` currently returns validated models"""
+    return _validate
+
+
+@contextmanager
+def fast_construction(enabled: bool = True) -> Iterator[None]:
+    """Make `build` skip validation within the block"""
+    global _validate
+    previous = _validate
+    _validate = not enabled
+    try:
+        yield
+    finally:
+        _validate = previous
+
+
+def plain_data(value: Any) -> Any:
+    """JSON-compatible copy of models, enums and plain data, without None fields"""
+    return json.loads(
+        to_json(value, by_alias=True, exclude_none=True, inf_nan_mode="null")
+    )
+
+
+def validate_document(data: dict[str, Any]) -> None:
+    """Validate a plain OpenAPI document, raising `pydantic.ValidationError`"""
+    OpenAPI.model_validate(data)
+
+
+def validate_path_item(data: dict[str, Any]) -> None:
+    """Validate a plain path item, raising `pydantic.ValidationError`"""
+    PathItem.model_validate(data)
@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+# Records seen in the current `sharing` block, None outside of one
+_shared: Optional[dict[tuple[Any, ...], dict[str, Any]]] = None
+
+
+@contextmanager
+def sharing() -> Iterator[None]:
+    """Share equal records between the models created in the `with` block.
+
+    The table only lives for the block, typically one collection, so
+    long-running watch and batch processes do not keep every record ever
+    seen. Nested blocks use the outermost table.
+    """
+    global _shared
+    outermost = _shared is None
+    if outermost:
+        _shared = {}
+    try:
+        yield
+    finally:
+        if outermost:
+            _shared = None
+
+
+def shared_entries(data: Any) -> list[dict[str, Any]]:
+    """Header or query records, one shared dict per distinct record.
+
+    The same headers repeat on nearly every request and response, so equal
+    records are kept once within a `sharing` block. Callers must not modify
+    them.
+    """
+    if not isinstance(data, list):
+        return []
+    if _shared is None:
+        return data
+
+    entries = []
+    for entry in data:
+        try:
+            entries.append(_shared.setdefault(tuple(entry.items()), entry))
+        except (AttributeError, TypeError):
+            # Not a record, or one with an unhashable value, kept as it is
+            entries.append(entry)
+    return entries
@@ -6,7 +6,7 @@ from openapi_pydantic import Contact, Info, License
 from kandji_openapi.strings import string_formatting
 
 
-@dataclass
+@dataclass(slots=True)
 class PostmanInfo:
     name: str
     version: str
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import re
 from dataclasses import dataclass, field
 from typing import Any, Optional
@@ -10,7 +12,7 @@ from kandji_openapi.models.request import PostmanRequest
 from kandji_openapi.strings import string_formatting
 
 
-@dataclass
+@dataclass(slots=True)
 class PostmanItem:
     name: str
     id: str
@@ -20,10 +22,39 @@ class PostmanItem:
     auth: Optional[Auth] = None
     proxy_config: Optional[dict[str, Any]] = None
     items: list["PostmanItem"] = field(default_factory=list)
+    digest: str = ""
 
     @classmethod
-    def from_data(cls, data: dict[str, Any], tag: str = "") -> Optional["PostmanItem"]:
-        """Create an Item from dictionary data"""
+    def from_data(
+        cls, data: dict[str, Any], tag: str = "", release: bool = False
+    ) -> Optional["PostmanItem"]:
+        """Create an Item and all of its descendants from dictionary data
+
+        With `release`, every item is detached from `data` once it is converted
+        so the raw JSON is freed as the walk goes instead of all at the end.
+        """
+        root = cls._from_node(data, tag)
+        if root is None:
+            return None
+
+        # Walk the tree with an explicit stack so deeply nested folders cannot
+        # hit the recursion limit
+        stack = [(root, data)]
+        while stack:
+            parent, parent_data = stack.pop()
+            if release:
+                children = parent_data.pop("item", [])
+            else:
+                children = parent_data.get("item", [])
+            for item_data in children:
+                if item := cls._from_node(item_data, tag=parent_data.get("name", "")):
+                    parent.items.append(item)
+                    stack.append((item, item_data))
+        return root
+
+    @classmethod
+    def _from_node(cls, data: dict[str, Any], tag: str) -> Optional["PostmanItem"]:
+        """Create a single Item from dictionary data, without its children"""
         url = ""
         if "id" in data:
             url = f"{KANDJI_API_DOCS_URL}/#{data['id']}"
@@ -32,10 +63,11 @@ class PostmanItem:
         if bool(re.fullmatch(r"^\{[^{}]+\}$", data.get("request", {}).get("url", ""))):
             return None
 
-        items = []
-        for item_data in data.get("item", []):
-            if item := cls.from_data(item_data, tag=data.get("name", "")):
-                items.append(item)
+        # Hash the raw request before the models below normalize it in place
+        digest = ""
+        if "request" in data:
+            raw = json.dumps([tag, data], sort_keys=True, separators=(",", ":"))
+            digest = hashlib.sha256(raw.encode()).hexdigest()
 
         return cls(
             name=data.get("name", ""),
@@ -51,7 +83,7 @@ class PostmanItem:
             auth=Auth.from_data(data.get("auth", {})),
             proxy_config=data.get("protocolProfileBehavior"),
             url=url,
-            items=items,
+            digest=digest,
         )
 
     def get_auth(self) -> Optional[Auth]:
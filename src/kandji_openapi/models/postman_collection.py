@@ -1,7 +1,10 @@
 import re
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
 from openapi_pydantic import (
     Components,
@@ -19,9 +22,24 @@ from openapi_pydantic import (
 
 from kandji_openapi.configurations import KANDJI_API_DOCS_URL
 from kandji_openapi.models.auth import Auth
+from kandji_openapi.models.collection_index import CollectionIndex
+from kandji_openapi.models.components import sharing_components
+from kandji_openapi.models.construction import build, fast_construction
+from kandji_openapi.models.entries import sharing
 from kandji_openapi.models.info import PostmanInfo
 from kandji_openapi.models.item import PostmanItem
 
+if TYPE_CHECKING:
+    from kandji_openapi.cache import ConversionCache
+    from kandji_openapi.profiler import Profiler
+
+
+def _drain(items: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Remove and yield the items in order, so each is freed once processed"""
+    items.reverse()
+    while items:
+        yield items.pop()
+
 
 @dataclass
 class PostmanCollection:
@@ -30,16 +48,31 @@ class PostmanCollection:
     auth: Optional[Auth] = None
 
     @classmethod
-    def from_data(cls, data: dict[str, Any]) -> "PostmanCollection":
-        return cls(
-            info=PostmanInfo.from_data(data.get("info", {})),
-            auth=Auth.from_data(data.get("auth", {})),
-            items=cls._process_items(data.get("item", [])),
-        )
+    def from_data(
+        cls, data: dict[str, Any], release: bool = False
+    ) -> "PostmanCollection":
+        """Create the collection from its JSON data
+
+        With `release` the items are removed from `data` as they are converted,
+        see `PostmanItem.from_data`. Equal header and query records are shared
+        within the collection, see `entries.sharing`.
+        """
+        with sharing():
+            return cls(
+                info=PostmanInfo.from_data(data.get("info", {})),
+                auth=Auth.from_data(data.get("auth", {})),
+                items=cls._process_items(
+                    data.pop("item", []) if release else data.get("item", []),
+                    release=release,
+                ),
+            )
 
     @classmethod
     def _process_items(
-        cls, items_data: list[dict[str, Any]], parent: Optional[PostmanItem] = None
+        cls,
+        items_data: list[dict[str, Any]],
+        parent: Optional[PostmanItem] = None,
+        release: bool = False,
     ) -> list[PostmanItem]:
         """Process collection items recursively"""
         processed_items: list[PostmanItem] = []
@@ -48,27 +81,24 @@ class PostmanCollection:
         if parent and parent.is_folder():
             tag = parent.name
 
-        for item_data in items_data:
-            if item := PostmanItem.from_data(item_data, tag):
+        for item_data in _drain(items_data) if release else items_data:
+            if item := PostmanItem.from_data(item_data, tag, release):
                 processed_items.append(item)
 
         return processed_items
 
+    @cached_property
+    def index(self) -> CollectionIndex:
+        """Leaves, folders, hosts and auth of every item at any depth"""
+        return CollectionIndex.build(self.items)
+
     def _hosts_to_openapi(self) -> list[Server]:
         """Extract unique hosts from all items' requests."""
-        hosts: set[str] = set()
-        for item in self.items:
-            if item.get_host():
-                hosts.add(item.get_host())
-
-            for subitem in item.get_items():
-                if subitem.get_host():
-                    hosts.add(subitem.get_host())
-
         variable_pattern = re.compile(r"\{([^}]+)\}")
 
         output = []
-        for host in hosts:
+        # Sort so the server order is stable from run to run
+        for host in sorted(self.index.hosts):
             variables: dict[str, ServerVariable] = {}
             variables: dict[str, ServerVariable] = {}
             for match in variable_pattern.finditer(host):
@@ -85,49 +115,99 @@ class PostmanCollection:
             output.append(host_dict)
         return output
 
-    def _paths_to_openapi(self, items: Optional[list[PostmanItem]] = None) -> Paths:
-        paths: dict[str, dict[str, Operation]] = defaultdict(dict)
-        if items is None:
-            items = self.items
-
-        for item in items:
-            if path := item.get_path():
-                paths[path].update(item.to_openapi())
-
-            if sub_items := item.get_items():
-                for sub_item in sub_items:
-                    if path := sub_item.get_path():
-                        paths[path].update(sub_item.to_openapi())
-
-        output: dict[str, PathItem] = {}
-        for path, item in paths.items():
-            output[path] = PathItem()
-            for method, operation in item.items():
-                output[path].__setattr__(method, operation)
-        return output
+    @staticmethod
+    def _item_to_openapi(
+        item: PostmanItem,
+        cache: Optional["ConversionCache"] = None,
+        profiler: Optional["Profiler"] = None,
+    ) -> dict[str, Operation]:
+        """Convert a single item, reusing a cached conversion when available"""
+        start = time.perf_counter()
+
+        if cache is None or not item.digest:
+            operations = item.to_openapi()
+        elif (operations := cache.get(item.digest)) is None:
+            operations = item.to_openapi()
+            cache.put(item.digest, operations)
+
+        if profiler:
+            profiler.record_item(item, time.perf_counter() - start)
+        return operations
 
-    def _tags_to_openapi(self, items: Optional[list[PostmanItem]] = None) -> list[Tag]:
+    @classmethod
+    def _operations_for(
+        cls,
+        leaves: list[PostmanItem],
+        cache: Optional["ConversionCache"] = None,
+        profiler: Optional["Profiler"] = None,
+    ) -> list[tuple[str, dict[str, Operation]]]:
+        """Operations of a group of leaf requests, in document order"""
+        return [
+            (leaf.get_path(), cls._item_to_openapi(leaf, cache, profiler))
+            for leaf in leaves
+        ]
+
+    def _paths_to_openapi(
+        self,
+        cache: Optional["ConversionCache"] = None,
+        jobs: int = 1,
+        profiler: Optional["Profiler"] = None,
+        fast_build: bool = False,
+    ) -> Paths:
+        paths: dict[str, dict[str, Operation]] = defaultdict(dict)
+        groups = self.index.groups
+
+        if jobs > 1 and len(groups) > 1:
+            # Results come back in submission order, so merging them below is
+            # identical to the serial path
+            workers = min(jobs, len(groups))
+            chunksize = max(1, len(groups) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(
+                    pool.map(
+                        _convert_group,
+                        groups,
+                        [cache] * len(groups),
+                        [profiler] * len(groups),
+                        [fast_build] * len(groups),
+                        chunksize=chunksize,
+                    )
+                )
+            converted_groups = []
+            for converted, worker_cache, worker_profiler in results:
+                if cache and worker_cache:
+                    cache.merge_counts(worker_cache)
+                if profiler and worker_profiler:
+                    profiler.merge_items(worker_profiler)
+                converted_groups.append(converted)
+        else:
+            converted_groups = [
+                self._operations_for(group, cache, profiler) for group in groups
+            ]
+
+        for converted in converted_groups:
+            for path, operations in converted:
+                paths[path].update(operations)
+
+        return {path: build(PathItem, **item) for path, item in paths.items()}
+
+    def _tags_to_openapi(self) -> list[Tag]:
         """List of tags from all items' requests."""
         all_tags: list[Tag] = []
         all_tags: list[Tag] = []
-        if items is None:
-            items = self.items
-
-        for item in items:
-            if item.is_folder():
-                tag_dict = Tag(name=item.name)
-                tag_dict = Tag(name=item.name)
 
-                if description := item.get_description():
-                    tag_dict.description = description
-                    tag_dict.description = description
-                if url := item.get_url():
-                    tag_dict.externalDocs = ExternalDocumentation(url=url)
-                    tag_dict.externalDocs = ExternalDocumentation(url=url)
+        for item in self.index.folders:
+            tag_dict = Tag(name=item.name)
+            tag_dict = Tag(name=item.name)
 
-                all_tags.append(tag_dict)
+            if description := item.get_description():
+                tag_dict.description = description
+                tag_dict.description = description
+            if url := item.get_url():
+                tag_dict.externalDocs = ExternalDocumentation(url=url)
+                tag_dict.externalDocs = ExternalDocumentation(url=url)
 
-            all_tags.extend(self._tags_to_openapi(item.get_items()))
+            all_tags.append(tag_dict)
         return all_tags
 
     def get_security_schemes(self) -> dict[str, SecurityScheme | Reference]:
@@ -138,35 +218,64 @@ class PostmanCollection:
         if self.auth:
             schemes.update(self.auth.to_openapi())
 
-        # Add auth from items
-        for item in self.items:
-            if item_auth := item.get_auth():
-                schemes.update(item_auth.to_openapi())
-
-            if request := item.get_request():
-                if request_auth := request.get_auth():
-                    schemes.update(request_auth.to_openapi())
+        # Add auth from items and their requests
+        for auth in self.index.auths:
+            schemes.update(auth.to_openapi())
 
         return schemes
 
-    def to_openapi(self) -> OpenAPI:
-        """Convert the collection to an OpenAPI specification"""
-        openapi = OpenAPI(
-            openapi="3.1.0",
-            info=self.info.to_openapi(),
-            servers=self._hosts_to_openapi(),
-            tags=self._tags_to_openapi(),
-            paths=self._paths_to_openapi(),
-        )
-
-        if self.auth:
-            openapi.security = [{self.auth.get_type(): []}]
-
-        # Add security schemes if present
-        if security_schemes := self.get_security_schemes():
-            openapi.components = Components(securitySchemes=security_schemes)
-
-        if KANDJI_API_DOCS_URL:
-            openapi.externalDocs = ExternalDocumentation(url=KANDJI_API_DOCS_URL)
-
-        return openapi
+    def to_openapi(
+        self,
+        cache: Optional["ConversionCache"] = None,
+        jobs: int = 1,
+        profiler: Optional["Profiler"] = None,
+        fast_build: bool = False,
+    ) -> OpenAPI:
+        """Convert the collection to an OpenAPI specification
+
+        With `jobs` > 1 the requests under each top-level item are converted in a
+        process pool. A `profiler` records the conversion time of every request.
+        With `fast_build` nothing is validated and the plain data of the document
+        is returned (see `construction.build`), the caller should pass it to
+        `construction.validate_document`.
+        """
+        security_schemes = self.get_security_schemes()
+
+        with fast_construction(fast_build), sharing_components():
+            return build(
+                OpenAPI,
+                openapi="3.1.0",
+                info=self.info.to_openapi(),
+                servers=self._hosts_to_openapi(),
+                paths=self._paths_to_openapi(
+                    cache=cache, jobs=jobs, profiler=profiler, fast_build=fast_build
+                ),
+                components=(
+                    Components(securitySchemes=security_schemes)
+                    if security_schemes
+                    else None
+                ),
+                security=[{self.auth.get_type(): []}] if self.auth else None,
+                tags=self._tags_to_openapi(),
+                externalDocs=(
+                    ExternalDocumentation(url=KANDJI_API_DOCS_URL)
+                    if KANDJI_API_DOCS_URL
+                    else None
+                ),
+            )
+
+
+def _convert_group(
+    leaves: list[PostmanItem],
+    cache: Optional["ConversionCache"],
+    profiler: Optional["Profiler"],
+    fast_build: bool,
+) -> tuple[
+    list[tuple[str, dict[str, Operation]]],
+    Optional["ConversionCache"],
+    Optional["Profiler"],
+]:
+    """Process pool entry point, returns the worker's cache and profiler to merge"""
+    with fast_construction(fast_build), sharing_components():
+        converted = PostmanCollection._operations_for(leaves, cache, profiler)
+    return converted, cache, profiler
@@ -2,7 +2,6 @@ from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from openapi_pydantic import (
-    DataType,
     ExternalDocumentation,
     Operation,
     Parameter,
@@ -10,17 +9,19 @@ from openapi_pydantic import (
     Reference,
     Response,
     Responses,
-    Schema,
 )
 
 from kandji_openapi.models.auth import Auth
+from kandji_openapi.models.components import shared_parameter
+from kandji_openapi.models.construction import build
+from kandji_openapi.models.entries import shared_entries
 from kandji_openapi.models.request_body import PostmanRequestBody
 from kandji_openapi.models.response import PostmanResponse
 from kandji_openapi.models.url import URL
 from kandji_openapi.strings import string_formatting, to_camel_case
 
 
-@dataclass
+@dataclass(slots=True)
 class PostmanRequest:
     method: str
     url: URL
@@ -58,7 +59,7 @@ class PostmanRequest:
             method=data.get("method", "GET"),
             url=URL.from_data(url_data),
             summary=name,
-            headers=data.get("header", []),
+            headers=shared_entries(data.get("header", [])),
             body=PostmanRequestBody.from_data(data.get("body", {})),
             description=string_formatting(data.get("description", "")),
             auth=Auth.from_data(data.get("auth", {})),
@@ -95,10 +96,9 @@ class PostmanRequest:
             )
 
             parameters.append(
-                Parameter(
+                shared_parameter(
                     name=query.get("key", ""),
-                    param_in=ParameterLocation.QUERY,  # type: ignore
-                    schema=Schema(type=DataType("string")),
+                    location=ParameterLocation.QUERY,
                     required=not query.get("disabled", False),
                     description=string_formatting(description),
                     example=query.get("value"),
@@ -110,10 +110,9 @@ class PostmanRequest:
                 continue
 
             parameters.append(
-                Parameter(
+                shared_parameter(
                     name=header.get("key", ""),
-                    param_in=ParameterLocation.HEADER,  # type: ignore
-                    schema=Schema(type=DataType("string")),
+                    location=ParameterLocation.HEADER,
                     required=True,
                     description=string_formatting(header.get("description", "")),
                     example=header.get("value"),
@@ -131,7 +130,7 @@ class PostmanRequest:
             responses.update(response.to_openapi())
 
         if not responses:
-            responses = {"204": Response(description="No Content")}
+            responses = {"204": build(Response, description="No Content")}
 
         return responses
 
@@ -145,24 +144,22 @@ class PostmanRequest:
         tag_camel_case = to_camel_case(self.get_tag())
         summary_camel_case = to_camel_case(self.summary)
 
-        operation = Operation(
+        tag = self.get_tag()
+        operation = build(
+            Operation,
+            tags=[tag] if tag else None,
             summary=self.summary,
+            description=self.description or None,
+            externalDocs=(
+                build(ExternalDocumentation, url=self.external_docs)
+                if self.url
+                else None
+            ),
             operationId=f"{tag_camel_case}_{summary_camel_case}",
+            parameters=self.get_parameters() or None,
+            requestBody=self.body.to_openapi() if self.body else None,
             responses=self.get_responses(),
+            security=[{self.auth.get_type(): []}] if self.auth else None,
         )
 
-        if tag := self.get_tag():
-            operation.tags = [tag]
-        if self.description:
-            operation.description = self.description
-        if parameters := self.get_parameters():
-            operation.parameters = parameters
-        if self.body:
-            operation.requestBody = self.body.to_openapi()
-        if self.auth:
-            operation.security = [{self.auth.get_type(): []}]
-
-        if self.url:
-            operation.externalDocs = ExternalDocumentation(url=self.external_docs)
-
         return {method: operation}
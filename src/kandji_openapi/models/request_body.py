@@ -1,14 +1,15 @@
 import json
-import re
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from openapi_pydantic import DataType, MediaType, RequestBody, Schema
 
+from kandji_openapi import tolerant_json
+from kandji_openapi.models.construction import build
 from kandji_openapi.strings import string_formatting
 
 
-@dataclass
+@dataclass(slots=True)
 class PostmanRequestBody:
     mode: str
     raw: Optional[str] = None
@@ -24,8 +25,8 @@ class PostmanRequestBody:
         if not data:
             return None
 
-        # Remove comments - find // and remove all remaining text on that line
-        raw = re.sub(r"//.*$", "", data.get("raw", ""), flags=re.MULTILINE)
+        # Remove comments, leaving "//" inside strings such as URLs intact
+        raw = tolerant_json.strip_comments(data.get("raw", ""))
 
         return cls(
             mode=data.get("mode", "raw"),
@@ -71,17 +72,19 @@ class PostmanRequestBody:
             example = string_formatting(self.raw or "{}")
             if "json" in content_type.lower():
                 try:
-                    example = json.loads(self.raw or "{}")
+                    example = tolerant_json.loads(self.raw or "{}")
                 except json.JSONDecodeError:
                     example = self.raw or "{}"
 
-            return RequestBody(
+            return build(
+                RequestBody,
                 content={
-                    content_type: MediaType(
+                    content_type: build(
+                        MediaType,
                         example=example,
-                        schema=Schema(type=DataType(value="string")),
+                        schema=build(Schema, type=DataType(value="string")),
                     )
-                }
+                },
             )
 
         elif self.mode in ["formdata", "urlencoded"]:
@@ -94,35 +97,48 @@ class PostmanRequestBody:
                     continue
 
                 if key := item.get("key"):
-                    properties[key] = {"type": "string"}
+                    fields: dict[str, Any] = {}
                     if description := item.get("description"):
-                        properties[key]["description"] = string_formatting(description)
+                        fields["description"] = string_formatting(description)
                     if item.get("type") == "file":
-                        properties[key]["format"] = "binary"
+                        fields["schema_format"] = "binary"
                     if item.get("value"):
-                        properties[key]["example"] = item["value"]
+                        fields["example"] = item["value"]
+                    properties[key] = build(
+                        Schema, type=DataType(value="string"), **fields
+                    )
 
                     required.append(key)
 
-            schema = Schema(type=DataType(value="object"), properties=properties)
-            if required:
-                schema.required = required
+            schema = build(
+                Schema,
+                type=DataType(value="object"),
+                properties=properties,
+                required=required or None,
+            )
 
-            return RequestBody(content={content_type: MediaType(schema=schema)})
+            return build(
+                RequestBody, content={content_type: build(MediaType, schema=schema)}
+            )
 
         elif self.mode == "graphql":
             if self.graphql:
-                return RequestBody(
+                return build(
+                    RequestBody,
                     content={
-                        "application/json": MediaType(
-                            schema=Schema(
+                        "application/json": build(
+                            MediaType,
+                            schema=build(
+                                Schema,
                                 type=DataType(value="object"),
                                 properties={
-                                    "query": Schema(
+                                    "query": build(
+                                        Schema,
                                         type=DataType(value="string"),
                                         example=self.graphql.get("query", ""),
                                     ),
-                                    "variables": Schema(
+                                    "variables": build(
+                                        Schema,
                                         type=DataType(value="object"),
                                         example=self.graphql.get("variables", {}),
                                     ),
@@ -130,7 +146,7 @@ class PostmanRequestBody:
                                 required=["query"],
                             ),
                         )
-                    }
+                    },
                 )
 
         return None
@@ -1,5 +1,4 @@
 import json
-import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
@@ -7,17 +6,20 @@ from typing import Any, Optional
 from openapi_pydantic import (
     DataType,
     Example,
-    Header,
     MediaType,
     Response,
     Responses,
     Schema,
 )
 
+from kandji_openapi import tolerant_json
+from kandji_openapi.models.components import shared_header
+from kandji_openapi.models.construction import build
+from kandji_openapi.models.entries import shared_entries
 from kandji_openapi.strings import string_formatting
 
 
-@dataclass
+@dataclass(slots=True)
 class PostmanResponse:
     id: Optional[str]
     name: Optional[str]
@@ -31,18 +33,12 @@ class PostmanResponse:
 
     @classmethod
     def from_data(cls, data: dict[str, Any]) -> "PostmanResponse":
-        headers = data.get("header", [])
-        if headers is None:
-            headers = []
-        elif not isinstance(headers, list):
-            headers = []
-
         return cls(
             id=data.get("id"),
             name=data.get("name"),
             status_code=data.get("code", 200),
             status_text=data.get("status", "OK"),
-            headers=headers,
+            headers=shared_entries(data.get("header", [])),
             body=data.get("body"),
             cookies=data.get("cookie", []),
             time=data.get("responseTime"),
@@ -72,78 +68,65 @@ class PostmanResponse:
     def infer_schema_from_value(self, value: Any) -> Schema:
         """Infers the schema for a single value."""
         if isinstance(value, str):
-            return Schema(type=DataType(value="string"))
+            return build(Schema, type=DataType(value="string"))
         elif isinstance(value, int):
-            return Schema(type=DataType(value="integer"))
+            return build(Schema, type=DataType(value="integer"))
         elif isinstance(value, float):
-            return Schema(type=DataType(value="number"))
+            return build(Schema, type=DataType(value="number"))
         elif isinstance(value, bool):
-            return Schema(type=DataType(value="boolean"))
+            return build(Schema, type=DataType(value="boolean"))
         elif isinstance(value, dict):
-            return Schema(
+            return build(
+                Schema,
                 type=DataType(value="object"),
                 properties=self.generate_properties_from_example(value),
             )
         else:
             # Handle other types or return a default schema
-            return Schema()  # Generic schema
+            return build(Schema)  # Generic schema
 
     def to_openapi(self) -> Responses:
         """Convert response to OpenAPI response object"""
-        response = Response(description=self.status_text)
+        content = None
         properties = {}
 
         content_type = self.get_content_type()
         if content_type and self.body:
             if "json" in content_type.lower():
-                modified_body = self.body
-
-                # Remove escaped newline characters
-                modified_body = re.sub(r"[\n\t]|\.{3}", "", modified_body)
-
-                # Replace smart quotes with regular quotes
-                modified_body = re.sub(r"[“”‘’]", "'", modified_body)
-
-                # Remove comments
-                modified_body = re.sub(r"// [^\n}]*", "", modified_body)
-
-                # Remove trailing commas
-                modified_body = re.sub(r",\s*}", "}", modified_body)
-                modified_body = re.sub(r",\s*]", "]", modified_body)
-
-                # Remove extraneous characters like ",s"
-                modified_body = re.sub(r",s", ",", modified_body)
-
+                # Examples are hand-written and may contain comments, trailing
+                # commas, smart quotes or "..." placeholders
                 try:
-                    body = json.loads(modified_body)
+                    body = tolerant_json.loads(self.body)
                     if isinstance(body, dict):
                         properties = self.generate_properties_from_example(body)
                 except json.JSONDecodeError:
-                    body = modified_body
+                    body = self.body
 
-                example = Example(value=body)
-                schema = Schema(type=DataType(value="object"))
-                if properties:
-                    schema.properties = properties
+                example = build(Example, value=body)
+                schema = build(
+                    Schema, type=DataType(value="object"), properties=properties or None
+                )
             else:
-                example = Example(value=string_formatting(self.body))
-                schema = Schema(type=DataType(value="string"))
+                example = build(Example, value=string_formatting(self.body))
+                schema = build(Schema, type=DataType(value="string"))
 
-            response.content = {content_type: MediaType(example=example, schema=schema)}
+            content = {content_type: build(MediaType, example=example, schema=schema)}
 
         headers = {}
         for header in self.headers:
             if not header:
                 continue
             if key := header.get("key"):
-                headers[key] = Header(schema=Schema(type=DataType(value="string")))
-
-                if description := header.get("description"):
-                    headers[key].description = string_formatting(description)
-                if value := header.get("value"):
-                    headers[key].example = Example(value=value)
-
-        if headers:
-            response.headers = headers
-
+                description = header.get("description")
+                headers[key] = shared_header(
+                    description=string_formatting(description) if description else None,
+                    example=header.get("value") or None,
+                )
+
+        response = build(
+            Response,
+            description=self.status_text,
+            headers=headers or None,
+            content=content,
+        )
         return {str(self.status_code): response}
@@ -2,10 +2,13 @@ import re
 from dataclasses import dataclass, field
 from typing import Any, Iterable, Optional, Sequence
 
-from openapi_pydantic import DataType, Parameter, ParameterLocation, Schema
+from openapi_pydantic import Parameter, ParameterLocation
 
+from kandji_openapi.models.components import shared_parameter
+from kandji_openapi.models.entries import shared_entries
 
-@dataclass
+
+@dataclass(slots=True)
 class URL:
     raw: Optional[str] = None
     protocol: Optional[str] = None
@@ -17,26 +20,28 @@ class URL:
 
     @classmethod
     def from_data(cls, data: dict[str, Any]) -> "URL":
+        protocol = data.get("protocol")
+        host = data.get("host", [])
+        path = data.get("path", [])
         if "raw" in data:
             # Parse raw URL string to extract protocol, host, etc
             if "://" in data["raw"]:
                 protocol, rest = data["raw"].split("://", 1)
-                data["protocol"] = protocol
                 if "/" in rest:
                     host_part, path_part = rest.split("/", 1)
-                    data["host"] = host_part.split(".")
-                    data["path"] = path_part.split("/")
+                    host = host_part.split(".")
+                    path = path_part.split("/")
                 else:
-                    data["host"] = rest.split(".")
+                    host = rest.split(".")
 
         # Handle full URL object
         return cls(
             raw=data.get("raw"),
-            protocol=data.get("protocol"),
-            host=data.get("host", []),
-            path=data.get("path", []),
+            protocol=protocol,
+            host=host,
+            path=path,
             port=data.get("port"),
-            query=data.get("query", []),
+            query=shared_entries(data.get("query", [])),
             hash=data.get("hash"),
         )
 
@@ -45,21 +50,11 @@ class URL:
         for path_var in self.path:
             if path_var.startswith(":"):
                 parameters.append(
-                    Parameter(
-                        name=path_var.strip(":"),
-                        param_in=ParameterLocation.PATH,  # type: ignore
-                        schema=Schema(type=DataType("string")),
-                        required=True,
-                    )
+                    shared_parameter(path_var.strip(":"), ParameterLocation.PATH, True)
                 )
             elif path_var.startswith("{") and path_var.endswith("}"):
                 parameters.append(
-                    Parameter(
-                        name=path_var.strip("{}"),
-                        param_in=ParameterLocation.PATH,  # type: ignore
-                        schema=Schema(type=DataType("string")),
-                        required=True,
-                    )
+                    shared_parameter(path_var.strip("{}"), ParameterLocation.PATH, True)
                 )
         return parameters
 
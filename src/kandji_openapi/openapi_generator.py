@@ -1,40 +1,321 @@
 import json
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import replace
+from functools import cached_property
 from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence, TextIO
 
-from ruamel.yaml import YAML
-
+from kandji_openapi import interning, json_stream, sharding, yaml_emitter
+from kandji_openapi.artifacts import artifact_write, minified_path, variant_paths
+from kandji_openapi.cache import ConversionCache
+from kandji_openapi.configurations import YAML_ENGINES
+from kandji_openapi.examples import ExampleLimits, relative_prefix
+from kandji_openapi.files import atomic_write
+from kandji_openapi.models.construction import (
+    plain_data,
+    validate_document,
+    validate_path_item,
+)
 from kandji_openapi.models.postman_collection import PostmanCollection
+from kandji_openapi.profiler import Profiler
+from kandji_openapi.spec_index import SpecIndex
 
 
 class OpenAPIGenerator:
-    def __init__(self, collection: PostmanCollection) -> None:
+    def __init__(
+        self,
+        collection: PostmanCollection,
+        yaml_engine: str = "ruamel",
+        cache: Optional[ConversionCache] = None,
+        jobs: int = 1,
+        intern_schemas: bool = False,
+        intern_components: bool = False,
+        profiler: Optional[Profiler] = None,
+        fast_build: bool = False,
+        examples: Optional[ExampleLimits] = None,
+        minify: bool = False,
+        compressions: Sequence[str] = (),
+    ) -> None:
+        if yaml_engine not in YAML_ENGINES:
+            raise ValueError(
+                f"Unknown YAML engine '{yaml_engine}', expected one of {YAML_ENGINES}"
+            )
+
         self.collection = collection
-        self.openapi_spec = collection.to_openapi()
+        self.yaml_engine = yaml_engine
+        self.cache = cache
+        self.intern_schemas = intern_schemas
+        self.intern_components = intern_components
+        self.fast_build = fast_build
+        self.examples = examples
+        # Variants written besides the JSON and YAML, see `artifacts`
+        self.minify = minify
+        self.compressions = tuple(compressions)
+        # Filled in with `spec_data` when `examples` shrinks the examples
+        self.external_examples: dict[str, Any] = {}
+        self.example_savings: Counter[str] = Counter()
+        # Filled in by `to_json` and `write_shards` for `write_index`
+        self.spec_index: Optional[SpecIndex] = None
+        self.shard_files: dict[str, Path] = {}
+        self.openapi_spec = collection.to_openapi(
+            cache=cache, jobs=jobs, profiler=profiler, fast_build=fast_build
+        )
+
+    @cached_property
+    def spec_data(self) -> dict[str, Any]:
+        """Plain-data tree of the OpenAPI spec, shared by every output format"""
+        if self.fast_build:
+            # Built as plain data without validation, check the result once
+            spec_data = plain_data(self.openapi_spec)
+            validate_document(spec_data)
+        else:
+            spec_data = json.loads(
+                self.openapi_spec.model_dump_json(by_alias=True, exclude_none=True)
+            )
+        if self.examples:
+            # Before interning, so identical examples stay identical
+            files, savings = self.examples.apply(spec_data)
+            self.external_examples, self.example_savings = files, savings
+        if self.intern_schemas:
+            interning.intern_schemas(spec_data)
+        if self.intern_components:
+            interning.intern_shared_components(spec_data)
+        return spec_data
+
+    @property
+    def streamable(self) -> bool:
+        """Whether the JSON can be written path by path, without `spec_data`"""
+        interning = self.intern_schemas or self.intern_components
+        if interning or self.examples:
+            return False
+        return "spec_data" not in self.__dict__
+
+    def _stream_parts(self) -> tuple[dict[str, Any], Iterator[tuple[str, Any]]]:
+        """Plain data of the spec without its paths, and of each path in order"""
+        spec = self.openapi_spec
+        if self.fast_build:
+            # The plain form is a dict, see `construction.build`
+            members: dict[str, Any] = spec  # type: ignore
+            head = plain_data({k: v for k, v in members.items() if k != "paths"})
+            validate_document({**head, "paths": {}})
+            paths = members["paths"]
+
+            def path_items() -> Iterator[tuple[str, Any]]:
+                for path in sorted(paths):
+                    item = plain_data(paths[path])
+                    validate_path_item(item)
+                    yield path, item
+
+        else:
+            head = json.loads(
+                spec.model_dump_json(
+                    by_alias=True, exclude_none=True, exclude={"paths"}
+                )
+            )
+            paths = spec.paths or {}
+
+            def path_items() -> Iterator[tuple[str, Any]]:
+                for path in sorted(paths):
+                    dumped = paths[path].model_dump_json(
+                        by_alias=True, exclude_none=True
+                    )
+                    yield path, json.loads(dumped)
+
+        return head, path_items()
+
+    def variant_files(
+        self, json_path: Optional[Path], yaml_path: Optional[Path]
+    ) -> list[Path]:
+        """Minified and compressed files `write` creates besides the outputs"""
+        paths = []
+        if json_path:
+            paths += variant_paths(json_path, self.compressions, self.minify)
+        if yaml_path:
+            paths += variant_paths(yaml_path, self.compressions)
+        return paths
 
     def to_json(self, file_path: Path) -> None:
-        """Write OpenAPI spec to JSON file"""
-        with open(file_path, "w") as temp:
-            json.dump(
-                json.loads(
-                    self.openapi_spec.model_dump_json(by_alias=True, exclude_none=True)
-                ),
+        """Write OpenAPI spec to JSON file
+
+        Unless the whole tree is needed anyway (for interning or another
+        format), the document is streamed one path at a time. The position of
+        every path item is recorded in `spec_index`. The minified and
+        compressed variants are written in the same pass.
+        """
+        if self.streamable:
+            head, path_items = self._stream_parts()
+        elif "paths" in self.spec_data:
+            head = {k: v for k, v in self.spec_data.items() if k != "paths"}
+            path_items = iter(sorted(self.spec_data["paths"].items()))
+        else:
+            with self._json_files(file_path) as (temp, minified):
+                json.dump(self.spec_data, temp, sort_keys=True, indent=2)
+                if minified:
+                    json.dump(
+                        self.spec_data, minified, sort_keys=True, separators=(",", ":")
+                    )
+            return
+
+        info = head.get("info", {})
+        index = SpecIndex(
+            document=str(file_path),
+            openapi=head.get("openapi", ""),
+            title=info.get("title", ""),
+            api_version=info.get("version", ""),
+        )
+        with self._json_files(file_path) as (temp, minified):
+            json_stream.dump_streaming(
+                head,
+                "paths",
+                path_items,
                 temp,
-                sort_keys=True,
-                indent=2,
+                on_member=index.add_path,
+                minified=minified,
             )
+        index.size = file_path.stat().st_size
+        self.spec_index = index
+
+    @contextmanager
+    def _json_files(self, file_path: Path) -> Iterator[tuple[TextIO, Optional[TextIO]]]:
+        """The JSON file and the minified one, each with its compressed copies"""
+        with ExitStack() as stack:
+            temp = stack.enter_context(artifact_write(file_path, self.compressions))
+            minified = None
+            if self.minify:
+                minified = stack.enter_context(
+                    artifact_write(minified_path(file_path), self.compressions)
+                )
+            yield temp, minified
+
+    def write_index(self, file_path: Path) -> None:
+        """Write the index of the JSON spec written last, see `spec_index`"""
+        if not self.spec_index:
+            raise ValueError("The JSON spec must be written before its index")
+
+        def relative(path: Path) -> str:
+            return Path(os.path.relpath(path, file_path.parent)).as_posix()
+
+        index = replace(
+            self.spec_index,
+            document=relative(Path(self.spec_index.document)),
+            shards={tag: relative(path) for tag, path in self.shard_files.items()},
+        )
+        index.save(file_path)
 
     def to_yaml(self, file_path: Path) -> None:
-        """Write OpenAPI spec to YAML file"""
-        yaml = YAML(typ="safe", pure=True)
+        """Write OpenAPI spec to YAML file, and its compressed variants"""
+        self._dump_yaml(self.spec_data, file_path, self.compressions)
+
+    def _dump_json(self, data: Any, file_path: Path) -> None:
+        with atomic_write(file_path) as temp:
+            json.dump(data, temp, sort_keys=True, indent=2)
+
+    def _dump_yaml(
+        self, data: dict[str, Any], file_path: Path, compressions: Sequence[str] = ()
+    ) -> None:
+        if self.yaml_engine == "fast":
+            with artifact_write(file_path, compressions) as temp:
+                yaml_emitter.dump(data, temp)
+            return
+
+        # ruamel picks its libyaml based C emitter when it is installed and not
+        # forced to be pure. It is faster but may choose different (equivalent)
+        # quoting and line folding than the pure-Python emitter. It is imported
+        # here so JSON-only runs never load it.
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ="safe", pure=self.yaml_engine != "libyaml")
         yaml.allow_unicode = True
         yaml.default_flow_style = False
         yaml.explicit_start = True
         yaml.preserve_quotes = True
 
-        with open(file_path, "w") as temp:
-            yaml.dump(
-                json.loads(
-                    self.openapi_spec.model_dump_json(by_alias=True, exclude_none=True)
-                ),
-                temp,
-            )
+        with artifact_write(file_path, compressions) as temp:
+            yaml.dump(data, temp)
+
+    def write(
+        self,
+        json_path: Optional[Path] = None,
+        yaml_path: Optional[Path] = None,
+        parallel: bool = False,
+    ) -> None:
+        """Write every requested format from a single serialization of the spec"""
+        writers: list[tuple[Callable[[Path], None], Path]] = []
+        if json_path:
+            writers.append((self.to_json, json_path))
+        if yaml_path:
+            writers.append((self.to_yaml, yaml_path))
+
+        # Build the shared tree before fanning out so writers never race on it,
+        # a lone JSON writer streams the document instead
+        if yaml_path or not self.streamable:
+            _ = self.spec_data
+
+        if parallel and len(writers) > 1:
+            with ThreadPoolExecutor(max_workers=len(writers)) as pool:
+                futures = [pool.submit(writer, path) for writer, path in writers]
+                for future in futures:
+                    future.result()
+        else:
+            for writer, path in writers:
+                writer(path)
+
+    def write_examples(self) -> list[Path]:
+        """Write the examples moved out of the spec, returning their paths"""
+        directory = self.examples.directory if self.examples else None
+        if not directory:
+            return []
+        _ = self.spec_data
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name, value in sorted(self.external_examples.items()):
+            self._dump_json(value, directory / name)
+            paths.append(directory / name)
+        return paths
+
+    def write_shards(
+        self,
+        directory: Path,
+        json_format: bool = True,
+        yaml_format: bool = False,
+        parallel: bool = False,
+    ) -> list[Path]:
+        """Write one spec per tag and the shared components to `directory`
+
+        Returns the paths written, see `sharding` for the layout.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        dumps: list[tuple[Callable[[dict[str, Any], Path], None], str]] = []
+        if json_format:
+            dumps.append((self._dump_json, "json"))
+        if yaml_format:
+            dumps.append((self._dump_yaml, "yaml"))
+
+        jobs: list[tuple[Callable[[dict[str, Any], Path], None], Any, Path]] = []
+        components = sharding.shared_components(self.spec_data)
+        examples = None
+        if self.examples and self.examples.directory and self.external_examples:
+            shard_prefix = relative_prefix(self.examples.directory, directory)
+            examples = (self.examples.prefix, shard_prefix)
+        for dump, suffix in dumps:
+            components_file = f"{sharding.COMPONENTS_NAME}.{suffix}"
+            jobs.append((dump, components, directory / components_file))
+            shards = sharding.split_spec(self.spec_data, components_file, examples)
+            names = sharding.shard_names(list(shards))
+            for tag, shard in shards.items():
+                jobs.append((dump, shard, directory / f"{names[tag]}.{suffix}"))
+                if suffix == "json":
+                    self.shard_files[tag] = directory / f"{names[tag]}.json"
+
+        if parallel:
+            with ThreadPoolExecutor() as pool:
+                futures = [pool.submit(dump, data, path) for dump, data, path in jobs]
+                for future in futures:
+                    future.result()
+        else:
+            for dump, data, path in jobs:
+                dump(data, path)
+        return [path for _, _, path in jobs]
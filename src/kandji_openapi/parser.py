@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Any
+from typing import Any, Optional
 
 from kandji_openapi.models.postman_collection import PostmanCollection
 
@@ -8,8 +8,9 @@ from kandji_openapi.models.postman_collection import PostmanCollection
 class PostmanParser:
     """Parser for Postman Collection JSON files"""
 
-    def __init__(self, json_data: dict[str, Any]) -> None:
-        self.json_data = json_data
+    def __init__(self, json_data: dict[str, Any], release: bool = False) -> None:
+        self.json_data: Optional[dict[str, Any]] = json_data
+        self.release = release
         self._validate_collection()
 
     def _validate_collection(self) -> None:
@@ -22,8 +23,19 @@ class PostmanParser:
             raise ValueError("Collection 'item' field must be an array of items.")
 
     def parse(self) -> PostmanCollection:
-        """Parse the collection JSON data into a PostmanCollection object"""
-        return PostmanCollection.from_data(self.json_data)
+        """Parse the collection JSON data into a PostmanCollection object
+
+        With `release` the JSON data is consumed: each item is released once
+        converted, so the raw collection and the models never both exist in
+        full, and the parser can only parse once. Parsers created by
+        `from_file` own their data and release it.
+        """
+        if self.json_data is None:
+            raise ValueError("The collection was already parsed")
+        if not self.release:
+            return PostmanCollection.from_data(self.json_data)
+        json_data, self.json_data = self.json_data, None
+        return PostmanCollection.from_data(json_data, release=True)
 
     @classmethod
     def from_file(cls, file_path: str) -> "PostmanParser":
@@ -39,4 +51,4 @@ class PostmanParser:
         except Exception as e:
             raise IOError(f"Error reading collection file: {e}")
 
-        return cls(json_data)
+        return cls(json_data, release=True)
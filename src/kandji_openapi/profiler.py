@@ -0,0 +1,136 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from kandji_openapi.models.item import PostmanItem
+
+
+@dataclass
+class PhaseProfile:
+    name: str
+    seconds: float
+    # Highest traced memory during the phase and the change it left behind
+    peak_bytes: int
+    allocated_bytes: int
+
+
+@dataclass
+class ItemProfile:
+    id: str
+    name: str
+    path: str
+    seconds: float
+    body_bytes: int
+    responses: int
+
+
+@dataclass
+class Profiler:
+    """Wall time and tracemalloc peaks per pipeline phase and per item"""
+
+    phases: list[PhaseProfile] = field(default_factory=list)
+    items: list[ItemProfile] = field(default_factory=list)
+    # Whether `start` started tracemalloc, rather than the caller
+    started: bool = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+
+    def stop(self) -> None:
+        if self.started:
+            tracemalloc.stop()
+            self.started = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Profile the body of the `with` block as one phase"""
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0] if tracing else 0
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+            self.phases.append(
+                PhaseProfile(
+                    name=name,
+                    seconds=seconds,
+                    peak_bytes=peak,
+                    allocated_bytes=current - before,
+                )
+            )
+
+    def record_item(self, item: "PostmanItem", seconds: float) -> None:
+        """Record the conversion time of a single request item"""
+        body_bytes = 0
+        responses = 0
+        if request := item.get_request():
+            if request.body and request.body.raw:
+                body_bytes += len(request.body.raw)
+            for response in request.responses:
+                body_bytes += len(response.body or "")
+            responses = len(request.responses)
+
+        self.items.append(
+            ItemProfile(
+                id=item.id,
+                name=item.name,
+                path=item.get_path(),
+                seconds=seconds,
+                body_bytes=body_bytes,
+                responses=responses,
+            )
+        )
+
+    def merge_items(self, other: "Profiler") -> None:
+        """Add the item timings collected by a copy in another process"""
+        self.items.extend(other.items)
+
+    def slowest_items(self, count: int) -> list[ItemProfile]:
+        return sorted(self.items, key=lambda item: item.seconds, reverse=True)[:count]
+
+    def to_dict(self, top: int = 10) -> dict[str, Any]:
+        """Machine-readable report"""
+        return {
+            "total_seconds": sum(phase.seconds for phase in self.phases),
+            "phases": [asdict(phase) for phase in self.phases],
+            "items_converted": len(self.items),
+            "slowest_items": [asdict(item) for item in self.slowest_items(top)],
+        }
+
+    def report(self, top: int = 10) -> str:
+        """Human-readable report"""
+        total = sum(phase.seconds for phase in self.phases) or 1.0
+        lines = [
+            f"{'phase':<18}{'seconds':>10}{'share':>8}{'peak MiB':>11}{'kept MiB':>11}"
+        ]
+        for phase in self.phases:
+            lines.append(
+                f"{phase.name:<18}{phase.seconds:>10.3f}{phase.seconds / total:>8.1%}"
+                f"{phase.peak_bytes / 2**20:>11.1f}"
+                f"{phase.allocated_bytes / 2**20:>11.1f}"
+            )
+
+        if slowest := self.slowest_items(top):
+            lines.append("")
+            lines.append(
+                f"Slowest {len(slowest)} of {len(self.items)} item conversions:"
+            )
+            lines.append(
+                f"{'seconds':>9}{'body bytes':>12}{'responses':>11}  {'id':<38}path"
+            )
+            for item in slowest:
+                lines.append(
+                    f"{item.seconds:>9.4f}{item.body_bytes:>12,}{item.responses:>11}"
+                    f"  {item.id:<38}{item.path}"
+                )
+        return "\n".join(lines)
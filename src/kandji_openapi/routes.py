@@ -0,0 +1,196 @@
+"""Map concrete request paths back to the operations of the generated spec.
+
+The path templates (`URL.get_path_string`) are compiled into a trie with one
+level per path segment. A segment is matched literally, against a template
+with text around its parameter (`{id}.json`) or as a whole-segment parameter,
+in that order of precedence, so `/devices/list` prefers a `/devices/list`
+template over `/devices/{device_id}`.
+
+Building the trie reports the templates that can match the same request:
+
+- ``ambiguous``: the same method on templates that differ only in parameter
+  names (`/devices/{id}` and `/devices/{device_id}`), the first one wins
+- ``overlap``: a literal segment in one template where another has a
+  parameter; precedence decides, which may not be what the API does
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+from urllib.parse import unquote
+
+from kandji_openapi.interning import HTTP_METHODS
+
+PARAMETER = re.compile(r"\{([^{}/]+)\}")
+
+
+@dataclass(frozen=True)
+class Route:
+    method: str
+    template: str
+    operation_id: Optional[str]
+
+
+@dataclass(frozen=True)
+class RouteConflict:
+    kind: str
+    method: str
+    templates: tuple[str, str]
+
+    def __str__(self) -> str:
+        first, second = self.templates
+        return f"{self.kind}: {self.method} {first} and {second}"
+
+
+@dataclass
+class _Node:
+    static: dict[str, "_Node"] = field(default_factory=dict)
+    # Segments with text around a parameter, by template segment
+    patterns: dict[str, tuple[re.Pattern[str], "_Node"]] = field(default_factory=dict)
+    param: Optional["_Node"] = None
+    routes: dict[str, Route] = field(default_factory=dict)
+
+    def children(self) -> Iterator["_Node"]:
+        yield from self.static.values()
+        yield from (node for _, node in self.patterns.values())
+        if self.param:
+            yield self.param
+
+
+def split_path(path: str) -> list[str]:
+    """Segments of a request path or URL, without query string or fragment"""
+    if "://" in path:
+        path = path.split("://", 1)[1]
+        path = path[path.find("/") :] if "/" in path else "/"
+    path = path.split("?", 1)[0].split("#", 1)[0]
+    segments = [segment for segment in path.split("/") if segment]
+    if "%" in path:
+        return [unquote(segment) for segment in segments]
+    return segments
+
+
+def _segment_pattern(segment: str) -> re.Pattern[str]:
+    parts = PARAMETER.split(segment)
+    # Literal text and parameter names alternate, starting with text
+    regex = "".join(
+        re.escape(part) if index % 2 == 0 else "[^/]+?"
+        for index, part in enumerate(parts)
+    )
+    return re.compile(regex + r"\Z")
+
+
+class RouteTrie:
+    def __init__(self) -> None:
+        self.root = _Node()
+        self.conflicts: list[RouteConflict] = []
+        self.routes = 0
+
+    @classmethod
+    def from_spec(cls, spec: dict[str, Any]) -> "RouteTrie":
+        """Trie of every operation in a plain OpenAPI document"""
+        trie = cls()
+        for path, path_item in spec.get("paths", {}).items():
+            for method in HTTP_METHODS:
+                if operation := path_item.get(method):
+                    trie.add(method, path, operation.get("operationId"))
+        trie.conflicts.extend(trie.overlaps())
+        return trie
+
+    def add(self, method: str, template: str, operation_id: Optional[str]) -> None:
+        node = self.root
+        for segment in template.strip("/").split("/"):
+            if not segment:
+                continue
+            if PARAMETER.fullmatch(segment):
+                node.param = node.param or _Node()
+                node = node.param
+            elif PARAMETER.search(segment):
+                if segment not in node.patterns:
+                    node.patterns[segment] = (_segment_pattern(segment), _Node())
+                node = node.patterns[segment][1]
+            else:
+                node = node.static.setdefault(segment, _Node())
+
+        method = method.upper()
+        if existing := node.routes.get(method):
+            templates = (existing.template, template)
+            self.conflicts.append(RouteConflict("ambiguous", method, templates))
+            return
+        node.routes[method] = Route(method, template, operation_id)
+        self.routes += 1
+
+    def overlaps(self) -> list[RouteConflict]:
+        """Pairs of routes where a literal segment competes with a parameter"""
+        found: list[RouteConflict] = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children())
+            variable: list[tuple[Optional[re.Pattern[str]], _Node]] = list(
+                node.patterns.values()
+            )
+            if node.param:
+                variable.append((None, node.param))
+            for index, (pattern, general) in enumerate(variable):
+                for key, specific in node.static.items():
+                    if pattern is None or pattern.match(key):
+                        _overlapping(specific, general, found)
+                # Two patterns, or a pattern and the parameter, may both match
+                for _, other in variable[index + 1 :]:
+                    _overlapping(general, other, found)
+        return found
+
+    def match(self, method: str, path: str) -> Optional[Route]:
+        """Route of a concrete request, preferring literal segments"""
+        return _match(self.root, split_path(path), 0, method.upper())
+
+
+def _match(
+    node: _Node, segments: list[str], depth: int, method: str
+) -> Optional[Route]:
+    """Route below `node` for the remaining segments, backtracking on dead ends"""
+    if depth == len(segments):
+        return node.routes.get(method)
+
+    segment = segments[depth]
+    literal = node.static.get(segment)
+    if literal and (route := _match(literal, segments, depth + 1, method)):
+        return route
+    if node.patterns:
+        for pattern, child in node.patterns.values():
+            if pattern.match(segment) and (
+                route := _match(child, segments, depth + 1, method)
+            ):
+                return route
+    if node.param:
+        return _match(node.param, segments, depth + 1, method)
+    return None
+
+
+def _overlapping(first: _Node, second: _Node, found: list[RouteConflict]) -> None:
+    """Record the routes of two subtrees that can match the same requests"""
+    stack = [(first, second)]
+    while stack:
+        a, b = stack.pop()
+        for method in a.routes.keys() & b.routes.keys():
+            templates = (a.routes[method].template, b.routes[method].template)
+            found.append(RouteConflict("overlap", method, templates))
+
+        for key, child in a.static.items():
+            if other := b.static.get(key):
+                stack.append((child, other))
+        for x, y in ((a, b), (b, a)):
+            for pattern, child in x.patterns.values():
+                matching = [
+                    node for key, node in y.static.items() if pattern.match(key)
+                ]
+                stack.extend((child, node) for node in matching)
+        a_variable = [node for _, node in a.patterns.values()]
+        b_variable = [node for _, node in b.patterns.values()]
+        if a.param:
+            a_variable.append(a.param)
+            stack.extend((a.param, child) for child in b.static.values())
+        if b.param:
+            b_variable.append(b.param)
+            stack.extend((child, b.param) for child in a.static.values())
+        stack.extend((x, y) for x in a_variable for y in b_variable)
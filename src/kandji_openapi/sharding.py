@@ -0,0 +1,121 @@
+"""Split the generated spec into one document per tag.
+
+Every operation goes to the shard of each of its tags (the folders of the
+collection, see `PostmanCollection._tags_to_openapi`). The components are
+written once to a shared document and the shards reference them with
+`<components file>#/components/...`, except the security schemes, which are
+copied into every shard because security requirements refer to them by name.
+Examples moved to files (see `examples`) are referenced relative to the
+document, so their `externalValue` is rebased onto the shard directory.
+
+The shards are cut from the same plain-data tree as the monolithic output
+(`OpenAPIGenerator.spec_data`), so merging them gives back its paths exactly.
+"""
+
+import re
+from typing import Any, Optional
+
+from kandji_openapi.interning import HTTP_METHODS
+
+COMPONENTS_NAME = "components"
+# Shard of operations without any tag, named like openapi-generator's DefaultApi
+UNTAGGED = "default"
+
+
+def shard_name(tag: str) -> str:
+    """File name stem of the shard of `tag`"""
+    return re.sub(r"[^a-z0-9]+", "-", tag.lower()).strip("-") or UNTAGGED
+
+
+def shard_names(tags: list[str]) -> dict[str, str]:
+    """Unique file name stem of every tag, never clashing with the components"""
+    names: dict[str, str] = {}
+    used = {COMPONENTS_NAME}
+    for tag in tags:
+        name = base = shard_name(tag)
+        suffix = 2
+        while name in used:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        names[tag] = name
+        used.add(name)
+    return names
+
+
+def _relink(
+    value: Any, components_file: str, examples: Optional[tuple[str, str]] = None
+) -> Any:
+    """Copy of `value` with local component references pointing at the file
+
+    `examples` is the (old, new) prefix of the external example files.
+    """
+    if isinstance(value, dict):
+        ref = value.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/components/"):
+            return {**value, "$ref": components_file + ref}
+        external = value.get("externalValue")
+        if examples and isinstance(external, str) and external.startswith(examples[0]):
+            return {
+                **value,
+                "externalValue": examples[1] + external[len(examples[0]) :],
+            }
+        return {
+            key: _relink(item, components_file, examples) for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_relink(item, components_file, examples) for item in value]
+    return value
+
+
+def shared_components(spec: dict[str, Any]) -> dict[str, Any]:
+    """Document holding the components of `spec` for the shards to reference"""
+    return {
+        "openapi": spec["openapi"],
+        "info": spec["info"],
+        "components": spec.get("components", {}),
+    }
+
+
+def split_spec(
+    spec: dict[str, Any],
+    components_file: str,
+    examples: Optional[tuple[str, str]] = None,
+) -> dict[str, dict[str, Any]]:
+    """One document per tag, in the order of the spec's tag list
+
+    `examples` rebases the `externalValue` of the examples from the first
+    prefix to the second, see `_relink`.
+    """
+    tags = {tag["name"]: tag for tag in spec.get("tags", [])}
+    paths: dict[str, dict[str, dict[str, Any]]] = {name: {} for name in tags}
+
+    for path, path_item in spec.get("paths", {}).items():
+        shared = {
+            key: value for key, value in path_item.items() if key not in HTTP_METHODS
+        }
+        for method, operation in path_item.items():
+            if method not in HTTP_METHODS:
+                continue
+            for tag in operation.get("tags") or [UNTAGGED]:
+                shard_paths = paths.setdefault(tag, {})
+                shard_paths.setdefault(path, dict(shared))[method] = operation
+
+    header = {
+        key: value
+        for key, value in spec.items()
+        if key not in ("paths", "components", "tags")
+    }
+    security_schemes = spec.get("components", {}).get("securitySchemes")
+
+    shards = {}
+    for tag, tag_paths in paths.items():
+        if not tag_paths:
+            continue
+        shard = dict(header)
+        shard["paths"] = _relink(tag_paths, components_file, examples)
+        if security_schemes:
+            shard["components"] = {"securitySchemes": security_schemes}
+        if tag in tags:
+            shard["tags"] = [tags[tag]]
+        shards[tag] = shard
+    return shards
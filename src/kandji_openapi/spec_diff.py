@@ -0,0 +1,334 @@
+"""Structural diff of two generated OpenAPI documents.
+
+Operations are indexed by (path, method) and components by (section, name),
+then each matching pair is compared in a single walk, so the diff is linear in
+the size of the documents (with local `$ref`s expanded where they are used, so
+moving a structure into `components` does not change its use sites). Every
+change is classified as
+
+- ``none``: a component was added or removed that is only used through
+  `$ref`s, which are compared where they are used
+
+- ``breaking``: something a generated client relies on was removed or changed
+  (an operation, parameter, property or status code removed, a type changed,
+  a parameter or property became required)
+- ``additive``: something was added without changing what exists
+- ``docs``: only documentation changed (descriptions, summaries, examples,
+  titles, external docs, the info object and tag list)
+
+The classification is conservative: a change whose effect on clients cannot
+be told from the documents alone counts as breaking.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+LEVELS = ("none", "docs", "additive", "breaking")
+
+# Object keywords that only carry documentation
+DOC_KEYS = frozenset(
+    ("description", "summary", "example", "examples", "externalDocs", "title")
+)
+# Keywords whose value maps user-chosen names to objects, so the names are not
+# keywords themselves (a property may well be called "description")
+NAMED_MAPS = frozenset(
+    (
+        "properties",
+        "patternProperties",
+        "$defs",
+        "responses",
+        "content",
+        "encoding",
+        "headers",
+        "variables",
+        "links",
+        "callbacks",
+    )
+)
+# Top-level members that only carry documentation
+DOC_MEMBERS = ("info", "tags", "externalDocs")
+
+
+@dataclass
+class Change:
+    kind: str
+    location: str
+    message: str
+
+
+@dataclass
+class SpecDiff:
+    changes: list[Change] = field(default_factory=list)
+    operations: dict[str, list[str]] = field(
+        default_factory=lambda: {"added": [], "removed": [], "changed": []}
+    )
+    components: dict[str, list[str]] = field(
+        default_factory=lambda: {"added": [], "removed": [], "changed": []}
+    )
+
+    def add(self, kind: str, location: str, message: str) -> None:
+        self.changes.append(Change(kind, location, message))
+
+    def count(self, kind: str) -> int:
+        return sum(1 for change in self.changes if change.kind == kind)
+
+    @property
+    def level(self) -> str:
+        """Most severe kind of change, or "none" """
+        kinds = {change.kind for change in self.changes}
+        return max(kinds, key=LEVELS.index, default="none")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Machine-readable summary"""
+        return {
+            "level": self.level,
+            "counts": {kind: self.count(kind) for kind in LEVELS[1:]},
+            "operations": self.operations,
+            "components": self.components,
+            "changes": [asdict(change) for change in self.changes],
+        }
+
+    def report(self, include_docs: bool = False) -> str:
+        """Human-readable summary"""
+        counts = ", ".join(f"{self.count(kind)} {kind}" for kind in LEVELS[1:])
+        lines = [f"Spec change level: {self.level} ({counts})"]
+        for change in self.changes:
+            if change.kind not in ("none", "docs") or include_docs:
+                lines.append(f"  [{change.kind}] {change.location}: {change.message}")
+        return "\n".join(lines)
+
+
+def _operations(spec: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Operations keyed by "METHOD /path" """
+    operations = {}
+    for path, path_item in spec.get("paths", {}).items():
+        for method in HTTP_METHODS:
+            if method in path_item:
+                operations[f"{method.upper()} {path}"] = path_item[method]
+    return operations
+
+
+def _components(spec: dict[str, Any]) -> dict[str, Any]:
+    """Components keyed by "components/<section>/<name>" """
+    return {
+        f"components/{section}/{name}": component
+        for section, members in spec.get("components", {}).items()
+        for name, component in members.items()
+    }
+
+
+def _union(old: Any, new: Any) -> list[Any]:
+    """Keys of both, in order of appearance, so reports are deterministic"""
+    return list(old) + [key for key in new if key not in old]
+
+
+def _ref(value: Any) -> Optional[str]:
+    if isinstance(value, dict) and isinstance(ref := value.get("$ref"), str):
+        return ref if ref.startswith("#/") else None
+    return None
+
+
+def _resolve(value: Any, spec: dict[str, Any]) -> Any:
+    """Target of a local `$ref`, or the value itself"""
+    if not (ref := _ref(value)):
+        return value
+    target: Any = spec
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if not isinstance(target, dict) or part not in target:
+            return value
+        target = target[part]
+    return target
+
+
+def _referenced(value: Any, found: set[str]) -> set[str]:
+    """Components of every local `$ref` in `value`, as "components/<section>/<name>" """
+    if isinstance(value, dict):
+        if (ref := _ref(value)) and ref.startswith("#/components/"):
+            parts = [
+                p.replace("~1", "/").replace("~0", "~") for p in ref[2:].split("/")
+            ]
+            found.add("/".join(parts[:3]))
+        for item in value.values():
+            _referenced(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _referenced(item, found)
+    return found
+
+
+def _parameter_key(parameter: Any) -> Any:
+    if isinstance(parameter, dict) and "name" in parameter:
+        return f"{parameter.get('in', '')} {parameter['name']}"
+    return parameter.get("$ref") if isinstance(parameter, dict) else None
+
+
+class _Comparer:
+    def __init__(
+        self, diff: SpecDiff, old_spec: dict[str, Any], new_spec: dict[str, Any]
+    ) -> None:
+        self.diff = diff
+        self.old_spec = old_spec
+        self.new_spec = new_spec
+        self.changed = False
+        # Reference pairs being compared, to stop on recursive schemas
+        self.active: set[tuple[Optional[str], Optional[str]]] = set()
+
+    def emit(self, kind: str, location: str, message: str) -> None:
+        self.changed = True
+        self.diff.add(kind, location, message)
+
+    def compare(self, old: Any, new: Any, location: str, named: bool = False) -> None:
+        """Compare two values; `named` marks maps of names rather than keywords"""
+        old_ref, new_ref = _ref(old), _ref(new)
+        if (old_ref or new_ref) and not named:
+            pair = (old_ref, new_ref)
+            if pair in self.active:
+                return
+            self.active.add(pair)
+            try:
+                old = _resolve(old, self.old_spec)
+                new = _resolve(new, self.new_spec)
+                if _ref(old) == old_ref and _ref(new) == new_ref:
+                    # Both unresolvable, compare the references themselves
+                    self.compare_dicts(old, new, location, named)
+                else:
+                    self.compare(old, new, location, named)
+            finally:
+                self.active.discard(pair)
+            return
+
+        if isinstance(old, dict) and isinstance(new, dict):
+            self.compare_dicts(old, new, location, named)
+        elif isinstance(old, list) and isinstance(new, list):
+            self.compare_lists(old, new, location)
+        elif old != new:
+            self.emit("breaking", location, f"changed from {old!r} to {new!r}")
+
+    def compare_dicts(
+        self, old: dict[str, Any], new: dict[str, Any], location: str, named: bool
+    ) -> None:
+        for key in _union(old, new):
+            child = f"{location}.{key}"
+            if not named and key in DOC_KEYS:
+                if old.get(key) != new.get(key):
+                    self.emit("docs", child, "documentation changed")
+            elif key not in new:
+                self.emit("breaking", child, "removed")
+            elif key not in old:
+                required = key == "required" and not named and new[key]
+                kind = "breaking" if required else "additive"
+                self.emit(kind, child, "added")
+            elif key == "required" and not named:
+                self.compare_required(old[key], new[key], child)
+            else:
+                self.compare(
+                    old[key], new[key], child, named=not named and key in NAMED_MAPS
+                )
+
+    def compare_required(self, old: Any, new: Any, location: str) -> None:
+        """`required` is a flag on parameters and a name list on schemas"""
+        if isinstance(old, list) and isinstance(new, list):
+            for name in sorted(set(new) - set(old)):
+                self.emit("breaking", location, f"{name!r} became required")
+            for name in sorted(set(old) - set(new)):
+                self.emit("additive", location, f"{name!r} became optional")
+        elif old != new:
+            kind = "breaking" if new else "additive"
+            self.emit(kind, location, f"changed from {old!r} to {new!r}")
+
+    def compare_lists(self, old: list[Any], new: list[Any], location: str) -> None:
+        old = [_resolve(item, self.old_spec) for item in old]
+        new = [_resolve(item, self.new_spec) for item in new]
+        old_keys = [_parameter_key(item) for item in old]
+        new_keys = [_parameter_key(item) for item in new]
+        if all(old_keys) and all(new_keys):
+            # Parameter lists, matched by location and name
+            old_items = dict(zip(old_keys, old))
+            new_items = dict(zip(new_keys, new))
+            for key in _union(old_items, new_items):
+                child = f"{location}[{key}]"
+                if key not in new_items:
+                    self.emit("breaking", child, "removed")
+                elif key not in old_items:
+                    required = new_items[key].get("required", False)
+                    self.emit("breaking" if required else "additive", child, "added")
+                else:
+                    self.compare(old_items[key], new_items[key], child)
+            return
+
+        if all(not isinstance(item, (dict, list)) for item in old + new):
+            # Scalar lists (enum, tags, ...) are compared as sets
+            added, removed = set(new) - set(old), set(old) - set(new)
+            if removed:
+                self.emit("breaking", location, f"removed {sorted(removed, key=str)}")
+            if added:
+                self.emit("additive", location, f"added {sorted(added, key=str)}")
+            return
+
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            self.compare(old_item, new_item, f"{location}[{index}]")
+        if len(new) < len(old):
+            self.emit("breaking", location, f"{len(old) - len(new)} items removed")
+        elif len(new) > len(old):
+            self.emit("additive", location, f"{len(new) - len(old)} items added")
+
+
+def _compare_indexed(
+    diff: SpecDiff,
+    summary: dict[str, list[str]],
+    old: dict[str, Any],
+    new: dict[str, Any],
+    specs: tuple[dict[str, Any], dict[str, Any]],
+    referenced: tuple[set[str], set[str]] = (set(), set()),
+) -> None:
+    for key in old:
+        if key not in new:
+            if key in referenced[0]:
+                diff.add("none", key, "removed, its uses are compared inline")
+            else:
+                diff.add("breaking", key, "removed")
+            summary["removed"].append(key)
+    for key, value in new.items():
+        if key not in old:
+            if key in referenced[1]:
+                diff.add("none", key, "added, its uses are compared inline")
+            else:
+                diff.add("additive", key, "added")
+            summary["added"].append(key)
+            continue
+
+        comparer = _Comparer(diff, *specs)
+        comparer.compare(old[key], value, key)
+        if comparer.changed:
+            summary["changed"].append(key)
+
+
+def _members(spec: dict[str, Any]) -> list[str]:
+    """Top-level members other than paths and components"""
+    return [key for key in spec if key not in ("paths", "components")]
+
+
+def diff_specs(old: dict[str, Any], new: dict[str, Any]) -> SpecDiff:
+    """Structural diff of two OpenAPI documents"""
+    diff = SpecDiff()
+    specs = (old, new)
+    _compare_indexed(diff, diff.operations, _operations(old), _operations(new), specs)
+    # Components moved in or out of use sites, e.g. by --intern-components
+    referenced = (_referenced(old, set()), _referenced(new, set()))
+    _compare_indexed(
+        diff, diff.components, _components(old), _components(new), specs, referenced
+    )
+
+    for key in _union(_members(old), _members(new)):
+        if key in DOC_MEMBERS:
+            if old.get(key) != new.get(key):
+                diff.add("docs", key, "documentation changed")
+        elif key not in new:
+            diff.add("breaking", key, "removed")
+        elif key not in old:
+            diff.add("additive", key, "added")
+        else:
+            _Comparer(diff, *specs).compare(old[key], new[key], key)
+    return diff
@@ -0,0 +1,152 @@
+"""Sidecar index of the generated JSON spec for lookups without loading it.
+
+The index records where the JSON of every path item starts and how long it
+is in the spec file, plus the operationId, tags and summary of every
+operation and the per-tag shard files when they were written. Looking up an
+operation reads the index and one slice of the spec:
+
+    index = SpecIndex.load(Path("openapi.index.json"))
+    operation = index.operation_by_id("listDevices")
+    operations = index.operations_by_tag("Blueprints")
+
+References to components are returned as they are written in the spec.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from kandji_openapi.files import atomic_write
+from kandji_openapi.interning import HTTP_METHODS
+
+INDEX_VERSION = 1
+
+
+def operation_key(method: str, path: str) -> str:
+    """Key of an operation in the index, "METHOD /path" """
+    return f"{method.upper()} {path}"
+
+
+@dataclass
+class SpecIndex:
+    # Path of the spec relative to the index file, and its size when indexed
+    document: str
+    size: int = 0
+    openapi: str = ""
+    title: str = ""
+    api_version: str = ""
+    # (offset, length) of every path item's JSON in the document
+    paths: dict[str, tuple[int, int]] = field(default_factory=dict)
+    # operationId, summary and tags of every operation, by operation key
+    operations: dict[str, dict[str, Any]] = field(default_factory=dict)
+    operation_ids: dict[str, str] = field(default_factory=dict)
+    tags: dict[str, list[str]] = field(default_factory=dict)
+    # Shard file of every tag, relative to the index file
+    shards: dict[str, str] = field(default_factory=dict)
+    # Directory the relative file names are resolved against
+    base: Path = field(default=Path("."), repr=False, compare=False)
+
+    def add_path(
+        self, path: str, path_item: dict[str, Any], offset: int, length: int
+    ) -> None:
+        """Record a path item written at `offset` in the document"""
+        self.paths[path] = (offset, length)
+        for method in HTTP_METHODS:
+            if not (operation := path_item.get(method)):
+                continue
+            key = operation_key(method, path)
+            entry = {
+                name: operation[name]
+                for name in ("operationId", "summary", "tags")
+                if name in operation
+            }
+            self.operations[key] = entry
+            if operation_id := entry.get("operationId"):
+                self.operation_ids[operation_id] = key
+            for tag in entry.get("tags", []):
+                self.tags.setdefault(tag, []).append(key)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "document": self.document,
+            "size": self.size,
+            "openapi": self.openapi,
+            "info": {"title": self.title, "version": self.api_version},
+            "counts": {"paths": len(self.paths), "operations": len(self.operations)},
+            "paths": {path: list(span) for path, span in self.paths.items()},
+            "operations": self.operations,
+            "operationIds": self.operation_ids,
+            "tags": self.tags,
+            "shards": self.shards,
+        }
+
+    def save(self, file_path: Path) -> None:
+        with atomic_write(file_path) as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, file_path: Path) -> "SpecIndex":
+        """Read an index file, raising `ValueError` if it is not a supported one"""
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            raise ValueError(f"{file_path} is not a version {INDEX_VERSION} index")
+
+        return cls(
+            document=data["document"],
+            size=data["size"],
+            openapi=data["openapi"],
+            title=data["info"]["title"],
+            api_version=data["info"]["version"],
+            paths={path: (span[0], span[1]) for path, span in data["paths"].items()},
+            operations=data["operations"],
+            operation_ids=data["operationIds"],
+            tags=data["tags"],
+            shards=data["shards"],
+            base=Path(file_path).parent,
+        )
+
+    @property
+    def document_path(self) -> Path:
+        return self.base / self.document
+
+    def shard_path(self, tag: str) -> Optional[Path]:
+        return self.base / self.shards[tag] if tag in self.shards else None
+
+    def _read_path_items(self, paths: list[str]) -> dict[str, Any]:
+        """Path items read from their slices of the document"""
+        items = {}
+        with open(self.document_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != self.size:
+                raise ValueError(f"{self.document_path} changed since it was indexed")
+            for path in paths:
+                offset, length = self.paths[path]
+                f.seek(offset)
+                items[path] = json.loads(f.read(length))
+        return items
+
+    def path_item(self, path: str) -> Optional[dict[str, Any]]:
+        if path not in self.paths:
+            return None
+        return self._read_path_items([path])[path]
+
+    def _read_operations(self, keys: list[str]) -> list[dict[str, Any]]:
+        split = [key.split(" ", 1) for key in keys]
+        items = self._read_path_items(list(dict.fromkeys(path for _, path in split)))
+        return [items[path][method.lower()] for method, path in split]
+
+    def operation(self, method: str, path: str) -> Optional[dict[str, Any]]:
+        key = operation_key(method, path)
+        return self._read_operations([key])[0] if key in self.operations else None
+
+    def operation_by_id(self, operation_id: str) -> Optional[dict[str, Any]]:
+        key = self.operation_ids.get(operation_id)
+        return self._read_operations([key])[0] if key else None
+
+    def operations_by_tag(self, tag: str) -> list[dict[str, Any]]:
+        """Operations of a tag, read with one pass over the document"""
+        return self._read_operations(self.tags.get(tag, []))
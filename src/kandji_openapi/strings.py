@@ -1,6 +1,12 @@
 import re
+from functools import lru_cache
 
+# Descriptions, names and examples repeat across requests and across the
+# collections of a batch, so the normalized text is kept per process
+TEXT_CACHE_SIZE = 16384
 
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
 def string_formatting(string: str) -> str:
     string = string.strip()
     string = re.sub(r"\"", "&quot;", string)
@@ -15,6 +21,7 @@ def string_formatting(string: str) -> str:
     return string
 
 
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
 def to_camel_case(input_string: str) -> str:
     # Remove any non-alphanumeric characters (optional based on needs)
     input_string = re.sub(r"[^a-zA-Z0-9\s_]", "", input_string)
@@ -0,0 +1,165 @@
+"""Lenient JSON reader for the hand-written examples in Postman collections.
+
+Example bodies are mostly valid JSON, so `loads` tries the C decoder first.
+Anything it rejects is read by a single-pass parser that also accepts
+
+- `//` line and `/* */` block comments outside of strings
+- trailing commas in objects and arrays
+- `...` or `…` placeholders standing in for omitted members or elements
+- strings delimited by typographic quotes (“ ” and ‘ ’)
+
+String contents are never rewritten, so text such as "Loading..." or
+"testuser’s MacBook" is kept as written.
+"""
+
+import json
+import re
+from json.decoder import JSONDecodeError, JSONDecoder
+from typing import Any, Callable
+
+# Characters that may close a string opened with a typographic quote
+SMART_QUOTES = {"“": "”", "”": "”", "‘": "’", "’": "’"}
+ELLIPSES = ("...", "…")
+
+# Scalars are read by the C scanner, allowing raw tabs and newlines in strings
+SCALAR_DECODER = JSONDecoder(strict=False)
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Double-quoted strings are matched first so `//` inside them is not a comment
+STRING_OR_COMMENT = re.compile(r'"(?:[^"\\\n]|\\.)*"|//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+
+def strip_comments(text: str) -> str:
+    """Remove `//` and `/* */` comments that are not inside a string"""
+    if "/" not in text:
+        return text
+    return STRING_OR_COMMENT.sub(
+        lambda match: match.group() if match.group().startswith('"') else "", text
+    )
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+
+    def error(self, message: str) -> JSONDecodeError:
+        return JSONDecodeError(message, self.text, self.pos)
+
+    def skip(self) -> None:
+        """Advance past whitespace and comments"""
+        text = self.text
+        while True:
+            if match := WHITESPACE.match(text, self.pos):
+                self.pos = match.end()
+            if text.startswith("//", self.pos):
+                end = text.find("\n", self.pos)
+                self.pos = len(text) if end == -1 else end
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                if end == -1:
+                    raise self.error("Unterminated comment")
+                self.pos = end + 2
+            else:
+                return
+
+    def skip_ellipsis(self) -> bool:
+        for ellipsis in ELLIPSES:
+            if self.text.startswith(ellipsis, self.pos):
+                self.pos += len(ellipsis)
+                return True
+        return False
+
+    def parse(self) -> Any:
+        self.skip()
+        value = self.value()
+        self.skip()
+        if self.pos != len(self.text):
+            raise self.error("Extra data")
+        return value
+
+    def value(self) -> Any:
+        text = self.text
+        if self.pos >= len(text):
+            raise self.error("Expecting value")
+
+        char = text[self.pos]
+        if char == "{":
+            return self.members()
+        if char == "[":
+            return self.elements()
+        if char in SMART_QUOTES:
+            return self.string()
+
+        try:
+            value, self.pos = SCALAR_DECODER.raw_decode(text, self.pos)
+        except JSONDecodeError:
+            raise self.error("Expecting value") from None
+        return value
+
+    def string(self) -> str:
+        char = self.text[self.pos]
+        if char == '"':
+            value, self.pos = SCALAR_DECODER.raw_decode(self.text, self.pos)
+            return value
+
+        end = self.text.find(SMART_QUOTES[char], self.pos + 1)
+        if end == -1:
+            raise self.error("Unterminated string")
+        value = self.text[self.pos + 1 : end]
+        self.pos = end + 1
+        return value
+
+    def sequence(self, close: str, item: Callable[[], None]) -> None:
+        """Parse comma separated items up to `close`, allowing placeholders"""
+        self.pos += 1
+        while True:
+            self.skip()
+            if self.text.startswith(close, self.pos):
+                self.pos += 1
+                return
+
+            if not self.skip_ellipsis():
+                item()
+
+            self.skip()
+            if self.text.startswith(",", self.pos):
+                self.pos += 1
+            elif not self.text.startswith(close, self.pos):
+                raise self.error(f"Expecting ',' or '{close}' delimiter")
+
+    def members(self) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+
+        def member() -> None:
+            if self.pos >= len(self.text) or not (
+                self.text[self.pos] == '"' or self.text[self.pos] in SMART_QUOTES
+            ):
+                raise self.error("Expecting property name enclosed in double quotes")
+            key = self.string()
+            self.skip()
+            if not self.text.startswith(":", self.pos):
+                raise self.error("Expecting ':' delimiter")
+            self.pos += 1
+            self.skip()
+            result[key] = self.value()
+
+        self.sequence("}", member)
+        return result
+
+    def elements(self) -> list[Any]:
+        result: list[Any] = []
+        self.sequence("]", lambda: result.append(self.value()))
+        return result
+
+
+def loads(text: str) -> Any:
+    """Deserialize JSON, tolerating the common mistakes of hand-written examples.
+
+    Raises `json.JSONDecodeError` if the text cannot be read even leniently.
+    """
+    try:
+        return json.loads(text)
+    except JSONDecodeError:
+        return _Parser(text).parse()
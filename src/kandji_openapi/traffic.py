@@ -0,0 +1,324 @@
+"""Validate recorded API traffic against the response schemas of the spec.
+
+Traffic is read from HAR files (`*.har`) or JSON Lines files with one record
+per line, either a HAR entry or a flat object:
+
+    {"method": "GET", "url": "/api/v1/devices", "status": 200, "body": [...]}
+
+`body` may be the parsed JSON or its text, `content_type` is optional. Both
+formats are streamed: a HAR file's entries are decoded one at a time, so
+memory stays flat regardless of the file size.
+
+Each record is mapped to its operation with `routes.RouteTrie` and its body
+is checked with the response schema compiled by `validators.SchemaCompiler`.
+With several jobs, batches of records are validated in a process pool whose
+workers compile the schemas once, and at most a few batches are in flight.
+The result is a `DriftReport` of per-operation statistics.
+"""
+
+import base64
+import json
+import os
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from kandji_openapi.interning import HTTP_METHODS
+from kandji_openapi.routes import RouteTrie
+from kandji_openapi.validators import Issue, SchemaCompiler, Validator
+
+BATCH_SIZE = 500
+CHUNK_SIZE = 1024 * 1024
+# Distinct issues kept per operation, the rest are counted as "other"
+MAX_ISSUES = 200
+UNMATCHED = "-"
+
+
+@dataclass
+class OperationDrift:
+    records: int = 0
+    drifted: int = 0
+    statuses: Counter[str] = field(default_factory=Counter)
+    # Count and first message of every "<kind> <pointer>"
+    issues: Counter[str] = field(default_factory=Counter)
+    samples: dict[str, str] = field(default_factory=dict)
+
+    def add(self, status: str, issues: list[Issue]) -> None:
+        self.records += 1
+        self.statuses[status] += 1
+        if not issues:
+            return
+        self.drifted += 1
+        for kind, pointer, message in issues:
+            self.add_issue(f"{kind} {pointer or '/'}", message, 1)
+
+    def add_issue(self, key: str, message: str, count: int) -> None:
+        if key not in self.issues and len(self.issues) >= MAX_ISSUES:
+            key, message = "other", "more distinct issues than are kept"
+        self.issues[key] += count
+        self.samples.setdefault(key, message)
+
+    def merge(self, other: "OperationDrift") -> None:
+        self.records += other.records
+        self.drifted += other.drifted
+        self.statuses.update(other.statuses)
+        for key, count in other.issues.items():
+            self.add_issue(key, other.samples.get(key, ""), count)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "records": self.records,
+            "drifted": self.drifted,
+            "statuses": dict(sorted(self.statuses.items())),
+            "issues": {
+                key: {"count": count, "sample": self.samples.get(key, "")}
+                for key, count in self.issues.most_common()
+            },
+        }
+
+
+@dataclass
+class DriftReport:
+    operations: dict[str, OperationDrift] = field(default_factory=dict)
+
+    def operation(self, name: str) -> OperationDrift:
+        if name not in self.operations:
+            self.operations[name] = OperationDrift()
+        return self.operations[name]
+
+    def merge(self, other: "DriftReport") -> None:
+        for name, drift in other.operations.items():
+            self.operation(name).merge(drift)
+
+    @property
+    def records(self) -> int:
+        return sum(drift.records for drift in self.operations.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "records": self.records,
+            "drifted": sum(drift.drifted for drift in self.operations.values()),
+            "operations": {
+                name: self.operations[name].to_dict()
+                for name in sorted(self.operations)
+            },
+        }
+
+    def report(self, top: int = 5) -> str:
+        """Human-readable summary, drifting operations first"""
+        drifted = sum(drift.drifted for drift in self.operations.values())
+        lines = [f"{self.records:,} records, {drifted:,} drifted from the spec"]
+        ranked = sorted(
+            self.operations.items(), key=lambda item: (-item[1].drifted, item[0])
+        )
+        for name, drift in ranked:
+            if not drift.drifted:
+                continue
+            lines.append(f"  {name}: {drift.drifted:,} of {drift.records:,} records")
+            for key, count in drift.issues.most_common(top):
+                lines.append(f"    {count:>8,}  {key}: {drift.samples[key]}")
+        return "\n".join(lines)
+
+
+def _status_key(responses: dict[str, Any], status: int) -> Optional[str]:
+    """Documented response that applies to `status`"""
+    for key in (str(status), f"{str(status)[0]}XX", "default"):
+        if key in responses:
+            return key
+    return None
+
+
+class TrafficValidator:
+    """Routes and compiled response schemas of a spec"""
+
+    def __init__(self, spec: dict[str, Any]) -> None:
+        self.trie = RouteTrie.from_spec(spec)
+        compiler = SchemaCompiler(spec)
+        # Response keys and the validator of each JSON body, by route
+        self.responses: dict[tuple[str, str], dict[str, Optional[Validator]]] = {}
+        for template, path_item in spec.get("paths", {}).items():
+            for method in HTTP_METHODS:
+                if not (operation := path_item.get(method)):
+                    continue
+                compiled: dict[str, Optional[Validator]] = {}
+                for key, response in operation.get("responses", {}).items():
+                    response = compiler.resolve(response)
+                    content = response.get("content", {})
+                    schemas = [
+                        media_type.get("schema")
+                        for content_type, media_type in content.items()
+                        if "json" in content_type
+                    ]
+                    compiled[key] = compiler.compile(schemas[0]) if schemas else None
+                self.responses[(method.upper(), template)] = compiled
+
+    def validate(self, entry: Any, report: DriftReport) -> None:
+        """Check one record and add it to `report`"""
+        record = _record(entry)
+        if record is None:
+            report.operation(UNMATCHED).add("?", [("record", "", "not a record")])
+            return
+        method, url, status, body, issues = record
+
+        route = self.trie.match(method, url)
+        if route is None:
+            report.operation(UNMATCHED).add(str(status), [])
+            return
+
+        responses = self.responses[(route.method, route.template)]
+        key = _status_key(responses, status)
+        if key is None:
+            issues.append(("status", "", f"{status} is not documented"))
+        elif (validator := responses[key]) and body is not None:
+            validator(body, "", issues)
+        report.operation(route.operation_id or route.template).add(str(status), issues)
+
+
+def _record(entry: Any) -> Optional[tuple[str, str, int, Any, list[Issue]]]:
+    """(method, url, status, parsed body, issues) of a HAR entry or flat record"""
+    if isinstance(entry, (str, bytes)):
+        try:
+            entry = json.loads(entry)
+        except ValueError:
+            return None
+    if not isinstance(entry, dict):
+        return None
+
+    issues: list[Issue] = []
+    if isinstance(request := entry.get("request"), dict):
+        response = entry.get("response") or {}
+        content = response.get("content") or {}
+        method, url = request.get("method"), request.get("url")
+        status, text = response.get("status"), content.get("text")
+        content_type = content.get("mimeType") or ""
+        if text and content.get("encoding") == "base64":
+            text = base64.b64decode(text).decode("utf-8", "replace")
+        body: Any = None
+        if text and "json" in content_type:
+            try:
+                body = json.loads(text)
+            except ValueError:
+                issues.append(("content", "", "body is not valid JSON"))
+    else:
+        method, url = entry.get("method"), entry.get("url") or entry.get("path")
+        status, body = entry.get("status"), entry.get("body")
+        content_type = entry.get("content_type") or "application/json"
+        if isinstance(body, str) and "json" in content_type:
+            try:
+                body = json.loads(body)
+            except ValueError:
+                issues.append(("content", "", "body is not valid JSON"))
+                body = None
+
+    if not isinstance(method, str) or not isinstance(url, str):
+        return None
+    if not isinstance(status, int):
+        return None
+    return method, url, status, body, issues
+
+
+def iter_har_entries(path: Path) -> Iterator[Any]:
+    """Entries of a HAR file, decoded one at a time"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        start = -1
+        while start < 0:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            buffer += chunk
+            if (key := buffer.find('"entries"')) >= 0:
+                start = buffer.find("[", key)
+        position = start + 1
+        eof = False
+
+        while True:
+            # Skip the separators, reading more when the buffer runs out
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer) or buffer[position] != "]":
+                try:
+                    entry, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    chunk = f.read(CHUNK_SIZE)
+                    eof = not chunk
+                    # Drop what was consumed so only one entry is buffered
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+                yield entry
+                position = end
+            else:
+                return
+
+
+def iter_records(path: Path) -> Iterator[Any]:
+    """Records of a traffic file, JSON Lines left undecoded for the workers"""
+    if path.suffix.lower() == ".har":
+        yield from iter_har_entries(path)
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+_worker: Optional[TrafficValidator] = None
+
+
+def _init_worker(spec: dict[str, Any]) -> None:
+    global _worker
+    _worker = TrafficValidator(spec)
+
+
+def _validate_batch(batch: list[Any]) -> DriftReport:
+    """Process pool entry point, validates one batch with the worker's schemas"""
+    assert _worker is not None
+    report = DriftReport()
+    for entry in batch:
+        _worker.validate(entry, report)
+    return report
+
+
+def _batches(records: Iterable[Any]) -> Iterator[list[Any]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validate_traffic(
+    spec: dict[str, Any], paths: list[Path], jobs: Optional[int] = None
+) -> DriftReport:
+    """Drift statistics of the records in `paths` against `spec`"""
+    jobs = jobs or os.cpu_count() or 1
+    records = (record for path in paths for record in iter_records(path))
+    report = DriftReport()
+
+    if jobs == 1:
+        validator = TrafficValidator(spec)
+        for record in records:
+            validator.validate(record, report)
+        return report
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(spec,)
+    ) as pool:
+        pending: list[Future[DriftReport]] = []
+        for batch in _batches(records):
+            pending.append(pool.submit(_validate_batch, batch))
+            # Bounded, so a huge file is never read far ahead of the workers
+            if len(pending) >= 2 * jobs:
+                report.merge(pending.pop(0).result())
+        for future in pending:
+            report.merge(future.result())
+    return report
@@ -0,0 +1,213 @@
+"""Compile the JSON schemas of the generated spec into validator callables.
+
+A schema is translated once into nested closures, one per keyword, so
+checking a value only runs the checks the schema has. Supported keywords are
+the ones the generator writes and the common structural ones: `type`,
+`properties`, `required`, `additionalProperties`, `items`, `enum`, `allOf`,
+`anyOf`, `oneOf` and local `$ref`s.
+
+Validators report drift rather than stopping at the first error: every
+problem is appended to a list as `(kind, pointer, message)`, where the
+pointer has array indices replaced by `*` so problems aggregate across
+records. The kinds are
+
+- ``type``: the value has another type, or matches none of `anyOf`/`oneOf`
+- ``enum``: the value is not one of the documented values
+- ``missing``: a required property is absent
+- ``undocumented``: an object has a property its schema does not list
+"""
+
+from typing import Any, Callable, Optional
+
+Issue = tuple[str, str, str]
+Validator = Callable[[Any, str, list[Issue]], None]
+
+# Python types `json.loads` produces for every JSON type
+JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,),
+    "null": (type(None),),
+}
+
+
+def json_type(value: Any) -> str:
+    """JSON type name of a parsed value"""
+    for name, types in JSON_TYPES.items():
+        if type(value) in types:
+            return name
+    return type(value).__name__
+
+
+def _accept(value: Any, pointer: str, issues: list[Issue]) -> None:
+    pass
+
+
+class SchemaCompiler:
+    """Compiles schemas of one document, sharing the validators of `$ref`s"""
+
+    def __init__(self, document: dict[str, Any]) -> None:
+        self.document = document
+        self.refs: dict[str, Validator] = {}
+
+    def compile(self, schema: Any) -> Validator:
+        if not isinstance(schema, dict) or not schema:
+            return _accept
+        if isinstance(ref := schema.get("$ref"), str):
+            return self._ref(ref)
+
+        checks = [
+            check
+            for check in (
+                self._type(schema.get("type")),
+                self._enum(schema.get("enum")),
+                self._object(schema),
+                self._items(schema.get("items")),
+                self._combined(schema),
+            )
+            if check
+        ]
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+
+        def validate(value: Any, pointer: str, issues: list[Issue]) -> None:
+            for check in checks:
+                check(value, pointer, issues)
+
+        return validate
+
+    def _ref(self, ref: str) -> Validator:
+        if ref in self.refs:
+            return self.refs[ref]
+
+        # Registered before compiling the target, so recursive schemas terminate
+        compiled: list[Validator] = []
+
+        def validate(value: Any, pointer: str, issues: list[Issue]) -> None:
+            compiled[0](value, pointer, issues)
+
+        self.refs[ref] = validate
+        compiled.append(self.compile(self.resolve({"$ref": ref})))
+        return validate
+
+    def resolve(self, value: Any) -> Any:
+        """Target of a local `$ref` (an empty schema if it is missing), or `value`"""
+        if not isinstance(value, dict) or not isinstance(ref := value.get("$ref"), str):
+            return value
+        target: Any = self.document if ref.startswith("#/") else None
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            target = target.get(part) if isinstance(target, dict) else None
+        return target if isinstance(target, dict) else {}
+
+    def _type(self, types: Any) -> Optional[Validator]:
+        names = [types] if isinstance(types, str) else types
+        if not isinstance(names, list):
+            return None
+        # Exact types, a bool is not an integer in JSON
+        allowed = frozenset(
+            python_type for name in names for python_type in JSON_TYPES.get(name, ())
+        )
+        if not allowed:
+            return None
+        expected = " or ".join(names)
+
+        def validate(value: Any, pointer: str, issues: list[Issue]) -> None:
+            if type(value) not in allowed:
+                message = f"expected {expected}, got {json_type(value)}"
+                issues.append(("type", pointer, message))
+
+        return validate
+
+    def _enum(self, values: Any) -> Optional[Validator]:
+        if not isinstance(values, list):
+            return None
+
+        def validate(value: Any, pointer: str, issues: list[Issue]) -> None:
+            # `in` would treat True as 1
+            if not any(value == item and type(value) is type(item) for item in values):
+                issues.append(("enum", pointer, f"{value!r} is not documented"))
+
+        return validate
+
+    def _object(self, schema: dict[str, Any]) -> Optional[Validator]:
+        properties = schema.get("properties")
+        required = schema.get("required")
+        additional = schema.get("additionalProperties")
+        if properties is None and required is None and additional is None:
+            return None
+
+        validators = {
+            name: self.compile(value) for name, value in (properties or {}).items()
+        }
+        required = [name for name in required or [] if isinstance(name, str)]
+        # Absent additionalProperties allows anything, which is still drift
+        extra = self.compile(additional) if isinstance(additional, dict) else None
+
+        def validate(value: Any, pointer: str, issues: list[Issue]) -> None:
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    issues.append(("missing", f"{pointer}/{name}", "required"))
+            for name, item in value.items():
+                if validator := validators.get(name):
+                    validator(item, f"{pointer}/{name}", issues)
+                elif extra:
+                    extra(item, f"{pointer}/{name}", issues)
+                elif additional is not True:
+                    issues.append(("undocumented", f"{pointer}/{name}", "not listed"))
+
+        return validate
+
+    def _items(self, items: Any) -> Optional[Validator]:
+        if not isinstance(items, dict):
+            return None
+        validator = self.compile(items)
+
+        def validate(value: Any, pointer: str, issues: list[Issue]) -> None:
+            if isinstance(value, list):
+                for item in value:
+                    validator(item, f"{pointer}/*", issues)
+
+        return validate
+
+    def _combined(self, schema: dict[str, Any]) -> Optional[Validator]:
+        checks: list[Validator] = []
+        if all_of := schema.get("allOf"):
+            checks.extend(self.compile(item) for item in all_of)
+
+        for keyword in ("anyOf", "oneOf"):
+            if not (options := schema.get(keyword)):
+                continue
+            validators = [self.compile(item) for item in options]
+
+            def validate(
+                value: Any,
+                pointer: str,
+                issues: list[Issue],
+                validators: list[Validator] = validators,
+                keyword: str = keyword,
+            ) -> None:
+                for validator in validators:
+                    found: list[Issue] = []
+                    validator(value, pointer, found)
+                    if not found:
+                        return
+                issues.append(("type", pointer, f"matches none of {keyword}"))
+
+            checks.append(validate)
+
+        if not checks:
+            return None
+
+        def validate_all(value: Any, pointer: str, issues: list[Issue]) -> None:
+            for check in checks:
+                check(value, pointer, issues)
+
+        return validate_all
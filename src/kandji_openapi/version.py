@@ -0,0 +1,26 @@
+import hashlib
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+
+@cache
+def generator_version() -> str:
+    """Package version plus a fingerprint of the generator's own source code.
+
+    Anything derived from the generator's output (conversion caches, run
+    manifests) is keyed by this value so that editing the code invalidates it
+    even when the package version has not been bumped.
+    """
+    try:
+        package_version = version("kandji-openapi")
+    except PackageNotFoundError:
+        package_version = "0.0.0"
+
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).parent
+    for source in sorted(package_dir.rglob("*.py")):
+        digest.update(source.relative_to(package_dir).as_posix().encode())
+        digest.update(source.read_bytes())
+
+    return f"{package_version}+{digest.hexdigest()[:12]}"
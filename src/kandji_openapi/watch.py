@@ -0,0 +1,135 @@
+"""Regenerate the outputs whenever the collection file changes.
+
+The converted operations of every request are kept in memory, keyed by the
+digest of the request's raw JSON (`PostmanItem.digest`). After a change the
+collection is parsed again, which is cheap, and only the requests whose JSON
+differs from any seen before are converted; everything else comes from memory.
+"""
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from kandji_openapi.cache import ConversionCache
+from kandji_openapi.examples import ExampleLimits
+from kandji_openapi.files import sha256_file
+from kandji_openapi.models.postman_collection import PostmanCollection
+from kandji_openapi.openapi_generator import OpenAPIGenerator
+from kandji_openapi.parser import PostmanParser
+
+
+@dataclass
+class Watcher:
+    collection_path: Path
+    output_json: Optional[Path]
+    output_yaml: Optional[Path]
+    yaml_engine: str = "ruamel"
+    intern_schemas: bool = False
+    intern_components: bool = False
+    fast_build: bool = False
+    shard_dir: Optional[Path] = None
+    index_path: Optional[Path] = None
+    examples: Optional[ExampleLimits] = None
+    minify: bool = False
+    compressions: list[str] = field(default_factory=list)
+    interval: float = 0.5
+    cache: ConversionCache = field(default_factory=ConversionCache)
+    # (mtime, size) and content hash of the last collection that was read
+    stat: Optional[tuple[int, int]] = None
+    collection_hash: Optional[str] = None
+
+    def changed(self) -> bool:
+        """Whether the collection file differs from the one last converted"""
+        try:
+            stat = self.collection_path.stat()
+        except FileNotFoundError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == self.stat:
+            return False
+        self.stat = (stat.st_mtime_ns, stat.st_size)
+
+        # Saving without edits only touches the file
+        try:
+            collection_hash = sha256_file(self.collection_path)
+        except OSError:
+            # Replaced while being read, look again on the next poll
+            self.stat = None
+            return False
+        if collection_hash == self.collection_hash:
+            return False
+        self.collection_hash = collection_hash
+        return True
+
+    def rebuild(self) -> None:
+        """Convert the collection, reusing every unchanged request
+
+        A collection that cannot be read, converted or written is reported
+        and the outputs of the last good build are left in place.
+        """
+        start = time.perf_counter()
+        misses = self.cache.misses
+        try:
+            collection = PostmanParser.from_file(str(self.collection_path)).parse()
+        except OSError as e:
+            # Replaced while being read, e.g. by an editor's atomic save
+            print(f"Could not read {self.collection_path}: {e}")
+            self.stat = self.collection_hash = None
+            return
+        except Exception as e:
+            # Most likely saved halfway through an edit, wait for the next save
+            print(f"Could not read {self.collection_path}: {type(e).__name__}: {e}")
+            return
+
+        try:
+            self.write(collection)
+        except Exception as e:
+            print(
+                f"Could not regenerate from {self.collection_path}: "
+                f"{type(e).__name__}: {e}"
+            )
+            return
+
+        leaves = collection.index.leaves
+        self.cache.retain({leaf.digest for leaf in leaves})
+        print(
+            f"Regenerated in {time.perf_counter() - start:.2f}s, "
+            f"{self.cache.misses - misses} of {len(leaves)} requests converted"
+        )
+
+    def write(self, collection: PostmanCollection) -> None:
+        """Convert the collection and write every output"""
+        generator = OpenAPIGenerator(
+            collection,
+            yaml_engine=self.yaml_engine,
+            cache=self.cache,
+            intern_schemas=self.intern_schemas,
+            intern_components=self.intern_components,
+            fast_build=self.fast_build,
+            examples=self.examples,
+            minify=self.minify,
+            compressions=self.compressions,
+        )
+        generator.write(self.output_json, self.output_yaml)
+        generator.write_examples()
+        if self.shard_dir:
+            generator.write_shards(
+                self.shard_dir,
+                json_format=bool(self.output_json),
+                yaml_format=bool(self.output_yaml),
+            )
+        if self.index_path:
+            generator.write_index(self.index_path)
+
+    def run(self) -> None:
+        """Poll the collection until interrupted"""
+        print(f"Watching {self.collection_path} for changes (Ctrl+C to stop)")
+        try:
+            while True:
+                if self.changed():
+                    self.rebuild()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.cache.close()
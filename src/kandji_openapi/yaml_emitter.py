@@ -0,0 +1,648 @@
+"""Streaming YAML emitter for the plain-data tree of an OpenAPI document.
+
+ruamel's pure-Python dumper builds a node graph, resolves and serializes it into
+events and then feeds those events through a general purpose state machine. An
+OpenAPI document only ever contains mappings with string keys, sequences and
+JSON scalars, so this emitter walks the tree directly and writes the same bytes
+that ``YAML(typ="safe", pure=True)`` produces with the settings used by
+``OpenAPIGenerator.to_yaml`` (block style, explicit document start, unicode
+allowed, 80 column width, two space indent and sorted mapping keys).
+
+The scalar analysis and the quoted/plain writers mirror ruamel's ``Emitter``
+(including its folding rules) so any change in style selection is a bug here.
+"""
+
+import re
+from operator import itemgetter
+from typing import Any, Optional, TextIO
+
+BEST_WIDTH = 80
+BEST_INDENT = 2
+MAX_SIMPLE_KEY_LENGTH = 128
+
+STR_TAG = "str"
+
+# YAML 1.2 implicit resolvers, in ruamel's registration order
+_IMPLICIT_RESOLVERS: list[tuple[str, re.Pattern[str], list[str]]] = [
+    (
+        "bool",
+        re.compile(r"""^(?:true|True|TRUE|false|False|FALSE)$""", re.X),
+        list("tTfF"),
+    ),
+    (
+        "float",
+        re.compile(
+            r"""^(?:
+         [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?
+        |[-+]?\.(?:inf|Inf|INF)
+        |\.(?:nan|NaN|NAN))$""",
+            re.X,
+        ),
+        list("-+0123456789."),
+    ),
+    (
+        "int",
+        re.compile(
+            r"""^(?:[-+]?0b[0-1_]+
+        |[-+]?0o?[0-7_]+
+        |[-+]?[0-9_]+
+        |[-+]?0x[0-9a-fA-F_]+)$""",
+            re.X,
+        ),
+        list("-+0123456789"),
+    ),
+    ("merge", re.compile(r"^(?:<<)$"), ["<"]),
+    (
+        "null",
+        re.compile(
+            r"""^(?: ~
+        |null|Null|NULL
+        | )$""",
+            re.X,
+        ),
+        ["~", "n", "N", ""],
+    ),
+    (
+        "timestamp",
+        re.compile(
+            r"""^(?:[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]
+        |[0-9][0-9][0-9][0-9] -[0-9][0-9]? -[0-9][0-9]?
+        (?:[Tt]|[ \t]+)[0-9][0-9]?
+        :[0-9][0-9] :[0-9][0-9] (?:\.[0-9]*)?
+        (?:[ \t]*(?:Z|[-+][0-9][0-9]?(?::[0-9][0-9])?))?)$""",
+            re.X,
+        ),
+        list("0123456789"),
+    ),
+    ("value", re.compile(r"^(?:=)$"), ["="]),
+    ("yaml", re.compile(r"^(?:!|&|\*)$"), list("!&*")),
+]
+
+_RESOLVERS_BY_FIRST_CHAR: dict[str, list[tuple[str, re.Pattern[str]]]] = {}
+for _tag, _regexp, _first in _IMPLICIT_RESOLVERS:
+    for _ch in _first:
+        _RESOLVERS_BY_FIRST_CHAR.setdefault(_ch, []).append((_tag, _regexp))
+
+# Strings made only of these characters, not starting with an indicator, can
+# never need quoting or special handling, so the per-character analysis is skipped
+_SIMPLE_PLAIN = re.compile(r"[A-Za-z0-9_/(][A-Za-z0-9_/() .=+;$~^-]*")
+
+_BREAKS = "\n\x85\u2028\u2029"
+_WHITESPACE = "\0 \t\r\n\x85\u2028\u2029"
+
+ESCAPE_REPLACEMENTS = {
+    "\0": "0",
+    "\x07": "a",
+    "\x08": "b",
+    "\x09": "t",
+    "\x0a": "n",
+    "\x0b": "v",
+    "\x0c": "f",
+    "\x0d": "r",
+    "\x1b": "e",
+    '"': '"',
+    "\\": "\\",
+    "\x85": "N",
+    "\xa0": "_",
+    "\u2028": "L",
+    "\u2029": "P",
+}
+
+
+def resolve(value: str) -> str:
+    """Return the tag a plain scalar with this text would be loaded as"""
+    for tag, regexp in _RESOLVERS_BY_FIRST_CHAR.get(value[:1], []):
+        if regexp.match(value):
+            return tag
+    return STR_TAG
+
+
+class ScalarAnalysis:
+    __slots__ = (
+        "empty",
+        "multiline",
+        "allow_block_plain",
+        "allow_single_quoted",
+        "allow_double_quoted",
+    )
+
+    def __init__(
+        self,
+        empty: bool,
+        multiline: bool,
+        allow_block_plain: bool,
+        allow_single_quoted: bool,
+        allow_double_quoted: bool,
+    ) -> None:
+        self.empty = empty
+        self.multiline = multiline
+        self.allow_block_plain = allow_block_plain
+        self.allow_single_quoted = allow_single_quoted
+        self.allow_double_quoted = allow_double_quoted
+
+
+_SIMPLE_ANALYSIS = ScalarAnalysis(False, False, True, True, True)
+_EMPTY_ANALYSIS = ScalarAnalysis(True, False, True, True, True)
+
+
+def analyze_scalar(scalar: str) -> ScalarAnalysis:
+    """Decide which scalar styles can represent `scalar` (block context only)"""
+    if not scalar:
+        return _EMPTY_ANALYSIS
+    if _SIMPLE_PLAIN.fullmatch(scalar) and not scalar.endswith(" "):
+        return _SIMPLE_ANALYSIS
+
+    block_indicators = False
+    line_breaks = False
+    special_characters = False
+
+    leading_space = False
+    leading_break = False
+    trailing_space = False
+    trailing_break = False
+    break_space = False
+    space_break = False
+
+    if scalar.startswith("---") or scalar.startswith("..."):
+        block_indicators = True
+
+    preceded_by_whitespace = True
+    followed_by_whitespace = len(scalar) == 1 or scalar[1] in _WHITESPACE
+    previous_space = False
+    previous_break = False
+
+    length = len(scalar)
+    for index, ch in enumerate(scalar):
+        if index == 0:
+            if ch in "#,[]{}&*!|>'\"%@`":
+                block_indicators = True
+            if ch in "?:" and followed_by_whitespace:
+                block_indicators = True
+            if ch == "-" and followed_by_whitespace:
+                block_indicators = True
+        else:
+            if ch == ":" and followed_by_whitespace:
+                block_indicators = True
+            if ch == "#" and preceded_by_whitespace:
+                block_indicators = True
+
+        if ch in _BREAKS:
+            line_breaks = True
+        if not (ch == "\n" or "\x20" <= ch <= "\x7e"):
+            if not (
+                (
+                    ch == "\x85"
+                    or "\xa0" <= ch <= "\ud7ff"
+                    or "\ue000" <= ch <= "\ufffd"
+                    or "\U00010000" <= ch <= "\U0010ffff"
+                )
+                and ch != "\ufeff"
+            ):
+                special_characters = True
+
+        if ch == " ":
+            if index == 0:
+                leading_space = True
+            if index == length - 1:
+                trailing_space = True
+            if previous_break:
+                break_space = True
+            previous_space = True
+            previous_break = False
+        elif ch in _BREAKS:
+            if index == 0:
+                leading_break = True
+            if index == length - 1:
+                trailing_break = True
+            if previous_space:
+                space_break = True
+            previous_space = False
+            previous_break = True
+        else:
+            previous_space = False
+            previous_break = False
+
+        preceded_by_whitespace = ch in _WHITESPACE
+        followed_by_whitespace = index + 2 >= length or scalar[index + 2] in _WHITESPACE
+
+    allow_block_plain = True
+    allow_single_quoted = True
+
+    if leading_space or leading_break or trailing_space or trailing_break:
+        allow_block_plain = False
+    if break_space:
+        allow_block_plain = allow_single_quoted = False
+    if special_characters or space_break:
+        allow_block_plain = allow_single_quoted = False
+    if line_breaks:
+        allow_block_plain = False
+    if block_indicators:
+        allow_block_plain = False
+
+    return ScalarAnalysis(
+        False, line_breaks, allow_block_plain, allow_single_quoted, True
+    )
+
+
+class YAMLEmitter:
+    """Write a JSON-compatible tree as a single explicit-start YAML document"""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self._chunks: list[str] = []
+        self.indent: Optional[int] = None
+        self.indents: list[tuple[Optional[int], Optional[bool]]] = []
+        self.column = 0
+        self.whitespace = True
+        self.indention = True
+        self.no_newline = False
+        self.sequence_context = False
+        self.mapping_context = False
+        self.simple_key_context = False
+
+    def dump(self, data: Any) -> None:
+        """Emit `data` as a YAML document and flush it to the stream"""
+        if not isinstance(data, (dict, list)):
+            raise TypeError("The document root must be a mapping or a sequence")
+        self.write_indent()
+        self.write_indicator("---", True)
+        self.expect_node(data)
+        self.indent = None
+        self.write_indent()
+        self.stream.write("".join(self._chunks))
+        self._chunks = []
+
+    # Nodes
+
+    def expect_node(
+        self,
+        data: Any,
+        sequence: bool = False,
+        mapping: bool = False,
+        simple_key: bool = False,
+    ) -> None:
+        self.sequence_context = sequence
+        self.mapping_context = mapping
+        self.simple_key_context = simple_key
+        if isinstance(data, dict):
+            if data:
+                self.expect_block_mapping(data)
+            else:
+                self.expect_empty_flow_collection("{", "}")
+        elif isinstance(data, list):
+            if data:
+                self.expect_block_sequence(data)
+            else:
+                self.expect_empty_flow_collection("[", "]")
+        else:
+            self.expect_scalar(data)
+
+    def expect_block_mapping(self, data: dict[Any, Any]) -> None:
+        self.increase_indent(sequence=False)
+        try:
+            items = sorted(data.items(), key=itemgetter(0))
+        except TypeError:
+            items = list(data.items())
+
+        for key, value in items:
+            self.write_indent()
+            text, tag = self.represent_scalar(key)
+            analysis = analyze_scalar(text)
+            # ruamel counts the shorthand tag (e.g. "!!str") towards the key length
+            key_length = len(text) + len("!!" + tag)
+            if key_length < MAX_SIMPLE_KEY_LENGTH and not analysis.multiline:
+                self.sequence_context = False
+                self.mapping_context = True
+                self.simple_key_context = True
+                self.expect_scalar(key, text, tag, analysis)
+                self.write_indicator(":", False)
+            else:
+                self.write_indicator("?", True, indention=True)
+                self.expect_node(key, mapping=True)
+                self.write_indent()
+                self.write_indicator(":", True, indention=True)
+            self.expect_node(value, mapping=True)
+
+        self.indent = self.pop_indent()
+
+    def expect_block_sequence(self, data: list[Any]) -> None:
+        indentless = self.mapping_context and not self.indention
+        self.increase_indent(sequence=True, indentless=indentless)
+        if len(self.indents) > 1 and self.indents[-2][1] and self.indents[-1][1]:
+            self.indention = True
+            self.no_newline = False
+
+        for item in data:
+            nonl = self.no_newline if self.column == 0 else False
+            self.write_indent()
+            self.write_indicator("-", True, indention=True)
+            if nonl:
+                self.no_newline = True
+            self.expect_node(item, sequence=True)
+
+        self.indent = self.pop_indent()
+        self.no_newline = False
+
+    def expect_empty_flow_collection(self, start: str, end: str) -> None:
+        self.write_indicator(start, True, whitespace=True)
+        self.increase_indent(flow=True, sequence=start == "[")
+        self.indent = self.pop_indent()
+        self.write_indicator(end, False)
+        self.write_line_break()
+
+    def expect_scalar(
+        self,
+        data: Any,
+        text: Optional[str] = None,
+        tag: Optional[str] = None,
+        analysis: Optional[ScalarAnalysis] = None,
+    ) -> None:
+        if text is None or tag is None:
+            text, tag = self.represent_scalar(data)
+        if analysis is None:
+            analysis = analyze_scalar(text)
+
+        self.increase_indent(flow=True)
+        style = self.choose_scalar_style(text, tag, analysis)
+        split = not self.simple_key_context
+        if self.sequence_context:
+            self.write_indent()
+        if style == '"':
+            self.write_double_quoted(text, split)
+        elif style == "'":
+            self.write_single_quoted(text, split)
+        else:
+            self.write_plain(text, split)
+        self.indent = self.pop_indent()
+
+    # Scalars
+
+    @staticmethod
+    def represent_scalar(data: Any) -> tuple[str, str]:
+        """Return the text and tag ruamel's SafeRepresenter uses for `data`"""
+        if isinstance(data, str):
+            return data, STR_TAG
+        if data is None:
+            return "null", "null"
+        if isinstance(data, bool):
+            return ("true" if data else "false"), "bool"
+        if isinstance(data, int):
+            return str(data), "int"
+        if isinstance(data, float):
+            if data != data:
+                return ".nan", "float"
+            if data == float("inf"):
+                return ".inf", "float"
+            if data == float("-inf"):
+                return "-.inf", "float"
+            return repr(data).lower(), "float"
+        raise TypeError(f"Cannot represent {type(data).__name__} as YAML: {data!r}")
+
+    def choose_scalar_style(self, text: str, tag: str, analysis: ScalarAnalysis) -> str:
+        if resolve(text) == tag:
+            if (
+                not (self.simple_key_context and (analysis.empty or analysis.multiline))
+                and analysis.allow_block_plain
+            ):
+                return ""
+        if tag != STR_TAG:
+            raise ValueError(f"Scalar {text!r} would need an explicit !!{tag} tag")
+        if analysis.allow_double_quoted and ("'" in text or "\n" in text):
+            return '"'
+        if analysis.allow_single_quoted and not (
+            self.simple_key_context and analysis.multiline
+        ):
+            return "'"
+        return '"'
+
+    # Indentation
+
+    def increase_indent(
+        self,
+        flow: bool = False,
+        sequence: Optional[bool] = None,
+        indentless: bool = False,
+    ) -> None:
+        self.indents.append((self.indent, sequence))
+        if self.indent is None:
+            self.indent = None if flow else 0
+        elif not indentless:
+            self.indent += BEST_INDENT
+
+    def pop_indent(self) -> Optional[int]:
+        return self.indents.pop()[0]
+
+    # Writers
+
+    def write(self, data: str) -> None:
+        self._chunks.append(data)
+        if len(self._chunks) > 4096:
+            self.stream.write("".join(self._chunks))
+            self._chunks = []
+
+    def write_indicator(
+        self,
+        indicator: str,
+        need_whitespace: bool,
+        whitespace: bool = False,
+        indention: bool = False,
+    ) -> None:
+        if self.whitespace or not need_whitespace:
+            data = indicator
+        else:
+            data = " " + indicator
+        self.whitespace = whitespace
+        self.indention = self.indention and indention
+        self.column += len(data)
+        self.write(data)
+
+    def write_indent(self) -> None:
+        indent = self.indent or 0
+        if (
+            not self.indention
+            or self.column > indent
+            or (self.column == indent and not self.whitespace)
+        ):
+            if self.no_newline:
+                self.no_newline = False
+            else:
+                self.write_line_break()
+        if self.column < indent:
+            self.whitespace = True
+            self.write(" " * (indent - self.column))
+            self.column = indent
+
+    def write_line_break(self, data: str = "\n") -> None:
+        self.whitespace = True
+        self.indention = True
+        self.column = 0
+        self.write(data)
+
+    def write_plain(self, text: str, split: bool = True) -> None:
+        if not text:
+            return
+        if not self.whitespace:
+            self.column += 1
+            self.write(" ")
+        self.whitespace = False
+        self.indention = False
+
+        # Nothing can fold or be pushed to its own line when the text fits
+        if len(text) <= BEST_WIDTH and (
+            not split or self.column + len(text) <= BEST_WIDTH
+        ):
+            self.column += len(text)
+            self.write(text)
+            return
+
+        # Plain scalars never contain line breaks, so only spaces are folded
+        spaces = False
+        start = end = 0
+        while end <= len(text):
+            ch = text[end] if end < len(text) else None
+            if spaces:
+                if ch != " ":
+                    if start + 1 == end and self.column > BEST_WIDTH and split:
+                        self.write_indent()
+                        self.whitespace = False
+                        self.indention = False
+                    else:
+                        data = text[start:end]
+                        self.column += len(data)
+                        self.write(data)
+                    start = end
+            elif ch is None or ch == " ":
+                data = text[start:end]
+                if (
+                    len(data) > BEST_WIDTH
+                    and self.indent is not None
+                    and self.column > self.indent
+                ):
+                    self.write_indent()
+                self.column += len(data)
+                self.write(data)
+                start = end
+            if ch is not None:
+                spaces = ch == " "
+            end += 1
+
+    def write_single_quoted(self, text: str, split: bool = True) -> None:
+        self.write_indicator("'", True)
+        spaces = False
+        breaks = False
+        start = end = 0
+        while end <= len(text):
+            ch = text[end] if end < len(text) else None
+            if spaces:
+                if ch is None or ch != " ":
+                    if (
+                        start + 1 == end
+                        and self.column > BEST_WIDTH
+                        and split
+                        and start != 0
+                        and end != len(text)
+                    ):
+                        self.write_indent()
+                    else:
+                        data = text[start:end]
+                        self.column += len(data)
+                        self.write(data)
+                    start = end
+            elif breaks:
+                if ch is None or ch not in _BREAKS:
+                    if text[start] == "\n":
+                        self.write_line_break()
+                    for br in text[start:end]:
+                        self.write_line_break(br)
+                    self.write_indent()
+                    start = end
+            elif ch is None or ch in " \n\x85\u2028\u2029" or ch == "'":
+                if start < end:
+                    data = text[start:end]
+                    self.column += len(data)
+                    self.write(data)
+                    start = end
+            if ch == "'":
+                self.column += 2
+                self.write("''")
+                start = end + 1
+            if ch is not None:
+                spaces = ch == " "
+                breaks = ch in _BREAKS
+            end += 1
+        self.write_indicator("'", False)
+
+    def write_double_quoted(self, text: str, split: bool = True) -> None:
+        self.write_indicator('"', True)
+        start = end = 0
+        length = len(text)
+        while end <= length:
+            ch = text[end] if end < length else None
+            if (
+                ch is None
+                or ch in '"\\\x85\u2028\u2029\ufeff'
+                or not (
+                    "\x20" <= ch <= "\x7e"
+                    or "\xa0" <= ch <= "\ud7ff"
+                    or "\ue000" <= ch <= "\ufffd"
+                    or "\U00010000" <= ch <= "\U0010ffff"
+                )
+            ):
+                if start < end:
+                    data = text[start:end]
+                    self.column += len(data)
+                    self.write(data)
+                    start = end
+                if ch is not None:
+                    if ch in ESCAPE_REPLACEMENTS:
+                        data = "\\" + ESCAPE_REPLACEMENTS[ch]
+                    elif ch <= "\xff":
+                        data = "\\x%02X" % ord(ch)
+                    elif ch <= "\uffff":
+                        data = "\\u%04X" % ord(ch)
+                    else:
+                        data = "\\U%08X" % ord(ch)
+                    self.column += len(data)
+                    self.write(data)
+                    start = end + 1
+            if (
+                0 < end < length - 1
+                and (ch == " " or start >= end)
+                and self.column + (end - start) > BEST_WIDTH
+                and split
+            ):
+                need_backslash = True
+                try:
+                    space_pos = text.index(" ", end)
+                    if (
+                        '"' not in text[end:space_pos]
+                        and "'" not in text[end:space_pos]
+                        and text[space_pos + 1] != " "
+                        and text[end - 1 : end + 1] != "  "
+                    ):
+                        need_backslash = False
+                except (ValueError, IndexError):
+                    pass
+                data = text[start:end] + ("\\" if need_backslash else "")
+                if start < end:
+                    start = end
+                self.column += len(data)
+                self.write(data)
+                self.write_indent()
+                self.whitespace = False
+                self.indention = False
+                if text[start] == " ":
+                    if not need_backslash:
+                        start += 1
+                    data = "\\" if need_backslash else ""
+                    self.column += len(data)
+                    self.write(data)
+            end += 1
+        self.write_indicator('"', False)
+
+
+def dump(data: Any, stream: TextIO) -> None:
+    """Write `data` to `stream` exactly as the ruamel safe dumper would"""
+    YAMLEmitter(stream).dump(data)